@@ -0,0 +1,98 @@
+"""Shared frame scheduler for cell animations.
+
+All running fades live in one table and are advanced together by a
+single window.after callback at a fixed tick, instead of one chain of
+after() closures per placed number. Colour ramps are computed once per
+(start, target, steps) and reused. A new fade on a cell replaces the one
+already running there, and when more than max_active fades are in flight
+the oldest ones jump to their final frame, so a tick never costs more
+than max_active config calls however fast numbers are placed.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def color_ramp(start, target, steps):
+    """Hex colours fading from start to target in steps steps (both ends included)"""
+    start_rgb = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+    target_rgb = [int(target[i:i + 2], 16) for i in (1, 3, 5)]
+    ramp = []
+    for step in range(steps + 1):
+        progress = step / steps if steps else 1
+        r, g, b = (int(s + (t - s) * progress) for s, t in zip(start_rgb, target_rgb))
+        ramp.append(f'#{r:02x}{g:02x}{b:02x}')
+    return tuple(ramp)
+
+
+class Animator:
+    def __init__(self, window, interval=20, max_active=16):
+        self.window = window
+        self.interval = interval  # milliseconds per frame
+        self.max_active = max_active
+        self.tweens = {}  # key -> [cell, ramp, next frame index, final options]
+        self.pending = None
+
+    def fade(self, key, cell, start, target, steps, fg=None, **final):
+        """Fade cell's background from start to target, then apply final options
+
+        With steps == 0 the cell is set to its final state at once.
+        """
+        self.tweens.pop(key, None)
+        final = dict(final, bg=target)
+        if fg is not None:
+            final["fg"] = fg
+        if steps <= 0:
+            cell.config(**final)
+            return
+        while len(self.tweens) >= self.max_active:
+            self.finish(next(iter(self.tweens)))
+        ramp = color_ramp(start, target, steps)
+        if fg is not None:
+            cell.config(bg=ramp[0], fg=fg)
+        else:
+            cell.config(bg=ramp[0])
+        self.tweens[key] = [cell, ramp, 1, final]
+        if self.pending is None:
+            self.pending = self.window.after(self.interval, self.tick)
+
+    def tick(self):
+        """Advance every running fade by one frame"""
+        self.pending = None
+        done = []
+        for key, tween in self.tweens.items():
+            cell, ramp, index, final = tween
+            if index < len(ramp):
+                cell.config(bg=ramp[index])
+                tween[2] = index + 1
+            else:
+                cell.config(**final)
+                done.append(key)
+        for key in done:
+            del self.tweens[key]
+        if self.tweens:
+            self.pending = self.window.after(self.interval, self.tick)
+
+    def finish(self, key):
+        """Jump a running fade to its final frame"""
+        tween = self.tweens.pop(key, None)
+        if tween:
+            tween[0].config(**tween[3])
+
+    def cancel(self, key):
+        """Stop a fade without touching the cell (e.g. it was just undone)"""
+        self.tweens.pop(key, None)
+
+    def clear(self):
+        """Jump every running fade to its final frame and stop the tick.
+
+        Used before the whole board is redrawn: the cells are left in the
+        state their fades promised, which is what the board's painter has
+        already recorded for them.
+        """
+        tweens, self.tweens = self.tweens, {}
+        for cell, _, _, final in tweens.values():
+            cell.config(**final)
+        if self.pending is not None:
+            self.window.after_cancel(self.pending)
+            self.pending = None
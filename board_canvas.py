@@ -0,0 +1,138 @@
+"""Single-canvas board renderer.
+
+Draws the whole grid on one tk.Canvas instead of one tk.Button per cell:
+each cell is a rectangle item and a text item. Clicks and hovers are
+mapped to cells by arithmetic on the pointer coordinates, so the widget
+count is constant whatever the board size, and a theme switch is a
+couple of tag-wide item updates. Cells are exposed as CanvasCell objects
+that accept the same config(...) options the GUI already sends to its
+buttons, so the rest of the game draws on either renderer unchanged.
+The move path (see path_overlay.py) lives on the same canvas, between
+the cells and their numbers.
+"""
+
+import tkinter as tk
+import tkinter.font as tkFont
+
+
+class CanvasCell:
+    """Button-like handle on one cell's canvas items"""
+
+    __slots__ = ("board", "rect", "label", "text")
+
+    def __init__(self, board, rect, label):
+        self.board = board
+        self.rect = rect
+        self.label = label
+        self.text = " "
+
+    def config(self, text=None, bg=None, fg=None, borderwidth=None, **_):
+        canvas = self.board.canvas
+        if text is not None and text != self.text:
+            self.text = text
+            canvas.itemconfig(self.label, text=text)
+        if bg is not None:
+            canvas.itemconfig(self.rect, fill=bg)
+        if fg is not None:
+            canvas.itemconfig(self.label, fill=fg)
+        if borderwidth is not None:
+            canvas.itemconfig(self.rect, width=borderwidth)
+
+    configure = config
+
+    def __getitem__(self, option):
+        if option == "text":
+            return self.text
+        raise KeyError(option)
+
+
+class CanvasBoard:
+    def __init__(self, parent, size, theme, on_click, on_hover, on_leave, max_board_px=640):
+        self.size = size
+        self.on_click = on_click
+        self.on_hover = on_hover
+        self.on_leave = on_leave
+        self.cell_px = max(12, min(48, max_board_px // size))
+        self.pad = 2 if self.cell_px >= 24 else 1
+        self.font = tkFont.Font(family="Helvetica", size=max(6, self.cell_px // 3), weight="bold")
+        board_px = self.cell_px * size
+        self.canvas = tk.Canvas(parent, width=board_px, height=board_px, bg=theme["bg"],
+                                highlightthickness=0, cursor="hand2")
+        # All rectangles first, then all numbers, so anything lowered below
+        # "label" (like the move path) sits above every cell background
+        rects = [self.canvas.create_rectangle(0, 0, 0, 0, tags=("cell",)) for _ in range(size * size)]
+        labels = [self.canvas.create_text(0, 0, text=" ", font=self.font, tags=("label",))
+                  for _ in range(size * size)]
+        self.cells = [
+            [CanvasCell(self, rects[row * size + col], labels[row * size + col]) for col in range(size)]
+            for row in range(size)
+        ]
+        self.layout()
+        self.apply_theme(theme)
+        self.hovered = None
+        self.canvas.bind("<Button-1>", self.handle_click)
+        self.canvas.bind("<Motion>", self.handle_motion)
+        self.canvas.bind("<Leave>", lambda e: self.set_hovered(None))
+        self.canvas.bind("<Configure>", self.handle_resize)
+
+    def layout(self):
+        """Place every cell's items for the current cell size"""
+        cell, pad = self.cell_px, self.pad
+        coords = self.canvas.coords
+        for row, cell_row in enumerate(self.cells):
+            y = row * cell
+            for col, item in enumerate(cell_row):
+                x = col * cell
+                coords(item.rect, x + pad, y + pad, x + cell - pad, y + cell - pad)
+                coords(item.label, x + cell / 2, y + cell / 2)
+
+    def apply_theme(self, theme):
+        """Reset every cell to the theme's colours with tag-wide updates"""
+        self.canvas.config(bg=theme["bg"])
+        self.canvas.itemconfig("cell", fill=theme["button_bg"], outline=theme["button_border"], width=2)
+        self.canvas.itemconfig("label", fill=theme["button_fg"])
+
+    def cell_at(self, x, y):
+        row, col = int(y // self.cell_px), int(x // self.cell_px)
+        if 0 <= row < self.size and 0 <= col < self.size:
+            return row, col
+        return None
+
+    def center(self, row, col):
+        return (col + 0.5) * self.cell_px, (row + 0.5) * self.cell_px
+
+    def handle_click(self, event):
+        cell = self.cell_at(event.x, event.y)
+        if cell:
+            self.on_click(*cell)
+
+    def handle_motion(self, event):
+        self.set_hovered(self.cell_at(event.x, event.y))
+
+    def set_hovered(self, cell):
+        if cell == self.hovered:
+            return
+        if self.hovered:
+            row, col = self.hovered
+            self.on_leave(self.cells[row][col], row, col)
+        self.hovered = cell
+        if cell:
+            row, col = cell
+            self.on_hover(self.cells[row][col], row, col)
+
+    def handle_resize(self, event):
+        cell_px = max(4, min(event.width, event.height) // self.size)
+        if cell_px != self.cell_px:
+            self.cell_px = cell_px
+            self.font.config(size=max(6, cell_px // 3))
+            self.layout()
+            self.canvas.event_generate("<<BoardResized>>")
+
+    def path_width(self):
+        return 3 if self.cell_px >= 24 else 1
+
+    def grid(self, **options):
+        self.canvas.grid(**options)
+
+    def destroy(self):
+        self.canvas.destroy()
@@ -0,0 +1,42 @@
+"""Render-state model for the board cells.
+
+CellPainter remembers the background and text each cell currently shows
+and only sends a Tk update when a new value differs, so redrawing the
+highlights after a move costs one config per cell that actually changed
+instead of one per cell on the board. Works with tk.Button cells and
+CanvasCell handles alike.
+"""
+
+
+class CellPainter:
+    def __init__(self, cells, bg, text=" "):
+        self.cells = cells
+        self.size = len(cells)
+        self.text = {}
+        self.reset(bg, text)
+
+    def reset(self, bg, text=None):
+        """Record that every cell was just set to bg (and text) by a bulk update"""
+        keys = [(row, col) for row in range(self.size) for col in range(self.size)]
+        self.bg = dict.fromkeys(keys, bg)
+        if text is not None:
+            self.text = dict.fromkeys(keys, text)
+
+    def paint(self, row, col, bg):
+        key = (row, col)
+        if self.bg.get(key) != bg:
+            self.cells[row][col].config(bg=bg)
+            self.bg[key] = bg
+
+    def set_text(self, row, col, text, **options):
+        key = (row, col)
+        if self.text.get(key) != text:
+            self.cells[row][col].config(text=text, **options)
+            self.text[key] = text
+
+    def note_bg(self, row, col, bg):
+        """Record a background another code path (e.g. an animation) will leave behind"""
+        self.bg[(row, col)] = bg
+
+    def current_bg(self, row, col):
+        return self.bg.get((row, col))
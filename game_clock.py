@@ -0,0 +1,69 @@
+"""Single game clock.
+
+Elapsed time comes from time.monotonic(), so it is sub-second precise and
+unaffected by wall-clock changes. Paused stretches are not counted. While
+the clock runs, exactly one window.after loop refreshes the display at a
+fixed rate. start() and resume() never start a second loop, and the loop
+stops as soon as the clock is paused or reset.
+"""
+
+import time
+
+
+class GameClock:
+    def __init__(self, window, on_tick, interval=100):
+        self.window = window
+        self.on_tick = on_tick  # called with the elapsed seconds on every display refresh
+        self.interval = interval  # milliseconds between display refreshes
+        self.pending = None
+        self.reset()
+
+    def reset(self):
+        """Stop the clock and set it back to zero"""
+        self._stop_loop()
+        self.accumulated = 0.0
+        self.started_at = None
+        self.started = False
+
+    @property
+    def running(self):
+        return self.started_at is not None
+
+    def elapsed(self):
+        """Seconds counted so far (float)"""
+        if self.started_at is None:
+            return self.accumulated
+        return self.accumulated + time.monotonic() - self.started_at
+
+    def start(self):
+        """Start (or resume) counting; does nothing if already running"""
+        if self.started_at is not None:
+            return
+        self.started = True
+        self.started_at = time.monotonic()
+        self.pending = self.window.after(self.interval, self._tick)
+
+    def resume(self):
+        """Continue a clock that was started and then paused"""
+        if self.started:
+            self.start()
+
+    def pause(self):
+        """Stop counting and refreshing; returns the elapsed seconds"""
+        if self.started_at is not None:
+            self.accumulated += time.monotonic() - self.started_at
+            self.started_at = None
+        self._stop_loop()
+        return self.accumulated
+
+    def _tick(self):
+        self.pending = None
+        if self.started_at is None:
+            return
+        self.on_tick(self.elapsed())
+        self.pending = self.window.after(self.interval, self._tick)
+
+    def _stop_loop(self):
+        if self.pending is not None:
+            self.window.after_cancel(self.pending)
+            self.pending = None
@@ -0,0 +1,191 @@
+"""Optional single-file SQLite store for scores, statistics and game history.
+
+Enable it with "storage": "sqlite" in config.json. Finished games, their
+moves and leaderboard entries live in one database, and the GUI's top-10
+lists, statistics and per-position strategy data become indexed queries
+instead of whole-file JSON loads. Each finished game, with all its moves,
+is written in a single transaction.
+
+When the database is first created, scores.json and the game record store
+are imported into it; the JSON files are left untouched. game_stats.json is
+not imported: statistics are computed from the games table, so after the
+switch they cover every stored game, including games older than the
+statistics file, and the totals shown can jump up.
+"""
+
+import json
+import os
+import sqlite3
+import time
+
+from game_store import GameStore
+
+DATABASE_FILE = "number_puzzle.db"
+CONFIG_FILE = "config.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    time INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_size_score ON games (size, score);
+
+CREATE TABLE IF NOT EXISTS moves (
+    game_id INTEGER NOT NULL REFERENCES games (id),
+    size INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    col INTEGER NOT NULL,
+    turn INTEGER NOT NULL,
+    future_moves INTEGER
+);
+CREATE INDEX IF NOT EXISTS moves_size_position_turn ON moves (size, row, col, turn);
+CREATE INDEX IF NOT EXISTS moves_game ON moves (game_id);
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    initials TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    time INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leaderboard_size_score ON leaderboard (size, score);
+"""
+
+
+def open_database(game_store=None, config_file=CONFIG_FILE):
+    """Return a GameDatabase if config.json selects SQLite storage, else None"""
+    try:
+        with open(config_file, "r") as f:
+            config = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if config.get("storage") != "sqlite":
+        return None
+    return GameDatabase(config.get("database", DATABASE_FILE), game_store=game_store)
+
+
+class GameDatabase:
+    def __init__(self, path=DATABASE_FILE, scores_file="scores.json", game_store=None):
+        created = not os.path.exists(path)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+        if created:
+            self.import_json(scores_file, game_store)
+
+    def close(self):
+        self.conn.close()
+
+    def record_game(self, size, score, elapsed, moves):
+        """Store a finished game and its (position, turn, future_moves) moves"""
+        with self.conn:
+            game_id = self.conn.execute(
+                "INSERT INTO games (size, score, time, played_at) VALUES (?, ?, ?, ?)",
+                (size, score, elapsed, time.time())
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT INTO moves (game_id, size, row, col, turn, future_moves) VALUES (?, ?, ?, ?, ?, ?)",
+                [(game_id, size, position[0], position[1], turn, future_moves)
+                 for position, turn, future_moves in moves]
+            )
+        return game_id
+
+    def add_score(self, size, initials, score, elapsed):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO leaderboard (size, initials, score, time) VALUES (?, ?, ?, ?)",
+                (size, initials, score, elapsed)
+            )
+
+    def top_scores(self, size, limit=10):
+        """Best leaderboard entries of a board size as (initials, score, time)"""
+        return self.conn.execute(
+            "SELECT initials, score, time FROM leaderboard WHERE size = ? "
+            "ORDER BY score DESC, id LIMIT ?",
+            (size, limit)
+        ).fetchall()
+
+    def count(self, size=None):
+        if size is None:
+            return self.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        return self.conn.execute("SELECT COUNT(*) FROM games WHERE size = ?", (size,)).fetchone()[0]
+
+    def recent(self, size, n=1):
+        """The n-th most recent game of a board size as a game store record, or None"""
+        game = self.conn.execute(
+            "SELECT id, score, time FROM games WHERE size = ? ORDER BY id DESC LIMIT 1 OFFSET ?",
+            (size, n - 1)
+        ).fetchone()
+        if game is None:
+            return None
+        game_id, score, elapsed = game
+        moves = self.conn.execute(
+            "SELECT row, col, turn FROM moves WHERE game_id = ? ORDER BY turn", (game_id,)
+        ).fetchall()
+        return {
+            "size": size,
+            "score": score,
+            "time": elapsed,
+            "moves": [((row, col), turn) for row, col, turn in moves]
+        }
+
+    def stats(self):
+        """Same shape as game_stats.json"""
+        games, best, total = self.conn.execute(
+            "SELECT COUNT(*), MAX(score), SUM(score) FROM games"
+        ).fetchone()
+        return {
+            "games_played": games,
+            "best_score": best or 0,
+            "total_score": total or 0
+        }
+
+    def position_stats(self, size, position, first_turn, last_turn, success_score):
+        """Aggregate every stored move to position made on a turn in the range"""
+        count, score_total, future_total, future_samples, successes = self.conn.execute(
+            "SELECT COUNT(*), SUM(g.score), SUM(m.future_moves), COUNT(m.future_moves), "
+            "SUM(g.score >= ?) FROM moves m JOIN games g ON g.id = m.game_id "
+            "WHERE m.size = ? AND m.row = ? AND m.col = ? AND m.turn BETWEEN ? AND ?",
+            (success_score, size, position[0], position[1], first_turn, last_turn)
+        ).fetchone()
+        return {
+            "count": count,
+            "score_total": score_total or 0,
+            "future_total": future_total or 0,
+            "future_samples": future_samples,
+            "successes": successes or 0
+        }
+
+    def import_json(self, scores_file="scores.json", game_store=None):
+        """One-time import of the JSON leaderboard and stored games, in one transaction"""
+        try:
+            with open(scores_file, "r") as f:
+                scores = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            scores = {}
+        store = game_store if game_store is not None else GameStore()
+        with self.conn:
+            for board_key, entries in scores.items():
+                size = int(board_key.split("x")[0])
+                self.conn.executemany(
+                    "INSERT INTO leaderboard (size, initials, score, time) VALUES (?, ?, ?, ?)",
+                    [(size, initials, score, elapsed) for initials, score, elapsed in entries]
+                )
+            for record in store.games():
+                game_id = self.conn.execute(
+                    "INSERT INTO games (size, score, time, played_at) VALUES (?, ?, ?, ?)",
+                    (record["size"], record["score"], record.get("time", 0), 0)
+                ).lastrowid
+                self.conn.executemany(
+                    "INSERT INTO moves (game_id, size, row, col, turn, future_moves) "
+                    "VALUES (?, ?, ?, ?, ?, NULL)",
+                    [(game_id, record["size"], position[0], position[1], turn)
+                     for position, turn in record.get("moves", [])]
+                )
+        if game_store is None:
+            store.close()
@@ -0,0 +1,223 @@
+"""Append-only store of finished game records.
+
+Each game is one compact JSON line appended to game_records.jsonl and
+fsynced, so finishing a game costs a single small write however many
+games are stored, and a crash can at worst leave a torn last line. The
+torn tail is cut off the next time the store is opened. A sidecar index
+of fixed-size (offset, length, board size, score) entries lets the game
+look records up by board size and score without parsing the data file;
+it is rebuilt from the data file whenever it is missing or behind.
+
+The old game_history.json array is copied into the store when the store
+is first created. The legacy file itself is left untouched; once the data
+file exists it is never read again.
+"""
+
+import json
+import os
+import struct
+from collections import Counter, defaultdict
+
+GAMES_FILE = "game_records.jsonl"
+LEGACY_HISTORY_FILE = "game_history.json"
+
+# offset, length, board size, score
+_INDEX_ENTRY = struct.Struct("<QIHH")
+
+
+def _index_path(path):
+    return os.path.splitext(path)[0] + ".idx"
+
+
+def read_legacy_games(path):
+    """Game records of the old history file, a JSON array or newline-delimited objects.
+
+    Old versions never cleared the move list between games, so a record
+    could carry every earlier game's moves before its own. Such records
+    are cut down to their last `score` moves, which are the game itself.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    try:
+        records = json.loads(text)
+        if not isinstance(records, list):
+            records = []
+    except json.JSONDecodeError:
+        records = []
+        for line in text.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    pass
+    games = []
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        moves = record.get("moves")
+        score = record.get("score")
+        if isinstance(moves, list) and isinstance(score, int) and 0 < score < len(moves):
+            tail = moves[-score:]
+            if tail[0][1] == 1:
+                record = dict(record, moves=tail)
+        games.append(record)
+    return games
+
+
+class GameStore:
+    def __init__(self, path=GAMES_FILE, legacy_path=LEGACY_HISTORY_FILE):
+        self.path = path
+        self.index_path = _index_path(path)
+        # board size -> [(score, offset, length)] in append order
+        self.entries = defaultdict(list)
+        self.score_counts = defaultdict(Counter)
+        if legacy_path:
+            self._migrate(legacy_path)
+        self._recover()
+        self._load_index()
+        self.handle = open(self.path, "ab")
+        self.index_handle = open(self.index_path, "ab")
+
+    def append(self, record):
+        """Durably append one finished game; returns its offset"""
+        data = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        offset = self.handle.tell()
+        self.handle.write(data)
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        # The index is only a cache of the data file, so it needs no fsync
+        size, score = int(record["size"]), int(record["score"])
+        self.index_handle.write(_INDEX_ENTRY.pack(offset, len(data), size, score))
+        self.index_handle.flush()
+        self._add_entry(size, score, offset, len(data))
+        return offset
+
+    def close(self):
+        self.handle.close()
+        self.index_handle.close()
+
+    def count(self, size=None):
+        if size is None:
+            return sum(len(entries) for entries in self.entries.values())
+        return len(self.entries.get(size, ()))
+
+    def best_score(self, size):
+        counts = self.score_counts.get(size)
+        return max(counts) if counts else 0
+
+    def score_histogram(self, size):
+        """{score: games} for one board size"""
+        return dict(self.score_counts.get(size, {}))
+
+    def recent(self, size, n=1):
+        """The n-th most recent game of a board size, or None"""
+        entries = self.entries.get(size, [])
+        if not 1 <= n <= len(entries):
+            return None
+        _, offset, length = entries[-n]
+        return self.read(offset, length)
+
+    def top(self, size, n=10):
+        """The n highest-scoring games of a board size, newest first on ties"""
+        entries = self.entries.get(size, [])
+        ranked = sorted(range(len(entries)), key=lambda i: (entries[i][0], i), reverse=True)
+        return [self.read(*entries[i][1:]) for i in ranked[:n]]
+
+    def games(self, size=None, min_score=None):
+        """Stream stored games, oldest first, optionally filtered by index fields"""
+        sizes = sorted(self.entries) if size is None else [size]
+        for board_size in sizes:
+            for score, offset, length in self.entries.get(board_size, ()):
+                if min_score is None or score >= min_score:
+                    yield self.read(offset, length)
+
+    def read(self, offset, length):
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def _add_entry(self, size, score, offset, length):
+        self.entries[size].append((score, offset, length))
+        self.score_counts[size][score] += 1
+
+    def _recover(self):
+        """Cut a torn final line left by a crash mid-append"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b"\n":
+                return
+            # Scan back to the last complete line
+            position = end
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                chunk = f.read(step)
+                newline = chunk.rfind(b"\n")
+                if newline >= 0:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            f.truncate(position)
+
+    def _load_index(self):
+        """Read the index, then index any data-file records it is missing"""
+        data_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        indexed_end = 0
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            raw = b""
+        raw = raw[:len(raw) - len(raw) % _INDEX_ENTRY.size]
+        valid = 0
+        for offset, length, size, score in _INDEX_ENTRY.iter_unpack(raw):
+            if offset != indexed_end or offset + length > data_size:
+                break
+            self._add_entry(size, score, offset, length)
+            indexed_end = offset + length
+            valid += _INDEX_ENTRY.size
+        missing = []
+        if indexed_end < data_size:
+            with open(self.path, "rb") as f:
+                f.seek(indexed_end)
+                offset = indexed_end
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entry = (offset, len(line), int(record["size"]), int(record["score"]))
+                    except (ValueError, KeyError, TypeError):
+                        entry = None
+                    if entry is not None:
+                        self._add_entry(entry[2], entry[3], entry[0], entry[1])
+                        missing.append(_INDEX_ENTRY.pack(*entry))
+                    offset += len(line)
+        if valid != len(raw) or missing or not os.path.exists(self.index_path):
+            # Rewrite the index from what was recovered
+            with open(self.index_path, "r+b" if os.path.exists(self.index_path) else "wb") as f:
+                f.truncate(valid)
+                f.seek(valid)
+                f.writelines(missing)
+
+    def _migrate(self, legacy_path):
+        """Copy the old whole-file history into a new store; the data file marks it done"""
+        if os.path.exists(self.path) or not os.path.exists(legacy_path):
+            return
+        try:
+            records = read_legacy_games(legacy_path)
+        except OSError as e:
+            print(f"Error reading {legacy_path}: {e}")
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for record in records:
+                if "size" in record and "score" in record:
+                    f.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,77 @@
+"""Compact per-game move journal.
+
+Instead of a board snapshot per move, the journal keeps one
+(cell, number, timestamp) delta per placed number in flat arrays, plus the
+number of onward moves seen after it. Number k is always the k-th entry,
+so it is implied by the position in the journal. Any earlier board is
+rebuilt on demand by replaying deltas, optionally starting from a
+periodic checkpoint. Undo pops the last entry in O(1); redo and
+branches live in the move tree, which replays through append().
+"""
+
+from array import array
+
+UNKNOWN = -1  # future_moves not recorded
+
+
+class MoveJournal:
+    def __init__(self, size, checkpoint_interval=None):
+        self.checkpoint_interval = checkpoint_interval
+        self.reset(size)
+
+    def reset(self, size=None):
+        if size is not None:
+            self.size = size
+        self.cells = array('H')
+        self.timestamps = array('d')
+        self.future_moves = array('h')
+        # moves made -> flat board (0 = empty) at that point
+        self.checkpoints = {}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def append(self, row, col, timestamp, future_moves=None):
+        """Record the next number placed at (row, col)"""
+        self.cells.append(row * self.size + col)
+        self.timestamps.append(timestamp)
+        self.future_moves.append(UNKNOWN if future_moves is None else future_moves)
+        interval = self.checkpoint_interval
+        if interval and len(self.cells) % interval == 0:
+            self.checkpoints[len(self.cells)] = self.board_at(len(self.cells))
+
+    def pop(self):
+        """Undo the last entry; returns its ((row, col), number) or None"""
+        if not self.cells:
+            return None
+        number = len(self.cells)
+        self.checkpoints.pop(number, None)
+        self.timestamps.pop()
+        self.future_moves.pop()
+        return divmod(self.cells.pop(), self.size), number
+
+    def entry(self, number):
+        """(cell, number, timestamp) delta of the given number (1-based)"""
+        return self.cells[number - 1], number, self.timestamps[number - 1]
+
+    def moves(self):
+        """[((row, col), number, future_moves)] for every journal entry"""
+        size = self.size
+        return [
+            (divmod(cell, size), number, None if future == UNKNOWN else future)
+            for number, (cell, future) in enumerate(zip(self.cells, self.future_moves), 1)
+        ]
+
+    def board_at(self, moves_made):
+        """Flat board (row-major, 0 = empty) after the first moves_made entries"""
+        start = max((k for k in self.checkpoints if k <= moves_made), default=0)
+        board = array('H', self.checkpoints[start]) if start else array('H', bytes(2 * self.size * self.size))
+        for number in range(start + 1, moves_made + 1):
+            board[self.cells[number - 1]] = number
+        return board
+
+    def board_rows(self, moves_made=None):
+        """board_at as a list of rows, like PuzzleEngine.board"""
+        board = self.board_at(len(self.cells) if moves_made is None else moves_made)
+        size = self.size
+        return [board[row * size:(row + 1) * size].tolist() for row in range(size)]
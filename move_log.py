@@ -0,0 +1,145 @@
+"""Append-only, newline-delimited log of Auto Play move analyses.
+
+Records are serialized compactly, one per line, and appended through a
+buffered handle. A background thread flushes them in batches, so logging
+a move never rereads or rewrites the file. When the active segment grows
+past max_bytes it is rotated to a numbered segment and, optionally,
+gzipped. iter_move_logs streams every segment back one record at a time.
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+
+LOG_FILE = "autoplay_logs.jsonl"
+LEGACY_LOG_FILE = "autoplay_logs.json"
+
+
+def _segment_paths(path):
+    """Rotated segments of path, oldest first, as (sequence, path) pairs"""
+    stem, ext = os.path.splitext(path)
+    pattern = re.compile(re.escape(stem) + r"\.(\d+)" + re.escape(ext) + r"(\.gz)?$")
+    segments = []
+    for candidate in glob.glob(glob.escape(stem) + ".*" + ext + "*"):
+        match = pattern.match(candidate)
+        if match:
+            segments.append((int(match.group(1)), candidate))
+    return sorted(segments)
+
+
+class MoveLogWriter:
+    def __init__(self, path=LOG_FILE, max_bytes=8 * 1024 * 1024, compress_rotated=True,
+                 flush_interval=1.0, batch_size=64):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compress_rotated = compress_rotated
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.pending = []
+        self.lock = threading.Lock()
+        self.wakeup = threading.Condition(self.lock)
+        self.write_lock = threading.Lock()  # serializes writes and rotation
+        self.closed = False
+        self.handle = open(self.path, "a", buffering=64 * 1024)
+        self.thread = threading.Thread(target=self._run, name="move-log-writer", daemon=True)
+        self.thread.start()
+
+    def append(self, record):
+        """Queue one record; it reaches disk with the next batch"""
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self.lock:
+            if self.closed:
+                return
+            self.pending.append(line)
+            if len(self.pending) >= self.batch_size:
+                self.wakeup.notify()
+
+    def flush(self):
+        with self.lock:
+            lines, self.pending = self.pending, []
+        self._write(lines)
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            self.wakeup.notify()
+        self.thread.join()
+        self.flush()
+        self.handle.close()
+
+    def _run(self):
+        while True:
+            with self.lock:
+                if not self.closed and len(self.pending) < self.batch_size:
+                    self.wakeup.wait(self.flush_interval)
+                lines, self.pending = self.pending, []
+                closed = self.closed
+            self._write(lines)
+            if closed:
+                return
+
+    def _write(self, lines):
+        if not lines:
+            return
+        with self.write_lock:
+            try:
+                self.handle.writelines(lines)
+                self.handle.flush()
+                if self.handle.tell() >= self.max_bytes:
+                    self._rotate()
+            except (OSError, ValueError) as e:
+                print(f"Error writing move log: {e}")
+
+    def _rotate(self):
+        """Move the full active segment aside and start a new one"""
+        self.handle.close()
+        segments = _segment_paths(self.path)
+        sequence = segments[-1][0] + 1 if segments else 1
+        stem, ext = os.path.splitext(self.path)
+        rotated = f"{stem}.{sequence:05d}{ext}"
+        os.replace(self.path, rotated)
+        self.handle = open(self.path, "a", buffering=64 * 1024)
+        if self.compress_rotated:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+
+
+def _iter_lines(handle):
+    for line in handle:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            # A crash can leave a torn final line; skip it
+            continue
+
+
+def iter_move_logs(path=LOG_FILE, legacy_path=LEGACY_LOG_FILE):
+    """Yield every logged record, oldest first, one at a time.
+
+    Reads the legacy whole-file JSON array (if any), then the rotated
+    segments in order (plain or gzipped), then the active segment.
+    """
+    if legacy_path and os.path.exists(legacy_path):
+        try:
+            with open(legacy_path, "r") as f:
+                legacy = json.load(f)
+        except json.JSONDecodeError:
+            legacy = []
+        yield from legacy
+
+    for _, segment in _segment_paths(path):
+        opener = gzip.open if segment.endswith(".gz") else open
+        with opener(segment, "rt") as f:
+            yield from _iter_lines(f)
+
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            yield from _iter_lines(f)
@@ -0,0 +1,122 @@
+"""Undo/redo tree of every line explored in a game.
+
+Each node is one placed number; its children are the different moves
+tried from there. Undo steps to the parent and redo follows the child
+that was visited last, so trying a new move after an undo starts a new
+branch instead of throwing the old line away. Lines share their common
+prefix, so the tree holds one node per distinct move explored. Nodes
+carry a cache dict where solver and hint results for their position are
+kept and reused when a branch is revisited.
+"""
+
+
+class MoveNode:
+    __slots__ = ("position", "number", "parent", "children", "last_child", "cache")
+
+    def __init__(self, position, number, parent):
+        self.position = position
+        self.number = number
+        self.parent = parent
+        self.children = {}  # position -> MoveNode, in the order they were tried
+        self.last_child = None
+        self.cache = {}
+
+    def tip(self):
+        """Follow the most recently visited children down to the end of the line"""
+        node = self
+        while node.last_child is not None:
+            node = node.last_child
+        return node
+
+
+class MoveTree:
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.root = MoveNode(None, 0, None)
+        self.current = self.root
+        self.nodes = 0
+
+    def play(self, position):
+        """Move to the child for position, creating it if this move is new"""
+        node = self.current.children.get(position)
+        if node is None:
+            node = MoveNode(position, self.current.number + 1, self.current)
+            self.current.children[position] = node
+            self.nodes += 1
+        self.current.last_child = node
+        self.current = node
+        return node
+
+    def undo(self):
+        """Step back to the parent; returns the node undone, or None at the root"""
+        node = self.current
+        if node is self.root:
+            return None
+        self.current = node.parent
+        return node
+
+    def redo_node(self):
+        """The child a redo would follow, or None"""
+        return self.current.last_child
+
+    def redo(self):
+        node = self.current.last_child
+        if node is not None:
+            self.current = node
+        return node
+
+    def path(self, node=None):
+        """Nodes from the first move down to node (default: the current one)"""
+        nodes = []
+        node = node or self.current
+        while node is not self.root:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    def route(self, target):
+        """(undo count, nodes to play) that lead from the current node to target"""
+        ancestors = set()
+        node = target
+        while node is not None:
+            ancestors.add(node)
+            node = node.parent
+        undo = 0
+        common = self.current
+        while common not in ancestors:
+            common = common.parent
+            undo += 1
+        forward = []
+        node = target
+        while node is not common:
+            forward.append(node)
+            node = node.parent
+        forward.reverse()
+        return undo, forward
+
+    def goto(self, target):
+        """Make target current, remembering the way down for later redos"""
+        node = target
+        while node.parent is not None:
+            node.parent.last_child = node
+            node = node.parent
+        self.current = target
+
+    def next_branch(self):
+        """Tip of the next line branching off the current one, with (index, count)
+
+        Looks for the nearest move on the current line that has alternatives
+        and returns the end of the following alternative; None if the
+        current line has no branches.
+        """
+        node = self.current
+        while node is not self.root and len(node.parent.children) < 2:
+            node = node.parent
+        if node is self.root:
+            return None, (0, 0)
+        siblings = list(node.parent.children.values())
+        index = (siblings.index(node) + 1) % len(siblings)
+        return siblings[index].tip(), (index + 1, len(siblings))
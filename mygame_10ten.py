@@ -21,48 +21,135 @@ import math
 import tkinter.font as tkFont
 from tkinter import simpledialog  # Correct import for simpledialog
 from collections import defaultdict
-import statistics
 import pygame  # Added for simple music playback
+from puzzle_engine import PuzzleEngine, heuristic_score, HEURISTIC_WEIGHTS
+from tour_solver import TourSolver, FOUND, IMPOSSIBLE, BUDGET_EXHAUSTED
+from tablebase import load_tablebase
+from search import LookaheadSearch
+from search_worker import BackgroundWorker, analyze_snapshot
+from move_log import MoveLogWriter, iter_move_logs
+from game_store import GameStore
+from game_db import open_database
+from replay import ReplayEngine
+from move_journal import MoveJournal
+from move_tree import MoveTree
+from board_canvas import CanvasBoard
+from path_overlay import PathOverlay
+from cell_render import CellPainter
+from animation import Animator
+from game_clock import GameClock
 
 class MoveAnalyzer:
-    def __init__(self):
-        self.move_history = defaultdict(list)
-        self.board_size = None
-        self.log_file = "autoplay_logs.json"
-        self.load_history()
+    TURN_BUCKET = 5  # turns per index bucket; lookups also read the neighbouring buckets
 
-    def load_history(self):
+    def __init__(self, database=None):
+        # (board size, position, turn bucket) -> [count, score total, future total,
+        #                                          future samples, successes]
+        self.position_index = defaultdict(lambda: [0, 0, 0, 0, 0])
+        self.board_size = None
+        self.log_file = "autoplay_logs.jsonl"
+        self.config_file = "game_analysis_config.json"
+        self.min_sample_size = 1
+        self.success_threshold = 0.6
+        # With the SQLite store, positions are looked up with indexed queries instead
+        self.database = database
+        self.load_settings()
+        if self.database is None:
+            self.load_history()
+
+    def load_settings(self):
         try:
-            with open(self.log_file, 'r') as f:
-                return json.load(f)
+            with open(self.config_file, 'r') as f:
+                settings = json.load(f).get("analysis_settings", {})
         except (FileNotFoundError, json.JSONDecodeError):
-            # Initialize empty logs file
-            empty_logs = []
-            with open(self.log_file, 'w') as f:
-                json.dump(empty_logs, f)
-            return empty_logs
+            return
+        self.min_sample_size = settings.get("min_sample_size", self.min_sample_size)
+        self.success_threshold = settings.get("success_threshold", self.success_threshold)
+
+    def load_history(self):
+        """Build the position index from the autoplay logs; returns records indexed"""
+        # Records are logged turn by turn; a turn that doesn't increase starts a new game
+        game = []
+        count = 0
+        for record in iter_move_logs(self.log_file):
+            count += 1
+            if game and record["turn"] <= game[-1]["turn"]:
+                self.index_logged_game(game)
+                game = []
+            game.append(record)
+        if game:
+            self.index_logged_game(game)
+        return count
+
+    def index_logged_game(self, records):
+        # Records carry the board size; older ones a full board snapshot instead
+        first = records[0]
+        size = first["size"] if "size" in first else len(first["board_state"])
+        moves = []
+        for record in records:
+            position = tuple(record["chosen_move"])
+            future_moves = next((m["future_moves"] for m in record.get("analyzed_moves", [])
+                                 if tuple(m["position"]) == position and "future_moves" in m), None)
+            moves.append((position, record["turn"], future_moves))
+        # The last logged turn is the highest number that game placed
+        self.record_game(size, moves, records[-1]["turn"])
+
+    def record_game(self, size, moves, score):
+        """Add a finished game's (position, turn, future_moves) moves to the index"""
+        if self.database is not None:
+            return  # the game is stored in the database by end_game
+        success = score >= self.success_threshold * size * size
+        for position, turn, future_moves in moves:
+            entry = self.position_index[(size, tuple(position), turn // self.TURN_BUCKET)]
+            entry[0] += 1
+            entry[1] += score
+            if future_moves is not None:
+                entry[2] += future_moves
+                entry[3] += 1
+            if success:
+                entry[4] += 1
 
     def analyze_position(self, position, turn):
-        if position not in self.move_history:
-            return None
-        
-        relevant_moves = [m for m in self.move_history[position] if abs(m["turn"] - turn) <= 5]
-        if not relevant_moves:
+        bucket = turn // self.TURN_BUCKET
+        count = score_total = future_total = future_samples = successes = 0
+        if self.database is not None:
+            size = self.board_size
+            stats = self.database.position_stats(
+                size, position, (bucket - 1) * self.TURN_BUCKET, (bucket + 2) * self.TURN_BUCKET - 1,
+                self.success_threshold * size * size
+            )
+            count = stats["count"]
+            score_total = stats["score_total"]
+            future_total = stats["future_total"]
+            future_samples = stats["future_samples"]
+            successes = stats["successes"]
+        else:
+            for key in ((self.board_size, position, bucket - 1),
+                        (self.board_size, position, bucket),
+                        (self.board_size, position, bucket + 1)):
+                entry = self.position_index.get(key)
+                if entry:
+                    count += entry[0]
+                    score_total += entry[1]
+                    future_total += entry[2]
+                    future_samples += entry[3]
+                    successes += entry[4]
+        if count < max(1, self.min_sample_size):
             return None
 
-        avg_score = statistics.mean(m["score"] for m in relevant_moves if "score" in m)
-        avg_future_moves = statistics.mean(m["future_moves"] for m in relevant_moves if "future_moves" in m)
-        success_rate = len([m for m in relevant_moves if m.get("score", 0) > 0]) / len(relevant_moves)
-
         return {
             "position": position,
-            "avg_score": avg_score,
-            "avg_future_moves": avg_future_moves,
-            "success_rate": success_rate,
-            "sample_size": len(relevant_moves)
+            "avg_score": score_total / count,
+            "avg_future_moves": future_total / future_samples if future_samples else 0,
+            "success_rate": successes / count,
+            "sample_size": count
         }
 
 class NumberPuzzleGUI:
+    TURBO_MIN_SPEED = 10  # Auto Play moves per second above which moves skip the per-move UI
+    TURBO_FRAME_MS = 33  # at most one board redraw per frame in turbo
+    TURBO_INSTANT_BUDGET = 0.001  # search seconds per move at Instant speed
+
     def __init__(self):
         self.size = 10  # Default size
         self.board_sizes = {"Small (5x5)": 5, "Standard (10x10)": 10}  # Added board sizes
@@ -129,10 +216,9 @@ class NumberPuzzleGUI:
         self.animation_speed = 20  # milliseconds between animation frames
         self.animation_steps = 10  # number of steps for fade animation
         
-        # Sound effects
+        # Sound effects (the sound bank is built once the mixer is up)
         self.sounds_enabled = True
-        self.sound_effects = {}
-        self.init_sounds()
+        self.sound_bank = None
         
         self.window = tk.Tk()
         self.window.title("Number Puzzle 10x10")
@@ -144,6 +230,7 @@ class NumberPuzzleGUI:
             pygame.mixer.init()
         except Exception as e:
             print("Error initializing pygame mixer:", e)
+        self.init_sounds()
         
         # Make window resizable
         self.window.resizable(True, True)
@@ -162,15 +249,22 @@ class NumberPuzzleGUI:
         self.main_frame = tk.Frame(self.window)
         self.main_frame.grid(row=0, column=0, sticky='nsew', padx=10, pady=10)
         
-        self.board = []
-        self.current_number = 1
+        self.engine = PuzzleEngine(self.size)
         self.game_over = False
-        self.current_position = None
+        self.game_recorded = False  # set by end_game; undo can reopen a game but not record it twice
         self.buttons = []
-        self.moves = []
-        self.start_time = 0
+        # One monotonic clock per game; it refreshes label_time while running
+        self.clock = GameClock(self.window, self.show_time)
         self.elapsed_time = 0
         self.scores_file = "scores.json"
+        self.game_store = GameStore()
+        self.database = open_database(self.game_store)  # None unless config.json selects SQLite
+        self.board_sizes = {
+            "Small (5x5)": 5,
+            "Standard (10x10)": 10,
+            "Large (20x20)": 20,
+            "Huge (50x50)": 50
+        }
         self.top_scores = self.load_scores()
 
         
@@ -184,10 +278,14 @@ class NumberPuzzleGUI:
 
         self.number_font = tkFont.Font(family="Helvetica", size=12, weight="bold")
 
-        self.board_sizes = {
-            "Small (5x5)": 5,
-            "Standard (10x10)": 10
-        }
+        # "buttons", "canvas", or "auto" (one canvas for boards bigger than 20x20)
+        self.renderer = self.load_renderer_setting()
+        self.board_view = None
+        self.path_canvas = None
+        self.path_overlay = None
+        # What each cell currently shows, and the move highlights on top of it
+        self.painter = None
+        self.highlighted = {}
         
         # Option Menu for Board Size
         self.size_var = tk.StringVar(value="Standard (10x10)")
@@ -219,10 +317,8 @@ class NumberPuzzleGUI:
         self.board_frame = tk.Frame(self.main_frame)
         self.board_frame.grid(row=7, column=0, sticky='nsew')
         
-        # Configure grid weights for board frame
-        for i in range(self.size):
-            self.board_frame.grid_columnconfigure(i, weight=1)
-            self.board_frame.grid_rowconfigure(i, weight=1)
+        # Rows/columns of board_frame that have a grid weight; create_board sets them per size
+        self.board_grid_size = 0
 
         # Undo Button
         self.btn_undo = tk.Button(self.main_frame, text="Undo", command=self.undo_move, state=tk.DISABLED)
@@ -241,24 +337,31 @@ class NumberPuzzleGUI:
         self.score_lists_frame = tk.Frame(self.score_frame)
         self.score_lists_frame.grid(row=0, column=0, sticky='nsew')
 
-        # Top 10 10x10 Label
-        tk.Label(self.score_lists_frame, text="Top 10 10x10 Scores", font="Helvetica 12 bold").grid(row=0, column=0, pady=5)
-
-        # Listbox for 10x10 scores
-        self.score_listbox_10x10 = tk.Listbox(self.score_lists_frame, width=40, height=10)
-        self.score_listbox_10x10.grid(row=1, column=0, padx=15, pady=10, sticky='nsew')
-
-        # Top 10 5x5 Label
-        tk.Label(self.score_lists_frame, text="Top 10 5x5 Scores", font="Helvetica 12 bold").grid(row=2, column=0, pady=10)
-
-        # Listbox for 5x5 scores
-        self.score_listbox_5x5 = tk.Listbox(self.score_lists_frame, width=40, height=10)
-        self.score_listbox_5x5.grid(row=3, column=0, padx=15, pady=10, sticky='nsew')
+        # Top 10 label and list for the current board size (refilled when the size changes)
+        self.score_title = tk.Label(self.score_lists_frame, font="Helvetica 12 bold")
+        self.score_title.grid(row=0, column=0, pady=5)
+        self.score_listbox = tk.Listbox(self.score_lists_frame, width=40, height=10)
+        self.score_listbox.grid(row=1, column=0, padx=15, pady=10, sticky='nsew')
         
         self.update_score_list()
         
-        self.move_analyzer = MoveAnalyzer()
-        self.game_history = []
+        self.move_analyzer = MoveAnalyzer(self.database)
+        self.move_log = MoveLogWriter()
+        self.tablebase = load_tablebase()  # Perfect 5x5 play, if tablebase.py has been run
+        self.lookahead_depth = 8  # moves searched ahead by Auto Play and strategy tips
+        # Searches run off the Tk thread; results for the current position land in self.analysis
+        self.worker = BackgroundWorker(self.window)
+        # One frame-driven scheduler for every cell fade
+        self.animator = Animator(self.window, self.animation_speed)
+        self.analysis = None
+        self.position_version = 0
+        self.solver_version = None  # position_version of a solve still running on the worker
+        self.auto_move_pending = False
+        self.show_search_tips = False
+        # One (cell, number, timestamp) delta per placed number; boards are rebuilt on demand
+        self.journal = MoveJournal(self.size)
+        # Every line explored this game; undo/redo walk it and nodes cache solver/hint results
+        self.move_tree = MoveTree()
         
         # Add Progress Bar (must be created before create_board which calls apply_theme)
         self.progress_frame = tk.Frame(self.main_frame)
@@ -302,66 +405,121 @@ class NumberPuzzleGUI:
         self.btn_test_end = tk.Button(self.main_frame, text="Test End Game", command=self.test_end_game)
         self.btn_test_end.grid(row=14, column=0, pady=5, sticky='ew')
         
+        # Add Solve Button (searches for a full 1..N tour from the current position)
+        self.btn_solve = tk.Button(self.main_frame, text="Solve", command=self.solve_from_position)
+        self.btn_solve.grid(row=15, column=0, pady=5, sticky='ew')
+        
+        # Auto Play strength: per-move search time budget (None = one-ply heuristic)
+        self.strength_levels = {
+            "Easy (heuristic)": None,
+            "Normal (20 ms)": 0.02,
+            "Strong (50 ms)": 0.05,
+            "Expert (200 ms)": 0.2,
+            "Monte-Carlo (rollouts)": "rollouts"
+        }
+        self.rollout_evaluator = None
+        self.strength_var = tk.StringVar(value="Strong (50 ms)")
+        self.strength_menu = tk.OptionMenu(self.main_frame, self.strength_var, *self.strength_levels.keys())
+        self.strength_menu.grid(row=16, column=0, pady=5, sticky='ew')
+        
+        # Add Replay Button (re-watch a recorded game of the current board size)
+        self.btn_replay = tk.Button(self.main_frame, text="Replay", command=self.start_replay)
+        self.btn_replay.grid(row=17, column=0, pady=5, sticky='ew')
+        
+        # Replay controls, shown only while a replay is loaded
+        self.replay = None
+        self.replay_playing = False
+        self.replay_render_pending = False
+        self.replay_interval = 150  # milliseconds per move when playing
+        # Redo and branch buttons (undo/redo walk the move tree)
+        self.btn_redo = tk.Button(self.main_frame, text="Redo", command=self.redo_move, state=tk.DISABLED)
+        self.btn_redo.grid(row=19, column=0, pady=5, sticky='ew')
+        self.btn_branch = tk.Button(self.main_frame, text="Switch Branch", command=self.switch_branch)
+        self.btn_branch.grid(row=20, column=0, pady=5, sticky='ew')
+        
+        # Auto Play speed in moves per second; the right end of the slider is "Instant".
+        # Above TURBO_MIN_SPEED moves are played on the engine and drawn once per frame.
+        self.auto_play_speeds = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, None]
+        self.turbo_active = False
+        self.turbo_search = None
+        self.speed_frame = tk.Frame(self.main_frame)
+        self.speed_frame.grid(row=21, column=0, pady=5, sticky='ew')
+        self.speed_label = tk.Label(self.speed_frame, width=18, anchor='w')
+        self.speed_label.pack(side=tk.LEFT)
+        self.speed_var = tk.IntVar(value=self.auto_play_speeds.index(2))
+        self.speed_scale = tk.Scale(self.speed_frame, from_=0, to=len(self.auto_play_speeds) - 1,
+                                    orient=tk.HORIZONTAL, showvalue=False, variable=self.speed_var,
+                                    command=self.on_speed_change)
+        self.speed_scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.on_speed_change()
+        
+        self.replay_frame = tk.Frame(self.main_frame)
+        for text, command in (("|<", lambda: self.replay_seek(0)),
+                              ("<", lambda: self.replay_step(-1)),
+                              (">", lambda: self.replay_step(1)),
+                              (">|", lambda: self.replay_seek(self.replay.length))):
+            tk.Button(self.replay_frame, text=text, width=3, command=command).pack(side=tk.LEFT)
+        self.btn_replay_play = tk.Button(self.replay_frame, text="Play", width=6, command=self.toggle_replay_play)
+        self.btn_replay_play.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.replay_frame, text="Exit Replay", command=self.start_new_game).pack(side=tk.RIGHT)
+        self.replay_scale = tk.Scale(self.replay_frame, from_=0, to=0, orient=tk.HORIZONTAL,
+                                     showvalue=False, command=self.on_replay_scrub)
+        self.replay_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        
         # Load statistics
         self.load_statistics()
         
         self.create_board() # Generate initial board (10x10 by default)
 
+    # Board state lives in the headless engine; the GUI only reads it
+    @property
+    def board(self):
+        return self.engine.board
+
+    @property
+    def moves(self):
+        return self.engine.moves
+
+    @property
+    def current_number(self):
+        return self.engine.current_number
+
+    @property
+    def current_position(self):
+        return self.engine.current_position
+
     def bind_keys(self):
         self.window.bind("<KeyPress>", self.handle_keypress)
 
     def init_sounds(self):
-        """Initialize sound effects using pygame"""
+        """Set up the cached sound bank (needs NumPy and a working mixer)"""
         try:
-            # Create simple beep sounds using pygame
-            self.sounds = {
-                "move": None,
-                "invalid": None,
-                "win": None
-            }
+            # Imported here so a missing NumPy only disables sound
+            from sound_bank import SoundBank
+            self.sound_bank = SoundBank()
         except Exception as e:
             print(f"Error initializing sounds: {e}")
             self.sounds_enabled = False
     
     def play_sound(self, sound_type):
         """Play a sound effect with pitch based on game progress"""
-        if not self.sounds_enabled:
+        if not self.sounds_enabled or self.sound_bank is None:
             return
         try:
-            # Calculate pitch based on game progress
-            max_number = self.size * self.size
-            progress = (self.current_number - 1) / max_number if max_number > 0 else 0
-            
             if sound_type == "move":
                 # Pitch increases as game progresses (from 440Hz to 880Hz)
-                base_freq = 440
-                pitch_multiplier = 1.0 + progress  # 1.0 to 2.0
-                frequency = int(base_freq * pitch_multiplier)
-                pygame.mixer.Sound(buffer=self.generate_beep(frequency, 0.1)).play()
-            elif sound_type == "invalid":
-                pygame.mixer.Sound(buffer=self.generate_beep(200, 0.2)).play()
-            elif sound_type == "win":
-                # Victory sound with ascending pitch
-                pygame.mixer.Sound(buffer=self.generate_beep(880, 0.3)).play()
+                self.sound_bank.play_move(self.current_number, self.size)
+            else:
+                self.sound_bank.play(sound_type)
         except Exception as e:
             print(f"Error playing sound: {e}")
     
-    def generate_beep(self, frequency, duration):
-        """Generate a simple beep sound"""
-        import numpy as np
-        sample_rate = 44100
-        n_samples = int(sample_rate * duration)
-        t = np.linspace(0, duration, n_samples, False)
-        # Simple sine wave
-        wave = np.sin(2 * np.pi * frequency * t) * 0.3
-        # Convert to 16-bit signed integers
-        wave = (wave * 32767).astype(np.int16)
-        # Stereo
-        stereo = np.column_stack((wave, wave))
-        return stereo.tobytes()
-    
     def load_statistics(self):
         """Load game statistics"""
+        if self.database:
+            self.stats = self.database.stats()
+            self.update_stats_display()
+            return
         try:
             with open("game_stats.json", "r") as f:
                 stats = json.load(f)
@@ -378,6 +536,11 @@ class NumberPuzzleGUI:
     
     def save_statistics(self, score):
         """Save game statistics"""
+        if self.database:
+            # end_game already stored the game; the totals are one query away
+            self.stats = self.database.stats()
+            self.update_stats_display()
+            return
         self.stats["games_played"] += 1
         if score > self.stats["best_score"]:
             self.stats["best_score"] = score
@@ -428,44 +591,17 @@ class NumberPuzzleGUI:
         self.history_listbox.see(tk.END)
     
     def draw_path_indicator(self):
-        """Draw lines connecting the sequence of moves"""
-        if len(self.moves) < 2:
-            return
-        
-        theme = self.themes[self.current_theme]
-        path_color = theme["path_color"]
-        
-        # Remove existing path canvas if any
-        if hasattr(self, 'path_canvas') and self.path_canvas:
-            self.path_canvas.destroy()
-        
-        # Create a single canvas for all path lines with the board frame's background color
-        # This makes it blend in with the background
-        self.path_canvas = tk.Canvas(self.board_frame, bg=theme["bg"], highlightthickness=0)
-        self.path_canvas.place(x=0, y=0, relwidth=1, relheight=1)
-        
-        # Draw lines between consecutive moves
-        for i in range(len(self.moves) - 1):
-            start_row, start_col = self.moves[i]
-            end_row, end_col = self.moves[i + 1]
-            
-            # Get button coordinates
-            start_btn = self.buttons[start_row][start_col]
-            end_btn = self.buttons[end_row][end_col]
-            
-            # Draw line
-            start_x = start_btn.winfo_x() + start_btn.winfo_width() / 2
-            start_y = start_btn.winfo_y() + start_btn.winfo_height() / 2
-            end_x = end_btn.winfo_x() + end_btn.winfo_width() / 2
-            end_y = end_btn.winfo_y() + end_btn.winfo_height() / 2
-            
-            self.path_canvas.create_line(start_x, start_y, end_x, end_y,
-                          fill=path_color, width=3, arrow=tk.LAST)
-        
-        # Ensure buttons are above the canvas
-        for row in self.buttons:
-            for button in row:
-                button.lift(self.path_canvas)
+        """Bring the path overlay up to date; only segments that changed are redrawn"""
+        self.path_overlay.sync(self.moves)
+
+    def button_center(self, row, col):
+        button = self.buttons[row][col]
+        return (button.winfo_x() + button.winfo_width() / 2,
+                button.winfo_y() + button.winfo_height() / 2)
+
+    def on_board_resized(self, event=None):
+        self.path_overlay.set_width(self.board_view.path_width())
+        self.path_overlay.relayout()
     
     def show_help(self):
         """Show How to Play modal"""
@@ -549,6 +685,15 @@ TIPS:
         self.btn_sound.config(text=f"Sound: {'ON' if self.sounds_enabled else 'OFF'}")
     
     def handle_keypress(self, event):
+        # While replaying, arrows step through the game and space plays/pauses
+        if self.replay:
+            if event.keysym == "Left":
+                self.replay_step(-1)
+            elif event.keysym == "Right":
+                self.replay_step(1)
+            elif event.keysym == "space":
+                self.toggle_replay_play()
+            return
         # Map arrow keys to moves
         if event.keysym == "Up":
             self.move_by_key(-3, 0)
@@ -569,24 +714,71 @@ TIPS:
             self.move_by_key(2, 2)
 
     def set_board_size(self, option):
-        if option == "Small (5x5)":
-           self.size = 5
-        elif option == "Standard (10x10)":
-            self.size = 10
+        self.size = self.board_sizes[option]
+        self.update_score_list()
         
         self.create_board()
         self.start_new_game() # Start a new game with the new size.
 
+    def load_renderer_setting(self):
+        try:
+            with open("config.json", "r") as f:
+                return json.load(f).get("renderer", "auto")
+        except (FileNotFoundError, json.JSONDecodeError):
+            return "auto"
+
+    def use_canvas_renderer(self):
+        return self.renderer == "canvas" or (self.renderer == "auto" and self.size > 20)
+
     def create_board(self):
-        # Clear old board buttons
-        for row_buttons in self.buttons:
-            for button in row_buttons:
-                button.destroy()
+        # Settle running fades while their cells still exist
+        self.animator.clear()
+        # Clear old board (canvas or buttons)
+        if self.board_view:
+            self.board_view.destroy()
+            self.board_view = None
+        else:
+            for row_buttons in self.buttons:
+                for button in row_buttons:
+                    button.destroy()
         self.buttons = []
+        if self.path_canvas:
+            self.path_canvas.destroy()
+            self.path_canvas = None
 
         # Clear old game board
-        self.board = [[0 for _ in range(self.size)] for _ in range(self.size)]
-        
+        self.engine.reset(self.size)
+        self.journal.reset(self.size)
+        self.move_tree.reset()
+        self.move_analyzer.board_size = self.size
+        self.worker.cancel()
+        # One search (and transposition table) per board size, shared by Auto Play and tips
+        self.lookahead = LookaheadSearch(self.size)
+        # Render this size's move beeps now so no audio is synthesized during play
+        if self.sound_bank:
+            self.sound_bank.prepare(self.size)
+        self.set_board_weights()
+        
+        if self.use_canvas_renderer():
+            # One canvas for the whole grid; its cells take the same config() calls as buttons
+            self.board_view = CanvasBoard(
+                self.board_frame, self.size, self.themes[self.current_theme],
+                self.make_move, self.on_button_hover, self.on_button_leave
+            )
+            self.board_view.grid(row=0, column=0, columnspan=self.size, rowspan=self.size, sticky='nsew')
+            self.buttons = self.board_view.cells
+            self.painter = CellPainter(self.buttons, self.themes[self.current_theme]["button_bg"])
+            self.highlighted = {}
+            # The path shares the board canvas, drawn between cell backgrounds and numbers
+            self.path_overlay = PathOverlay(
+                self.board_view.canvas, self.board_view.center,
+                self.themes[self.current_theme]["path_color"], self.board_view.path_width(), below="label"
+            )
+            self.board_view.canvas.bind("<<BoardResized>>", self.on_board_resized)
+            self.apply_theme()
+            self.label_info.config(text="Game will start with '1' in top-left corner")
+            return
+
         # Create new board with enhanced styling
         for row in range(self.size):
            button_row = []
@@ -610,25 +802,43 @@ TIPS:
               
               button_row.append(button)
            self.buttons.append(button_row)
+        
+        self.painter = CellPainter(self.buttons, self.themes[self.current_theme]["button_bg"])
+        self.highlighted = {}
+        
+        # One persistent path canvas behind the buttons; segments are added and removed per move
+        self.path_canvas = tk.Canvas(self.board_frame, bg=self.themes[self.current_theme]["bg"], highlightthickness=0)
+        self.path_canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        self.path_canvas.lower()
+        self.path_overlay = PathOverlay(self.path_canvas, self.button_center,
+                                        self.themes[self.current_theme]["path_color"])
+        self.path_canvas.bind("<Configure>", self.path_overlay.relayout)
         self.apply_theme()
         self.label_info.config(text="Game will start with '1' in top-left corner")
     
+    def set_board_weights(self):
+        """Weight exactly this size's rows and columns of the board frame"""
+        for i in range(self.size, self.board_grid_size):
+            # Left over from a larger board; weighted empty rows would take space
+            self.board_frame.grid_columnconfigure(i, weight=0)
+            self.board_frame.grid_rowconfigure(i, weight=0)
+        for i in range(self.size):
+            self.board_frame.grid_columnconfigure(i, weight=1)
+            self.board_frame.grid_rowconfigure(i, weight=1)
+        self.board_grid_size = self.size
+
     def load_scores(self):
+        if self.database:
+            return {f"{size}x{size}": self.database.top_scores(size) for size in self.board_sizes.values()}
         try:
             with open(self.scores_file, "r") as f:
                 scores = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
             scores = {}
         
-        # Ensure both board size categories exist
-        if "10x10" not in scores:
-            scores["10x10"] = []
-        if "5x5" not in scores:
-            scores["5x5"] = []
-        
-        # Save initialized structure
-        with open(self.scores_file, "w") as f:
-            json.dump(scores, f)
+        # Ensure every board size category exists
+        for size in self.board_sizes.values():
+            scores.setdefault(f"{size}x{size}", [])
             
         return scores
 
@@ -637,34 +847,13 @@ TIPS:
             json.dump(self.top_scores, f)
 
     def is_valid_position(self, row, col):
-        return 0 <= row < self.size and 0 <= col < self.size
+        return self.engine.is_valid_position(row, col)
 
     def is_valid_move(self, next_row, next_col):
-        if not self.is_valid_position(next_row, next_col):
-            return False
-        if self.board[next_row][next_col] != 0:
-            return False
-        return True
+        return self.engine.is_valid_move(next_row, next_col)
 
     def get_possible_moves(self):
-        if self.current_position is None:
-            return []
-
-        row, col = self.current_position
-        possible_moves = []
-        #Straight
-        moves_straight = [(0, -3), (0, 3), (-3, 0), (3, 0)]
-        for dr, dc in moves_straight:
-            next_row, next_col = row + dr, col + dc
-            if self.is_valid_move(next_row, next_col):
-              possible_moves.append((next_row, next_col))
-        #Diagonal
-        moves_diagonal = [(-2, -2), (-2, 2), (2, -2), (2, 2)]
-        for dr, dc in moves_diagonal:
-           next_row, next_col = row + dr, col + dc
-           if self.is_valid_move(next_row, next_col):
-                possible_moves.append((next_row, next_col))
-        return possible_moves
+        return self.engine.get_possible_moves()
     
     def move_by_key(self, dr, dc):
         if self.game_over or self.current_position is None:
@@ -679,62 +868,43 @@ TIPS:
         if self.game_over:
             return
 
-        # Log the state before the move
-        current_state = {
-            "turn": self.current_number,
-            "board": [row[:] for row in self.board],
-            "position": (row, col),
-            "timestamp": time.time()
-        }
-
         # Execute the move with existing logic
         if self.current_number == 1:
-            self.start_time = time.time()
-            self.board[row][col] = self.current_number
-            self.current_position = (row, col)
-            target_color = self.get_color(self.current_number)
-            self.animate_number_placement(row, col, str(self.current_number), target_color)
-            self.moves.append((row, col))
-            self.current_number += 1
+            self.clock.start()
+            self.engine.place(row, col)
+            target_color = self.get_color(self.current_number - 1)
+            self.animate_number_placement(row, col, str(self.current_number - 1), target_color)
             self.label_info.config(text=f"Current Number: {self.current_number}")
             self.move_counter.config(text=f"Moves: {len(self.moves)}")
             self.play_sound("move")
             self.highlight_valid_moves()
-            self.update_timer()
             self.update_progress_bar()
             self.update_move_history()
             self.draw_path_indicator()
-            self.game_history.append(current_state)
+            self.journal.append(row, col, time.time(), len(self.get_possible_moves()))
+            self.move_tree.play((row, col))
             self.analyze_and_update_strategy()
+            self.request_analysis()
             return
 
-        if not self.is_valid_move(row, col):
-            self.play_sound("invalid")
-            self.window.after(0, lambda: messagebox.showerror("Invalid Move", "Invalid move! Try again."))
-            return
-        
-        possible_moves = self.get_possible_moves()
-        if (row, col) not in possible_moves:
+        if not self.engine.place(row, col):
             self.play_sound("invalid")
             self.window.after(0, lambda: messagebox.showerror("Invalid Move", "Invalid move! Try again."))
             return
 
-        self.board[row][col] = self.current_number
-        self.current_position = (row, col)
-        target_color = self.get_color(self.current_number)
-        self.animate_number_placement(row, col, str(self.current_number), target_color)
-        self.moves.append((row, col))
-        self.current_number += 1
+        target_color = self.get_color(self.current_number - 1)
+        self.animate_number_placement(row, col, str(self.current_number - 1), target_color)
         self.label_info.config(text=f"Current Number: {self.current_number}")
         self.move_counter.config(text=f"Moves: {len(self.moves)}")
         self.play_sound("move")
         self.highlight_valid_moves()
-        self.update_timer()
         self.update_progress_bar()
         self.update_move_history()
         self.draw_path_indicator()
-        self.game_history.append(current_state)
+        self.journal.append(row, col, time.time(), len(self.get_possible_moves()))
+        self.move_tree.play((row, col))
         self.analyze_and_update_strategy()
+        self.request_analysis()
 
         # Check if game should end (no possible moves OR board is full)
         possible_moves = self.get_possible_moves()
@@ -759,22 +929,32 @@ TIPS:
             print(f"Debug: Very high number ({self.current_number}) with few moves ({len(possible_moves)}). Considering ending game.")
 
     def start_new_game(self):
-        self.board = [[0 for _ in range(self.size)] for _ in range(self.size)]
-        self.current_number = 1
+        # Leaves replay mode too
+        self.replay = None
+        self.replay_playing = False
+        self.replay_frame.grid_remove()
+        self.engine.reset(self.size)
+        self.journal.reset(self.size)
+        self.move_tree.reset()
         self.game_over = False
-        self.moves = []
-        self.start_time = 0
+        self.game_recorded = False
+        self.clock.reset()
         self.elapsed_time = 0
         self.auto_playing = False
+        self.turbo_active = False
         self.btn_auto.config(text="Auto Play")
 
-        # Reset all buttons
+        # Reset all cells (only the ones that show something get a Tk update)
+        self.animator.clear()
+        button_bg = self.themes[self.current_theme]["button_bg"]
         for row in range(self.size):
             for col in range(self.size):
-                self.buttons[row][col].config(text=" ", bg=self.themes[self.current_theme]["button_bg"], fg=self.themes[self.current_theme]["button_fg"])
+                self.painter.set_text(row, col, " ", relief="raised")
+                self.painter.paint(row, col, button_bg)
+        self.highlighted = {}
         
         self.btn_undo.config(state=tk.DISABLED)
-        self.label_time.config(text="Time: 0 s")
+        self.show_time(0)
         
         # Hide Game Over label
         self.game_over_label.place_forget()
@@ -782,11 +962,8 @@ TIPS:
         # Automatically place 1 in the top-left corner (0,0)
         self.make_move(0, 0)
 
-    def update_timer(self):
-        if not self.game_over and self.start_time != 0:
-            self.elapsed_time = int(time.time() - self.start_time)
-            self.label_time.config(text=f"Time: {self.elapsed_time} s")
-            self.window.after(100, self.update_timer)
+    def show_time(self, seconds):
+        self.label_time.config(text=f"Time: {seconds:.1f} s")
 
     def get_color(self, number):
         """Generate color gradient from cold blue to hot red"""
@@ -820,15 +997,13 @@ TIPS:
     def end_game(self):
         self.game_over = True
         self.auto_playing = False
-        self.elapsed_time = int(time.time() - self.start_time)
+        self.auto_move_pending = False
+        self.worker.cancel()
+        self.elapsed_time = int(self.clock.pause())
         
         # Calculate final score (current_number is the NEXT number to place, so score is current_number - 1)
         # But if board is full (reached size*size), score should be size*size
-        max_cells = self.size * self.size
-        if self.current_number > max_cells:
-            score = max_cells
-        else:
-            score = self.current_number - 1
+        score = self.engine.score()
         
         print(f"Game ended with score: {score}, current_number: {self.current_number}, size: {self.size}")
         
@@ -838,61 +1013,42 @@ TIPS:
         self.game_over_label.lift()
         self.game_over_label.tkraise()
         
-        # Save game history - updated logging to write a valid JSON list
-        game_summary = {
-            "size": self.size,
-            "score": score,
-            "time": self.elapsed_time,
-            "moves": [(state["position"], state["turn"]) for state in self.game_history]
-        }
-        
-        try:
-            # Read existing logs - handle both JSON array and newline-delimited JSON objects
-            existing_logs = []
-            if os.path.exists("game_history.json"):
-                try:
-                    # Try to read as JSON array first
-                    with open("game_history.json", "r") as f:
-                        existing_logs = json.load(f)
-                        if not isinstance(existing_logs, list):
-                            # If it's not a list, try to read as newline-delimited JSON
-                            existing_logs = []
-                            f.seek(0)
-                            for line in f:
-                                line = line.strip()
-                                if line:
-                                    try:
-                                        existing_logs.append(json.loads(line))
-                                    except json.JSONDecodeError:
-                                        pass
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, try to read as newline-delimited JSON
-                    existing_logs = []
-                    with open("game_history.json", "r") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    existing_logs.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    pass
+        # A game reopened with undo or Switch Branch was stored when it first ended;
+        # ending it again must not count it (or ask for initials) a second time
+        first_end = not self.game_recorded
+        self.game_recorded = True
+        
+        if first_end:
+            # Save game history
+            game_summary = {
+                "size": self.size,
+                "score": score,
+                "time": self.elapsed_time,
+                "moves": [(position, number) for position, number, _ in self.journal.moves()]
+            }
             
-            # Append new game summary
-            existing_logs.append(game_summary)
-            # Write back the updated logs as a JSON array
-            with open("game_history.json", "w") as f:
-                json.dump(existing_logs, f, indent=2)
-        except Exception as e:
-            print(f"Error saving game history: {e}")
+            moves = self.journal.moves()
+            # Feed the finished game into the strategy tips' position index
+            self.move_analyzer.record_game(self.size, moves, score)
+            
+            try:
+                if self.database:
+                    self.database.record_game(self.size, score, self.elapsed_time, moves)
+                else:
+                    # One durable append per game, however long the history is
+                    self.game_store.append(game_summary)
+            except Exception as e:
+                print(f"Error saving game history: {e}")
         
-        self.label_time.config(text=f"Time: {self.elapsed_time} s")
+        self.show_time(self.clock.elapsed())
         self.play_sound("win")
         
-        # Always save statistics
-        self.save_statistics(score)
-        
-        # Check for high score - call directly
-        self.check_high_score(score, self.elapsed_time)
+        if first_end:
+            # Always save statistics
+            self.save_statistics(score)
+            
+            # Check for high score - call directly
+            self.check_high_score(score, self.elapsed_time)
         self.btn_auto.config(text="Auto Play")
         
         # Force UI update
@@ -904,6 +1060,53 @@ TIPS:
             print("Manually triggering game end for testing...")
             self.end_game()
 
+    def solve_from_position(self):
+        """Check whether a complete tour is still reachable and show the next step"""
+        if self.replay or not self.moves:
+            return
+        node = self.move_tree.current
+        result = node.cache.get("solver")
+        if result is not None:
+            self.show_solver_result(result)
+            return
+        version = self.position_version
+        if self.solver_version == version:
+            return  # already solving this position
+        self.solver_version = version
+        # The solver may take its whole time limit, so it runs on the worker
+        size = self.size
+        moves = list(self.moves)
+        self.worker.submit(
+            lambda stop_event: TourSolver(size, time_limit=1.0).solve(moves),
+            lambda result: self.on_solver_ready(version, node, result)
+        )
+
+    def on_solver_ready(self, version, node, result):
+        """Runs on the Tk thread once the worker has solved a position"""
+        if result["status"] != BUDGET_EXHAUSTED:
+            node.cache["solver"] = result  # exact answers hold whenever this position comes back
+        if version != self.position_version:
+            return
+        self.solver_version = None
+        self.show_solver_result(result)
+
+    def show_solver_result(self, result):
+        max_cells = self.size * self.size
+        if result["status"] == FOUND:
+            if len(self.moves) < max_cells:
+                next_row, next_col = result["path"][len(self.moves)]
+                self.highlight_cell(next_row, next_col, "#0000FF")
+                message = (f"A full {max_cells}-cell tour is still possible!\n\n"
+                           f"Next move: ({next_row}, {next_col})")
+            else:
+                message = "The board is already complete."
+        elif result["status"] == IMPOSSIBLE:
+            message = f"No full {max_cells}-cell tour exists from this position."
+        else:
+            message = (f"Solver gave up after {result['nodes']} positions "
+                       f"({result['elapsed']:.2f}s) without an answer.")
+        self.window.after(0, lambda: messagebox.showinfo("Solver", message))
+
     def toggle_auto_play(self):
         if self.game_over:
             return
@@ -912,17 +1115,209 @@ TIPS:
             self.btn_auto.config(text="Stop Auto Play")
             self.make_auto_move()
         else:
+            self.auto_move_pending = False
             self.btn_auto.config(text="Auto Play")
+            self.finish_turbo()
+
+    def auto_play_speed(self):
+        """Auto Play moves per second, or None for instant"""
+        return self.auto_play_speeds[self.speed_var.get()]
+
+    def on_speed_change(self, value=None):
+        speed = self.auto_play_speed()
+        self.auto_play_delay = 0 if speed is None else 1000 // speed
+        self.speed_label.config(text="Speed: Instant" if speed is None else f"Speed: {speed} moves/s")
+
+    def use_turbo(self):
+        speed = self.auto_play_speed()
+        return speed is None or speed > self.TURBO_MIN_SPEED
+
+    def choose_turbo_move(self, time_budget):
+        """Pick an Auto Play move without the background worker or the move analysis"""
+        if self.tablebase and self.tablebase.covers(self.engine):
+            move = self.tablebase.best_move(self.engine)
+            if move:
+                return move
+        if time_budget:
+            move, _ = self.get_turbo_search().best_move(self.engine, time_budget)
+            if move:
+                return move
+        return max(self.get_possible_moves(),
+                   key=lambda move: heuristic_score(self.engine, move, HEURISTIC_WEIGHTS))
+
+    def turbo_time_budget(self):
+        """Search seconds per turbo move; None plays the one-ply heuristic"""
+        strength = self.strength_levels[self.strength_var.get()]
+        if strength is None:
+            return None
+        # Every other strength (Monte-Carlo too) searches for one move's share
+        # of the time; Instant still gets a millisecond, which is enough to
+        # fill most 10x10 boards
+        speed = self.auto_play_speed()
+        budget = self.TURBO_INSTANT_BUDGET if speed is None else 1.0 / speed
+        return min(strength, budget) if isinstance(strength, float) else budget
+
+    def get_turbo_search(self):
+        """Search (and table) used only by turbo moves on the Tk thread
+
+        The worker thread may still be finishing a cancelled job on
+        self.lookahead, and a LookaheadSearch keeps its deadline and stop
+        flag on the instance, so the two must never share one.
+        """
+        if self.turbo_search is None or self.turbo_search.size != self.size:
+            self.turbo_search = LookaheadSearch(self.size)
+        return self.turbo_search
+
+    def turbo_step(self):
+        """Play one frame's worth of Auto Play moves on the engine, then draw the board once"""
+        if not self.turbo_active:
+            # Background analysis can't keep up; drop it until turbo ends
+            self.turbo_active = True
+            self.worker.cancel()
+            self.position_version += 1
+            self.analysis = None
+            self.auto_move_pending = False
+        speed = self.auto_play_speed()
+        time_budget = self.turbo_time_budget()
+        if speed is None:
+            interval, count = 0, None
+            deadline = time.perf_counter() + self.TURBO_FRAME_MS / 1000
+        else:
+            interval = max(self.TURBO_FRAME_MS, 1000 // speed)
+            count = max(1, round(speed * interval / 1000))
+            deadline = None
+        max_cells = self.size * self.size
+        finished = False
+        played = 0
+        while True:
+            if not self.get_possible_moves() or self.current_number > max_cells:
+                finished = True
+                break
+            if count is not None and played >= count:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            row, col = self.choose_turbo_move(time_budget)
+            self.engine.place(row, col)
+            self.journal.append(row, col, time.time(), len(self.get_possible_moves()))
+            self.move_tree.play((row, col))
+            played += 1
+        # Instant mode only draws when the game is over; the others once per frame
+        if finished or speed is not None:
+            self.render_turbo_frame()
+        if finished:
+            self.turbo_active = False
+            self.end_game()
+        elif self.auto_playing:
+            self.window.after(interval, self.make_auto_move)
+
+    def render_turbo_frame(self):
+        self.render_position()
+        self.highlight_valid_moves()
+        self.label_info.config(text=f"Current Number: {self.current_number}")
+
+    def finish_turbo(self):
+        """Bring the UI and background analysis back after turbo moves"""
+        if not self.turbo_active:
+            return
+        self.turbo_active = False
+        if not self.game_over:
+            self.render_turbo_frame()
+            self.analyze_and_update_strategy()
+            self.request_analysis()
+
+    def request_analysis(self):
+        """Drop stale background work and start analysing the current position"""
+        self.worker.cancel()
+        self.analysis = None
+        self.position_version += 1
+        if self.game_over or not self.moves:
+            return
+        version = self.position_version
+        # Revisited positions reuse the analysis cached on their tree node
+        node = self.move_tree.current
+        cache_key = ("analysis", self.strength_var.get(), self.lookahead_depth)
+        cached = node.cache.get(cache_key)
+        if cached is not None:
+            self.window.after_idle(lambda: self.on_analysis_ready(version, cached))
+            return
+        snapshot = self.engine.copy()
+        search = self.lookahead
+        depth = self.lookahead_depth
+        budget = self.strength_levels[self.strength_var.get()]
+        rollouts = None
+        if budget == "rollouts":
+            rollouts = self.get_rollout_evaluator()
+            budget = None
+        self.worker.submit(
+            lambda stop_event: analyze_snapshot(search, snapshot, depth, budget, stop_event, rollouts),
+            lambda result: self.on_analysis_ready(version, result, node, cache_key)
+        )
+
+    def get_rollout_evaluator(self):
+        """Monte-Carlo evaluator for the current board size (needs NumPy)"""
+        if self.rollout_evaluator is None or self.rollout_evaluator.size != self.size:
+            try:
+                # Imported on first use so the game runs without NumPy
+                from rollout import RolloutEvaluator
+            except ImportError as e:
+                print(f"Monte-Carlo Auto Play unavailable: {e}")
+                return None
+            self.rollout_evaluator = RolloutEvaluator(self.size)
+        return self.rollout_evaluator
+
+    def on_analysis_ready(self, version, result, node=None, cache_key=None):
+        """Runs on the Tk thread once the worker has analysed a position"""
+        if node is not None:
+            node.cache[cache_key] = result
+        if version != self.position_version or self.game_over:
+            return
+        self.analysis = result
+        if self.show_search_tips:
+            self.show_lookahead_tips(result)
+        if self.auto_move_pending and self.auto_playing:
+            self.auto_move_pending = False
+            self.play_analyzed_move(result)
 
     def make_auto_move(self):
         if not self.auto_playing or self.game_over:
             return
+        if self.use_turbo():
+            self.turbo_step()
+            return
+        # Slider moved back below turbo speed: draw the board and restart analysis
+        self.finish_turbo()
 
         possible_moves = self.get_possible_moves()
         if not possible_moves:
             self.end_game()
             return
 
+        # Small boards are solved exactly by the tablebase
+        if self.tablebase and self.tablebase.covers(self.engine):
+            best_position = self.tablebase.best_move(self.engine)
+            if best_position:
+                self.make_move(*best_position)
+                if self.auto_playing:
+                    self.window.after(self.auto_play_delay, self.make_auto_move)
+                return
+
+        # Search results come from the background worker; wait for them if needed
+        if self.analysis is None:
+            self.auto_move_pending = True
+            return
+        self.play_analyzed_move(self.analysis)
+
+    def play_analyzed_move(self, analysis):
+        """Make the Auto Play move chosen from a background analysis"""
+        possible_moves = self.get_possible_moves()
+        if not possible_moves:
+            self.end_game()
+            return
+
+        # Lookahead ratings are cached in the table shared with the strategy tips
+        lookahead = analysis["ratings"]
+
         # Enhanced move analysis using historical data
         move_analyses = []
         for move in possible_moves:
@@ -931,45 +1326,152 @@ TIPS:
                 "position": move,
                 "future_moves": self.count_future_moves(move),
                 "board_coverage": self.calculate_board_coverage(move),
-                "corner_proximity": self.is_corner_move(*move)
+                "corner_proximity": self.is_corner_move(*move),
+                "lookahead": lookahead.get(move, 0)
             }
             
             # Combine historical and current analysis
             score = (
                 (historical_analysis["success_rate"] * 20 if historical_analysis else 0) +
-                current_analysis["future_moves"] * 10 +
-                (10 - current_analysis["corner_proximity"]) * 2 +
-                current_analysis["board_coverage"] * 5
+                heuristic_score(self.engine, move, HEURISTIC_WEIGHTS) +
+                current_analysis["lookahead"] * 10
             )
             
             move_analyses.append({**current_analysis, "score": score})
 
-        # Choose best move
-        best_move = max(move_analyses, key=lambda x: x["score"])
+        # Choose best move: the search (or Monte-Carlo) pick if there is one,
+        # otherwise the best heuristic score. Search picks are analysed too, so
+        # every Auto Play move is logged with its candidates' future moves:
+        # that log is what MoveAnalyzer rebuilds its position index from.
+        best_move = next((m for m in move_analyses if m["position"] == analysis["best_move"]), None)
+        if best_move is None:
+            best_move = max(move_analyses, key=lambda x: x["score"])
+        self.log_move_analysis({
+            "turn": self.current_number,
+            "size": self.size,
+            "chosen_move": best_move["position"],
+            "analyzed_moves": [{k: v for k, v in m.items() if k != "score"} for m in move_analyses],
+            "best_score": best_move["score"],
+            "timestamp": time.time()
+        })
         self.make_move(*best_move["position"])
         
         if self.auto_playing:
-            self.window.after(500, self.make_auto_move)
+            self.window.after(self.auto_play_delay, self.make_auto_move)
+
+    def start_replay(self):
+        """Load a recorded game of the current board size into replay mode"""
+        history = self.database or self.game_store
+        count = history.count(self.size)
+        if not count:
+            messagebox.showinfo("Replay", f"No {self.size}x{self.size} games recorded yet.")
+            return
+        if not self.game_over and self.engine.moves and not messagebox.askyesno(
+            "Replay", "Replaying a recorded game ends the game in progress.\nContinue?"
+        ):
+            return
+        n = simpledialog.askinteger(
+            "Replay", f"Replay which {self.size}x{self.size} game?\n(1 = most recent, {count} = oldest)",
+            minvalue=1, maxvalue=count
+        )
+        if n is None:
+            return
+        record = history.recent(self.size, n)
+
+        # Replay drives the board directly; stop play and background analysis
+        self.auto_playing = False
+        self.auto_move_pending = False
+        self.turbo_active = False
+        self.btn_auto.config(text="Auto Play")
+        self.worker.cancel()
+        self.position_version += 1  # the move tree's node no longer matches the board
+        self.clock.pause()
+        self.game_over = True  # blocks clicks and Auto Play
+        self.game_over_label.place_forget()
+        self.btn_undo.config(state=tk.DISABLED)
+        self.replay = ReplayEngine(record, self.engine)
+        self.replay_playing = False
+        self.btn_replay_play.config(text="Play")
+        self.replay_scale.config(to=self.replay.length)
+        self.replay_frame.grid(row=18, column=0, pady=5, sticky='ew')
+        self.label_time.config(text=f"Time: {record.get('time', 0)} s")
+        self.replay_seek(1)
+        if self.replay.truncated:
+            messagebox.showwarning(
+                "Replay", f"Game {n} contains moves that break the rules; "
+                f"only its first {self.replay.length} of {len(record['moves'])} moves can be replayed."
+            )
+
+    def replay_seek(self, k):
+        """Jump to the position after move k; the board is redrawn once, when idle"""
+        if not self.replay:
+            return
+        self.replay.seek(k)
+        if not self.replay_render_pending:
+            self.replay_render_pending = True
+            self.window.after_idle(self.render_replay_frame)
+
+    def replay_step(self, delta):
+        if not self.replay:
+            return
+        self.replay_playing = False
+        self.btn_replay_play.config(text="Play")
+        self.replay_seek(self.replay.position + delta)
+
+    def on_replay_scrub(self, value):
+        if self.replay and int(float(value)) != self.replay.position:
+            self.replay_seek(int(float(value)))
+
+    def toggle_replay_play(self):
+        if not self.replay:
+            return
+        self.replay_playing = not self.replay_playing
+        self.btn_replay_play.config(text="Pause" if self.replay_playing else "Play")
+        if self.replay_playing:
+            if self.replay.at_end():
+                self.replay_seek(1)
+            self.window.after(self.replay_interval, self.replay_tick)
+
+    def replay_tick(self):
+        if not self.replay or not self.replay_playing:
+            return
+        if self.replay.at_end():
+            self.replay_playing = False
+            self.btn_replay_play.config(text="Play")
+            return
+        self.replay_seek(self.replay.position + 1)
+        self.window.after(self.replay_interval, self.replay_tick)
+
+    def render_replay_frame(self):
+        self.replay_render_pending = False
+        if not self.replay:
+            return
+        self.render_position()
+        self.replay_scale.set(self.replay.position)
+        self.label_info.config(text=f"Replay: move {self.replay.position} of {self.replay.length}")
+
+    def render_position(self):
+        """Draw the engine's board as-is: no animation, sound, analysis or logging"""
+        self.animator.clear()
+        for row in range(self.size):
+            for col in range(self.size):
+                number = self.board[row][col]
+                self.painter.set_text(row, col, str(number) if number else " ",
+                                      relief="sunken" if number else "raised")
+                self.painter.paint(row, col, self.base_color(row, col))
+        self.highlighted = {}
+        self.move_counter.config(text=f"Moves: {len(self.moves)}")
+        self.update_progress_bar()
+        self.update_move_history()
+        self.draw_path_indicator()
 
     def calculate_board_coverage(self, move):
         """Calculate how well a move contributes to board coverage"""
-        row, col = move
-        coverage = 0
-        for r in range(max(0, row-2), min(self.size, row+3)):
-            for c in range(max(0, col-2), min(self.size, row+3)):
-                if self.board[r][c] == 0:
-                    coverage += 1
-        return coverage / (self.size * self.size)
+        return self.engine.board_coverage(move)
 
     def is_corner_move(self, row, col):
         """Determine if a move is near a corner"""
-        corner_distance = min(
-            abs(row) + abs(col),
-            abs(row) + abs(col - self.size + 1),
-            abs(row - self.size + 1) + abs(col),
-            abs(row - self.size + 1) + abs(col - self.size + 1)
-        )
-        return 1 if corner_distance <= 2 else 0
+        return self.engine.is_corner_move(row, col)
 
     def calculate_quadrant_progress(self, quadrant):
         """Calculate progress in completing current quadrant"""
@@ -1003,56 +1505,21 @@ TIPS:
         return 0
 
     def log_move_analysis(self, analysis_data):
-        """Log move analysis data to JSON file"""
-        log_file = "autoplay_logs.json"
+        """Append move analysis data to the JSONL move log"""
         try:
-            # Convert board state to serializable format
-            analysis_data["board_state"] = [
-                [int(cell) for cell in row] 
-                for row in analysis_data["board_state"]
-            ]
-            
-            # Load existing logs
-            try:
-                with open(log_file, 'r') as f:
-                    logs = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                logs = []
-                
-            # Add new analysis
-            logs.append(analysis_data)
-            
-            # Save updated logs
-            with open(log_file, 'w') as f:
-                json.dump(logs, f, indent=2)
+            # Batched, append-only write on the log's own thread
+            self.move_log.append(analysis_data)
         except Exception as e:
             print(f"Error logging move analysis: {e}")
 
     def count_future_moves(self, position):
         """Count how many moves would be available after making this move"""
-        row, col = position
-        temp_board = [row[:] for row in self.board]
-        temp_board[row][col] = self.current_number
-        
-        # Calculate possible moves from this new position
-        future_moves = []
-        # Straight moves
-        moves_straight = [(0, -3), (0, 3), (-3, 0), (3, 0)]
-        for dr, dc in moves_straight:
-            next_row, next_col = row + dr, col + dc
-            if self.is_valid_position(next_row, next_col) and temp_board[next_row][next_col] == 0:
-                future_moves.append((next_row, next_col))
-        # Diagonal moves
-        moves_diagonal = [(-2, -2), (-2, 2), (2, -2), (2, 2)]
-        for dr, dc in moves_diagonal:
-            next_row, next_col = row + dr, col + dc
-            if self.is_valid_position(next_row, next_col) and temp_board[next_row][next_col] == 0:
-                future_moves.append((next_row, next_col))
-        
-        return len(future_moves)
+        return self.engine.count_future_moves(position)
 
     def check_high_score(self, score, elapsed_time):
         board_key = f"{self.size}x{self.size}"
+        if board_key not in self.top_scores:
+            self.top_scores[board_key] = self.database.top_scores(self.size) if self.database else []
         scores_list = self.top_scores[board_key]
         
         # Check if it's a high score
@@ -1072,10 +1539,14 @@ TIPS:
                 self.window.after(0, lambda: messagebox.showinfo("Game Over", f"Game Over!\n\nFinal Score: {score} (Time: {elapsed_time}s)\n"))
             elif initials and len(initials) == 3:
                 # Valid initials
-                self.top_scores[board_key].append((initials, score, elapsed_time))
-                self.top_scores[board_key].sort(key=lambda item: item[1], reverse=True)
-                self.top_scores[board_key] = self.top_scores[board_key][:10]
-                self.save_scores()
+                if self.database:
+                    self.database.add_score(self.size, initials, score, elapsed_time)
+                    self.top_scores[board_key] = self.database.top_scores(self.size)
+                else:
+                    self.top_scores[board_key].append((initials, score, elapsed_time))
+                    self.top_scores[board_key].sort(key=lambda item: item[1], reverse=True)
+                    self.top_scores[board_key] = self.top_scores[board_key][:10]
+                    self.save_scores()
                 self.update_score_list()
                 self.window.after(0, lambda: messagebox.showinfo("Game Over", f"New High Score!\n\nFinal Score: {score} (Time: {elapsed_time}s)"))
             else:
@@ -1088,16 +1559,12 @@ TIPS:
             self.window.after(0, lambda: messagebox.showinfo("Game Over", f"Game Over!\n\nFinal Score: {score} (Time: {elapsed_time}s)\n"))
     
     def update_score_list(self):
-        self.score_listbox_10x10.delete(0, tk.END)
-        self.score_listbox_5x5.delete(0, tk.END)
-        
-        if "10x10" in self.top_scores:
-            for idx, (initials, score, time) in enumerate(self.top_scores["10x10"]):
-                self.score_listbox_10x10.insert(tk.END, f"{idx+1}: {initials} - Score: {score} (Time: {time}s)")
-        
-        if "5x5" in self.top_scores:
-            for idx, (initials, score, time) in enumerate(self.top_scores["5x5"]):
-                self.score_listbox_5x5.insert(tk.END, f"{idx+1}: {initials} - Score: {score} (Time: {time}s)")
+        """Show the top 10 scores of the current board size"""
+        board_key = f"{self.size}x{self.size}"
+        self.score_title.config(text=f"Top 10 {board_key} Scores")
+        self.score_listbox.delete(0, tk.END)
+        for idx, (initials, score, time) in enumerate(self.top_scores.get(board_key, [])):
+            self.score_listbox.insert(tk.END, f"{idx+1}: {initials} - Score: {score} (Time: {time}s)")
 
     def apply_theme(self):
         theme = self.themes[self.current_theme]
@@ -1140,8 +1607,8 @@ TIPS:
             borderwidth=2,
             cursor="hand2"
         )
-        self.score_listbox_10x10.config(bg=theme["bg"], fg=theme["fg"])
-        self.score_listbox_5x5.config(bg=theme["bg"], fg=theme["fg"])
+        self.score_title.config(bg=theme["bg"], fg=theme["fg"])
+        self.score_listbox.config(bg=theme["bg"], fg=theme["fg"])
         self.progress_bar.config(bg=theme["bg"])
         self.history_listbox.config(bg=theme["bg"], fg=theme["fg"])
         self.stats_label.config(bg=theme["bg"], fg=theme["fg"])
@@ -1164,6 +1631,43 @@ TIPS:
             borderwidth=2,
             cursor="hand2"
         )
+        self.btn_solve.config(
+            bg=theme["button_bg"],
+            fg=theme["button_fg"],
+            activebackground=theme["button_active_bg"],
+            relief="raised",
+            borderwidth=2,
+            cursor="hand2"
+        )
+        for button in (self.btn_redo, self.btn_branch):
+            button.config(
+                bg=theme["button_bg"],
+                fg=theme["button_fg"],
+                activebackground=theme["button_active_bg"],
+                relief="raised",
+                borderwidth=2,
+                cursor="hand2"
+            )
+        self.btn_replay.config(
+            bg=theme["button_bg"],
+            fg=theme["button_fg"],
+            activebackground=theme["button_active_bg"],
+            relief="raised",
+            borderwidth=2,
+            cursor="hand2"
+        )
+        if self.path_overlay:
+            self.path_overlay.set_color(theme["path_color"])
+        if self.path_canvas:
+            self.path_canvas.config(bg=theme["bg"])
+        if self.painter:
+            # Every cell is back to the theme background
+            self.painter.reset(theme["button_bg"])
+            self.highlighted = {}
+        if self.board_view:
+            # Two tag-wide updates instead of one config per cell
+            self.board_view.apply_theme(theme)
+            return
         for row in self.buttons:
             for button in row:
                 button.config(
@@ -1183,57 +1687,85 @@ TIPS:
         self.current_theme = themes[next_index]
         self.btn_theme.config(text=self.current_theme.capitalize() + " Theme")
         self.apply_theme()
+        # Repaint numbered cells and highlights; only cells that differ from the new background change
+        if self.moves:
+            self.render_position()
+            if not self.game_over:
+                self.highlight_valid_moves()
 
     def run(self):
+        self.window.protocol("WM_DELETE_WINDOW", self.on_close)
         self.window.mainloop()
 
+    def on_close(self):
+        """Stop background threads and flush pending log records before exiting"""
+        self.clock.pause()
+        self.animator.clear()
+        self.worker.shutdown()
+        self.move_log.close()
+        self.game_store.close()
+        if self.database:
+            self.database.close()
+        self.window.destroy()
+
+    def base_color(self, row, col):
+        """Cell colour without highlights: its number's colour, or the theme's"""
+        number = self.board[row][col]
+        return self.get_color(number) if number else self.themes[self.current_theme]["button_bg"]
+
+    def set_highlights(self, highlights):
+        """Show {(row, col): colour} highlights, updating only cells that change"""
+        for cell in self.highlighted:
+            if cell not in highlights:
+                self.painter.paint(*cell, self.base_color(*cell))
+        for (row, col), color in highlights.items():
+            self.painter.paint(row, col, color)
+        self.highlighted = highlights
+
+    def highlight_cell(self, row, col, color):
+        """Add one highlight on top of the current ones"""
+        self.highlighted[(row, col)] = color
+        self.painter.paint(row, col, color)
+
     def highlight_valid_moves(self):
-        valid_moves = self.get_possible_moves()
-        for row in range(self.size):
-         for col in range(self.size):
-          if (row, col) in valid_moves:
-           future_moves_count = self.count_future_moves((row, col))
-           if not hasattr(self, 'min_future_moves_valid_moves'):
-            self.min_future_moves_valid_moves = {}
-           self.min_future_moves_valid_moves[(row, col)] = future_moves_count
-
-        if valid_moves:
-         min_future_moves = min(self.min_future_moves_valid_moves.values())
-         for row in range(self.size):
-          for col in range(self.size):
-           if (row, col) in valid_moves and self.min_future_moves_valid_moves[(row, col)] == min_future_moves:
-            self.buttons[row][col].config(bg="#FFA500") # Highlight color for fewest options
-           elif (row, col) in valid_moves:
-            self.buttons[row][col].config(bg="#90EE90") # Original valid move color
-           else:
-            self.buttons[row][col].config(bg=self.themes[self.current_theme]["button_bg"])
+        highlights = {}
+        future_moves = {move: self.count_future_moves(move) for move in self.get_possible_moves()}
+        if future_moves:
+            fewest = min(future_moves.values())
+            for move, count in future_moves.items():
+                # Orange for the fewest onward options, green for the other valid moves
+                highlights[move] = "#FFA500" if count == fewest else "#90EE90"
+        self.set_highlights(highlights)
         self.btn_undo.config(state=tk.NORMAL if len(self.moves) > 1 else tk.DISABLED)
+        self.btn_redo.config(state=tk.NORMAL if self.move_tree.redo_node() else tk.DISABLED)
 
     def highlight_analyzed_moves(self, analyzed_moves, best_move):
         if not analyzed_moves:
             return self.highlight_valid_moves()
-        valid_moves = self.get_possible_moves()
-        for row in range(self.size):
-            for col in range(self.size):
-                if (row, col) not in valid_moves:
-                    self.buttons[row][col].config(bg=self.themes[self.current_theme]["button_bg"])
-                    continue
-                move_analysis = next((m for m in analyzed_moves if m["position"] == (row, col)), None)
-                if move_analysis:
-                    if move_analysis["position"] == best_move["position"]:
-                        self.buttons[row][col].config(bg="#0000FF")  # Bright blue for best move
-                    elif move_analysis["success_rate"] > 0.6:
-                        self.buttons[row][col].config(bg="#90EE90")  # Light green for good moves
-                    else:
-                        self.buttons[row][col].config(bg="#FFA500")  # Orange for other moves
-                else:
-                    self.buttons[row][col].config(bg="#FFA500")
+        analyses = {m["position"]: m for m in analyzed_moves}
+        highlights = {}
+        for move in self.get_possible_moves():
+            move_analysis = analyses.get(move)
+            if move_analysis is None:
+                highlights[move] = "#FFA500"
+            elif move == best_move["position"]:
+                highlights[move] = "#0000FF"  # Bright blue for best move
+            elif move_analysis["success_rate"] > 0.6:
+                highlights[move] = "#90EE90"  # Light green for good moves
+            else:
+                highlights[move] = "#FFA500"  # Orange for other moves
+        self.set_highlights(highlights)
 
     def analyze_and_update_strategy(self):
-        if len(self.game_history) < 2:
+        if len(self.journal) < 2:
             return
 
         possible_moves = self.get_possible_moves()
+        if self.tablebase and self.tablebase.covers(self.engine):
+            self.show_tablebase_tips()
+            self.show_search_tips = False
+            return
+
         move_analyses = []
         for move in possible_moves:
             analysis = self.move_analyzer.analyze_position(move, self.current_number)
@@ -1252,27 +1784,108 @@ TIPS:
                 tips.append(f"   Avg future moves: {move['avg_future_moves']:.1f}")
             self.strategy_label.config(text="\n".join(tips))
             self.highlight_analyzed_moves(move_analyses, best_move)
+            self.show_search_tips = False
+        else:
+            # Filled in by on_analysis_ready when the background search finishes
+            self.show_search_tips = True
+
+    def show_lookahead_tips(self, analysis):
+        """Rank moves by how far ahead the game can continue after them"""
+        ratings = analysis["ratings"]
+        if not ratings:
+            return
+        ranked = sorted(ratings.items(), key=lambda item: item[1], reverse=True)
+        tips = ["Strategy Tips:"]
+        for i, ((row, col), reach) in enumerate(ranked[:3], 1):
+            if reach >= self.lookahead_depth:
+                tips.append(f"{i}. ({row},{col}): {reach}+ moves ahead")
+            else:
+                tips.append(f"{i}. ({row},{col}): dead end after {reach} moves")
+        stats = analysis["cache"]
+        tips.append(f"Search cache hit rate: {stats['hit_rate']:.0%}")
+        self.strategy_label.config(text="\n".join(tips))
+        best_row, best_col = ranked[0][0]
+        self.highlight_cell(best_row, best_col, "#0000FF")  # Bright blue for best move
+
+    def show_tablebase_tips(self):
+        """Show exact final scores for each move using the tablebase"""
+        ratings = self.tablebase.analyze(self.engine)
+        if not ratings:
+            return
+        ranked = sorted(ratings.items(), key=lambda item: item[1], reverse=True)
+        tips = ["Strategy Tips (perfect play):"]
+        for i, ((row, col), final_score) in enumerate(ranked[:3], 1):
+            tips.append(f"{i}. ({row},{col}) reaches {final_score}")
+        self.strategy_label.config(text="\n".join(tips))
+        best_row, best_col = ranked[0][0]
+        self.highlight_cell(best_row, best_col, "#0000FF")  # Bright blue for best move
 
     def undo_move(self):
+        if self.replay:
+            return
         if len(self.moves) > 1:
+            if self.game_over:
+                # Step back into a finished game to explore another line
+                self.game_over = False
+                self.game_over_label.place_forget()
+                self.clock.resume()
             # Remove last move
-            last_row, last_col = self.moves.pop()
-            self.board[last_row][last_col] = 0
-            self.buttons[last_row][last_col].config(text=" ",
-                bg=self.themes[self.current_theme]["button_bg"])
-            self.current_number -= 1
-            self.update_progress_bar()
-            self.update_move_history()
-            
-            # Update current position
-            self.current_position = self.moves[-1] if self.moves else None
+            last_row, last_col = self.engine.undo()
+            self.journal.pop()
+            self.move_tree.undo()
+            self.animator.cancel((last_row, last_col))
+            self.painter.set_text(last_row, last_col, " ", relief="raised")
+            self.painter.paint(last_row, last_col, self.themes[self.current_theme]["button_bg"])
+            self.highlighted.pop((last_row, last_col), None)
             
             # Update displays
             self.label_info.config(text=f"Current Number: {self.current_number}")
             self.move_counter.config(text=f"Moves: {len(self.moves)}")
             self.update_progress_bar()
             self.update_move_history()
+            self.draw_path_indicator()
             self.highlight_valid_moves()
+            self.request_analysis()
+
+    def redo_move(self):
+        """Play the move undone last again (or the line picked with Switch Branch)"""
+        node = self.move_tree.redo_node()
+        if node is None or self.game_over:
+            return
+        self.make_move(*node.position)
+
+    def switch_branch(self):
+        """Jump to the end of the next alternative line explored from this game"""
+        if self.replay or not self.moves:
+            return
+        target, (index, count) = self.move_tree.next_branch()
+        if target is None:
+            self.label_info.config(text="No other lines explored yet: undo and try another move")
+            return
+        self.goto_node(target)
+        self.label_info.config(text=f"Branch {index} of {count} - Current Number: {self.current_number}")
+
+    def goto_node(self, target):
+        """Move the board to a tree node: undo to the shared move, replay down, draw once"""
+        undo, forward = self.move_tree.route(target)
+        for _ in range(undo):
+            self.engine.undo()
+            self.journal.pop()
+        for node in forward:
+            self.engine.place(*node.position)
+            self.journal.append(*node.position, time.time(), len(self.get_possible_moves()))
+        self.move_tree.goto(target)
+        self.game_over = False
+        self.game_over_label.place_forget()
+        self.render_position()
+        self.highlight_valid_moves()
+        if self.engine.is_game_over():
+            # The line switched to has no moves left: it ends like any other game
+            self.end_game()
+            return
+        self.clock.resume()
+        self.analyze_and_update_strategy()
+        self.request_analysis()
 
     def on_button_hover(self, button, row, col):
         """Handle button hover event"""
@@ -1288,64 +1901,34 @@ TIPS:
     def on_button_leave(self, button, row, col):
         """Handle button leave event"""
         theme = self.themes[self.current_theme]
-        # Restore original color if the button is empty
+        # Restore the cell's current color (highlight included) if the button is empty
         if self.board[row][col] == 0:
             button.config(
-                bg=theme["button_bg"],
+                bg=self.painter.current_bg(row, col) or theme["button_bg"],
                 relief="raised",
                 borderwidth=2
             )
 
     def animate_number_placement(self, row, col, number, target_color):
         """Animate the placement of a number with fade-in effect"""
-        button = self.buttons[row][col]
         theme = self.themes[self.current_theme]
         
-        # Set the text immediately
-        button.config(text=number)
-        
-        # Parse target color
-        target_r = int(target_color[1:3], 16)
-        target_g = int(target_color[3:5], 16)
-        target_b = int(target_color[5:7], 16)
-        
-        # Start from button background color
-        start_color = theme["button_bg"]
-        start_r = int(start_color[1:3], 16)
-        start_g = int(start_color[3:5], 16)
-        start_b = int(start_color[5:7], 16)
-        
-        # Animate color transition
-        def animate_step(step):
-            if step > self.animation_steps:
-                # Final state
-                button.config(
-                    bg=target_color,
-                    fg=theme["button_fg"],
-                    relief="sunken",
-                    borderwidth=2
-                )
-                return
-            
-            # Calculate intermediate color
-            progress = step / self.animation_steps
-            current_r = int(start_r + (target_r - start_r) * progress)
-            current_g = int(start_g + (target_g - start_g) * progress)
-            current_b = int(start_b + (target_b - start_b) * progress)
-            current_color = f'#{current_r:02x}{current_g:02x}{current_b:02x}'
-            
-            # Apply color
-            button.config(
-                bg=current_color,
-                fg=theme["button_fg"]
-            )
-            
-            # Schedule next step
-            self.window.after(self.animation_speed, lambda: animate_step(step + 1))
+        # Set the text immediately; the cell ends on target_color once the fade is done
+        self.painter.set_text(row, col, number)
+        self.painter.note_bg(row, col, target_color)
+        self.highlighted.pop((row, col), None)
         
-        # Start animation
-        animate_step(0)
+        # When Auto Play moves faster than a fade lasts, place numbers without one
+        steps = self.animation_steps
+        if self.auto_playing and self.auto_play_delay < steps * self.animation_speed:
+            steps = 0
+        self.animator.fade((row, col), self.buttons[row][col], theme["button_bg"], target_color, steps,
+                           fg=theme["button_fg"], relief="sunken", borderwidth=2)
 
 if __name__ == "__main__":
+    # Headless self-play farm: python mygame_10ten.py selfplay --games 10000 ...
+    if len(sys.argv) > 1 and sys.argv[1] == "selfplay":
+        import selfplay
+        sys.exit(selfplay.main(sys.argv[2:]))
     game = NumberPuzzleGUI()
     game.run()
@@ -0,0 +1,72 @@
+"""Persistent move-path layer.
+
+Keeps one canvas line item per step of the path. sync() compares the
+drawn path with the current moves and only deletes or creates the
+segments that differ: a move adds one segment, an undo removes one.
+Every segment is repositioned only when the board is resized, and a
+theme change recolours the whole path with one tag-wide update.
+"""
+
+import tkinter as tk
+
+PATH_TAG = "path"
+
+
+class PathOverlay:
+    def __init__(self, canvas, center, color, width=3, below=None):
+        self.canvas = canvas
+        self.center = center  # (row, col) -> (x, y) of the cell centre
+        self.color = color
+        self.width = width
+        self.below = below  # tag the path is kept under (e.g. cell numbers)
+        self.moves = []
+        self.segments = []
+
+    def sync(self, moves):
+        """Bring the drawn path in line with moves, touching only changed segments"""
+        drawn = self.moves
+        if moves[:len(drawn)] == drawn:
+            common = len(drawn)  # moves were added
+        elif drawn[:len(moves)] == moves:
+            common = len(moves)  # moves were undone
+        else:
+            common = 0
+            for a, b in zip(drawn, moves):
+                if a != b:
+                    break
+                common += 1
+        while len(drawn) > common:
+            if len(drawn) > 1:
+                self.canvas.delete(self.segments.pop())
+            drawn.pop()
+        for move in moves[common:]:
+            if drawn:
+                self.segments.append(self._create(drawn[-1], move))
+            drawn.append(tuple(move))
+
+    def _create(self, start, end):
+        item = self.canvas.create_line(*self.center(*start), *self.center(*end),
+                                       fill=self.color, width=self.width, arrow=tk.LAST,
+                                       tags=(PATH_TAG,))
+        if self.below:
+            self.canvas.tag_lower(item, self.below)
+        return item
+
+    def relayout(self, event=None):
+        """Reposition every segment after the board geometry changed"""
+        coords = self.canvas.coords
+        for item, start, end in zip(self.segments, self.moves, self.moves[1:]):
+            coords(item, *self.center(*start), *self.center(*end))
+
+    def set_color(self, color):
+        self.color = color
+        self.canvas.itemconfig(PATH_TAG, fill=color)
+
+    def set_width(self, width):
+        self.width = width
+        self.canvas.itemconfig(PATH_TAG, width=width)
+
+    def clear(self):
+        self.canvas.delete(PATH_TAG)
+        self.moves = []
+        self.segments = []
@@ -0,0 +1,381 @@
+"""Headless game engine for the Number Puzzle.
+
+Holds the board state and the movement rules so games can be simulated
+without tkinter, pygame or any of the JSON files the GUI touches.
+"""
+
+import random
+from array import array
+from functools import lru_cache
+
+# Move patterns: 3 cells horizontally/vertically or 2 cells diagonally
+STRAIGHT_MOVES = [(0, -3), (0, 3), (-3, 0), (3, 0)]
+DIAGONAL_MOVES = [(-2, -2), (-2, 2), (2, -2), (2, 2)]
+MOVE_OFFSETS = STRAIGHT_MOVES + DIAGONAL_MOVES
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(size):
+    """Map each flat cell index (row * size + col) to its in-bounds targets.
+
+    Built once per board size, so move generation is a lookup plus an
+    occupancy filter instead of eight bounds checks per call.
+    """
+    table = []
+    for row in range(size):
+        for col in range(size):
+            targets = []
+            for dr, dc in MOVE_OFFSETS:
+                next_row, next_col = row + dr, col + dc
+                if 0 <= next_row < size and 0 <= next_col < size:
+                    targets.append(next_row * size + next_col)
+            table.append(tuple(targets))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def neighbour_masks(size):
+    """Bitboard form of neighbour_table: one int mask of targets per cell"""
+    masks = []
+    for targets in neighbour_table(size):
+        mask = 0
+        for target in targets:
+            mask |= 1 << target
+        masks.append(mask)
+    return tuple(masks)
+
+
+@lru_cache(maxsize=None)
+def coverage_masks(size):
+    """Bitmask of the 5x5 block (clipped to the board) centred on each cell"""
+    masks = []
+    for row in range(size):
+        for col in range(size):
+            mask = 0
+            for r in range(max(0, row-2), min(size, row+3)):
+                for c in range(max(0, col-2), min(size, col+3)):
+                    mask |= 1 << (r * size + c)
+            masks.append(mask)
+    return tuple(masks)
+
+
+def corner_distance(size, row, col):
+    """Manhattan distance from (row, col) to the nearest board corner"""
+    return min(
+        abs(row) + abs(col),
+        abs(row) + abs(col - size + 1),
+        abs(row - size + 1) + abs(col),
+        abs(row - size + 1) + abs(col - size + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def symmetry_maps(size):
+    """The 8 dihedral symmetries of the board as flat-index permutations.
+
+    The move set is unchanged by rotations and reflections, so mapping a
+    position through any of these yields an equivalent position.
+    """
+    last = size - 1
+    transforms = [
+        lambda r, c: (r, c),
+        lambda r, c: (c, last - r),
+        lambda r, c: (last - r, last - c),
+        lambda r, c: (last - c, r),
+        lambda r, c: (r, last - c),
+        lambda r, c: (last - r, c),
+        lambda r, c: (c, r),
+        lambda r, c: (last - c, last - r),
+    ]
+    maps = []
+    for transform in transforms:
+        mapping = []
+        for row in range(size):
+            for col in range(size):
+                new_row, new_col = transform(row, col)
+                mapping.append(new_row * size + new_col)
+        maps.append(tuple(mapping))
+    return tuple(maps)
+
+
+def iter_bits(mask):
+    """Yield the index of every set bit in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+@lru_cache(maxsize=None)
+def cell_coords(size):
+    """Map each flat cell index back to its (row, col) pair"""
+    return tuple(divmod(index, size) for index in range(size * size))
+
+
+class PuzzleEngine:
+    def __init__(self, size=10):
+        self.reset(size)
+
+    def reset(self, size=None):
+        """Clear the board, optionally switching to a new board size"""
+        if size is not None:
+            self.size = size
+        self.neighbours = neighbour_table(self.size)
+        self.coords = cell_coords(self.size)
+        self.board = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        # Flat mirror of board indexed like neighbour_table
+        self.cells = [0] * (self.size * self.size)
+        self.current_number = 1
+        self.current_position = None
+        self.moves = []
+
+    def copy(self):
+        """Return an independent copy of this engine"""
+        other = PuzzleEngine.__new__(PuzzleEngine)
+        other.size = self.size
+        other.neighbours = self.neighbours
+        other.coords = self.coords
+        other.board = [row[:] for row in self.board]
+        other.cells = self.cells[:]
+        other.current_number = self.current_number
+        other.current_position = self.current_position
+        other.moves = self.moves[:]
+        return other
+
+    def is_valid_position(self, row, col):
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def is_valid_move(self, next_row, next_col):
+        if not self.is_valid_position(next_row, next_col):
+            return False
+        if self.board[next_row][next_col] != 0:
+            return False
+        return True
+
+    def get_possible_moves(self):
+        if self.current_position is None:
+            return []
+
+        row, col = self.current_position
+        cells = self.cells
+        coords = self.coords
+        return [coords[target] for target in self.neighbours[row * self.size + col]
+                if not cells[target]]
+
+    def count_future_moves(self, position):
+        """Count how many moves would be available after making this move"""
+        row, col = position
+        cells = self.cells
+        return sum(1 for target in self.neighbours[row * self.size + col] if not cells[target])
+
+    def board_coverage(self, move):
+        """Calculate how well a move contributes to board coverage"""
+        row, col = move
+        coverage = 0
+        for r in range(max(0, row-2), min(self.size, row+3)):
+            for c in range(max(0, col-2), min(self.size, col+3)):
+                if self.board[r][c] == 0:
+                    coverage += 1
+        return coverage / (self.size * self.size)
+
+    def is_corner_move(self, row, col):
+        """Determine if a move is near a corner"""
+        return 1 if corner_distance(self.size, row, col) <= 2 else 0
+
+    def can_place(self, row, col):
+        """Check whether the next number may be placed at (row, col)"""
+        if self.current_number == 1:
+            return self.is_valid_move(row, col)
+        return (row, col) in self.get_possible_moves()
+
+    def place(self, row, col):
+        """Place the next number at (row, col); returns False if illegal"""
+        if not self.can_place(row, col):
+            return False
+        self.board[row][col] = self.current_number
+        self.cells[row * self.size + col] = self.current_number
+        self.current_position = (row, col)
+        self.moves.append((row, col))
+        self.current_number += 1
+        return True
+
+    def undo(self):
+        """Remove the last placed number and return its position"""
+        if not self.moves:
+            return None
+        row, col = self.moves.pop()
+        self.board[row][col] = 0
+        self.cells[row * self.size + col] = 0
+        self.current_number -= 1
+        self.current_position = self.moves[-1] if self.moves else None
+        return (row, col)
+
+    def is_board_full(self):
+        return self.current_number > self.size * self.size
+
+    def is_game_over(self):
+        """A game is over once the board is full or no moves remain"""
+        if self.current_number == 1:
+            return False
+        return self.is_board_full() or not self.get_possible_moves()
+
+    def score(self):
+        """Highest number reached; size*size when the board is full"""
+        max_cells = self.size * self.size
+        if self.current_number > max_cells:
+            return max_cells
+        return self.current_number - 1
+
+
+class BitboardEngine:
+    """Drop-in alternative to PuzzleEngine backed by integer bitmasks.
+
+    Occupancy is a single int with one bit per cell, so legal moves are
+    neighbour_mask & ~occupied and place/undo are a single XOR. The
+    placement order is kept in a compact array of cell indices.
+    """
+
+    def __init__(self, size=10):
+        self.reset(size)
+
+    def reset(self, size=None):
+        """Clear the board, optionally switching to a new board size"""
+        if size is not None:
+            self.size = size
+        self.masks = neighbour_masks(self.size)
+        self.coords = cell_coords(self.size)
+        self.occupied = 0
+        self.order = array("H")
+
+    def copy(self):
+        """Return an independent copy of this engine"""
+        other = BitboardEngine.__new__(BitboardEngine)
+        other.size = self.size
+        other.masks = self.masks
+        other.coords = self.coords
+        other.occupied = self.occupied
+        other.order = array("H", self.order)
+        return other
+
+    @property
+    def current_number(self):
+        return len(self.order) + 1
+
+    @property
+    def current_index(self):
+        return self.order[-1] if self.order else None
+
+    @property
+    def current_position(self):
+        return self.coords[self.order[-1]] if self.order else None
+
+    @property
+    def moves(self):
+        coords = self.coords
+        return [coords[index] for index in self.order]
+
+    @property
+    def board(self):
+        """Rebuild the list-of-lists board on demand"""
+        board = [[0 for _ in range(self.size)] for _ in range(self.size)]
+        for number, index in enumerate(self.order, 1):
+            row, col = self.coords[index]
+            board[row][col] = number
+        return board
+
+    def is_valid_position(self, row, col):
+        return 0 <= row < self.size and 0 <= col < self.size
+
+    def is_valid_move(self, next_row, next_col):
+        if not self.is_valid_position(next_row, next_col):
+            return False
+        return not self.occupied >> (next_row * self.size + next_col) & 1
+
+    def legal_mask(self):
+        """Bitmask of the cells the next number may be placed on"""
+        if not self.order:
+            return 0
+        return self.masks[self.order[-1]] & ~self.occupied
+
+    def get_possible_moves(self):
+        coords = self.coords
+        return [coords[index] for index in iter_bits(self.legal_mask())]
+
+    def count_future_moves(self, position):
+        """Count how many moves would be available after making this move"""
+        row, col = position
+        return (self.masks[row * self.size + col] & ~self.occupied).bit_count()
+
+    def board_coverage(self, move):
+        """Share of the board that is empty in the 5x5 block around move"""
+        row, col = move
+        free = coverage_masks(self.size)[row * self.size + col] & ~self.occupied
+        return free.bit_count() / (self.size * self.size)
+
+    def is_corner_move(self, row, col):
+        return 1 if corner_distance(self.size, row, col) <= 2 else 0
+
+    def can_place(self, row, col):
+        """Check whether the next number may be placed at (row, col)"""
+        if not self.order:
+            return self.is_valid_move(row, col)
+        if not self.is_valid_position(row, col):
+            return False
+        return bool(self.legal_mask() >> (row * self.size + col) & 1)
+
+    def place(self, row, col):
+        """Place the next number at (row, col); returns False if illegal"""
+        if not self.can_place(row, col):
+            return False
+        index = row * self.size + col
+        self.occupied ^= 1 << index
+        self.order.append(index)
+        return True
+
+    def undo(self):
+        """Remove the last placed number and return its position"""
+        if not self.order:
+            return None
+        index = self.order.pop()
+        self.occupied ^= 1 << index
+        return self.coords[index]
+
+    def is_board_full(self):
+        return len(self.order) == self.size * self.size
+
+    def is_game_over(self):
+        """A game is over once the board is full or no moves remain"""
+        if not self.order:
+            return False
+        return not self.legal_mask()
+
+    def score(self):
+        """Highest number reached; size*size when the board is full"""
+        return len(self.order)
+
+
+# Weights of the one-ply move heuristic used by Auto Play, turbo and self-play
+HEURISTIC_WEIGHTS = {
+    "future_moves": 10,
+    "corner": 2,
+    "coverage": 5
+}
+
+
+def heuristic_score(engine, move, weights=HEURISTIC_WEIGHTS):
+    """Score a move with the hand-tuned one-ply formula (higher is better)"""
+    return (
+        engine.count_future_moves(move) * weights["future_moves"] +
+        (10 - engine.is_corner_move(*move)) * weights["corner"] +
+        engine.board_coverage(move) * weights["coverage"]
+    )
+
+
+def play_random_game(size=10, rng=None, start=(0, 0), engine_class=PuzzleEngine):
+    """Play one game with uniformly random moves and return the engine"""
+    rng = rng or random
+    engine = engine_class(size)
+    engine.place(*start)
+    while not engine.is_game_over():
+        engine.place(*rng.choice(engine.get_possible_moves()))
+    return engine
@@ -0,0 +1,58 @@
+"""Headless replay of recorded games.
+
+A ReplayEngine streams a game record's moves into a PuzzleEngine, so
+seeking to move k costs at most k engine placements (or undos, when that
+is shorter) and never touches the GUI. The GUI renders the engine's
+board once, after the seek.
+"""
+
+from puzzle_engine import PuzzleEngine
+
+
+class ReplayEngine:
+    def __init__(self, record, engine=None):
+        self.record = record
+        self.size = record["size"]
+        self.engine = engine if engine is not None else PuzzleEngine(self.size)
+        self.engine.reset(self.size)
+        # Keep the longest legal prefix: games saved before undo removed
+        # moves from the history can contain undone or later games' moves
+        self.moves = []
+        for position, _ in record["moves"]:
+            if not self.engine.place(*position):
+                break
+            self.moves.append(tuple(position))
+        self.engine.reset(self.size)
+
+    @property
+    def position(self):
+        """Number of moves currently on the board"""
+        return len(self.engine.moves)
+
+    @property
+    def length(self):
+        return len(self.moves)
+
+    @property
+    def truncated(self):
+        """True when the record had moves past its longest legal prefix"""
+        return len(self.moves) < len(self.record["moves"])
+
+    def at_end(self):
+        return self.position >= len(self.moves)
+
+    def seek(self, k):
+        """Put the board at its state after the first k moves"""
+        k = max(0, min(k, len(self.moves)))
+        engine = self.engine
+        if k < self.position and self.position - k > k:
+            # Replaying from the start is shorter than undoing back
+            engine.reset(self.size)
+        while self.position > k:
+            engine.undo()
+        for position in self.moves[self.position:k]:
+            engine.place(*position)
+        return k
+
+    def step(self, delta=1):
+        return self.seek(self.position + delta)
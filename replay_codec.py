@@ -0,0 +1,190 @@
+"""Compact binary replays: 3 bits per move.
+
+Every move is one of the 8 offsets in MOVE_OFFSETS, so a game is stored as
+its start cell followed by packed 3-bit direction codes. A game record is
+
+    header   <BHHI  board size, start cell (row * size + col),
+                    number of moves after the start, elapsed seconds
+    payload         ceil(3 * moves / 8) bytes, first move in the low bits
+    crc32    <I     over header and payload
+
+so a 100-move 10x10 game takes 9 + 38 + 4 = 51 bytes. An archive is the
+magic bytes followed by game records back to back.
+
+Usage:  python replay_codec.py [source] [archive]
+converts game_records.jsonl (or an old game_history.json array) to
+game_history.npr.
+"""
+
+import os
+import struct
+import sys
+import zlib
+
+from game_store import GAMES_FILE, LEGACY_HISTORY_FILE, GameStore, read_legacy_games
+from puzzle_engine import MOVE_OFFSETS
+
+ARCHIVE_MAGIC = b"NPR1"
+ARCHIVE_FILE = "game_history.npr"
+
+_HEADER = struct.Struct("<BHHI")
+_CHECKSUM = struct.Struct("<I")
+
+_DIRECTION_CODES = {offset: code for code, offset in enumerate(MOVE_OFFSETS)}
+
+
+def encode_game(size, moves, elapsed=0):
+    """Encode a path of (row, col) cells; raises ValueError if it isn't a legal path"""
+    if not moves:
+        raise ValueError("a replay needs at least the start cell")
+    (row, col), rest = moves[0], moves[1:]
+    if not (0 <= row < size and 0 <= col < size):
+        raise ValueError(f"start cell {(row, col)} is off a {size}x{size} board")
+    packed = 0
+    for shift, (next_row, next_col) in zip(range(0, 3 * len(rest), 3), rest):
+        code = _DIRECTION_CODES.get((next_row - row, next_col - col))
+        if code is None:
+            raise ValueError(f"{(row, col)} -> {(next_row, next_col)} is not a legal move")
+        packed |= code << shift
+        row, col = next_row, next_col
+    start = moves[0][0] * size + moves[0][1]
+    data = _HEADER.pack(size, start, len(rest), min(int(elapsed), 0xFFFFFFFF))
+    data += packed.to_bytes((3 * len(rest) + 7) // 8, "little")
+    return data + _CHECKSUM.pack(zlib.crc32(data))
+
+
+def decode_game(data, offset=0):
+    """Decode the game record at offset; returns (record, offset of the next record).
+
+    The record has the same shape as a game store entry: size, score, time
+    and moves as ((row, col), turn) pairs.
+    """
+    size, start, count, elapsed = _HEADER.unpack_from(data, offset)
+    payload_end = offset + _HEADER.size + (3 * count + 7) // 8
+    end = payload_end + _CHECKSUM.size
+    if end > len(data):
+        raise ValueError("truncated replay")
+    (checksum,) = _CHECKSUM.unpack_from(data, payload_end)
+    if zlib.crc32(data[offset:payload_end]) != checksum:
+        raise ValueError("replay checksum mismatch")
+
+    packed = int.from_bytes(data[offset + _HEADER.size:payload_end], "little")
+    row, col = divmod(start, size)
+    moves = [((row, col), 1)]
+    for turn in range(2, count + 2):
+        dr, dc = MOVE_OFFSETS[packed & 7]
+        packed >>= 3
+        row += dr
+        col += dc
+        moves.append(((row, col), turn))
+    return {"size": size, "score": count + 1, "time": elapsed, "moves": moves}, end
+
+
+def encode_archive(records):
+    """Encode game records (size, time, moves as ((row, col), turn) pairs) to one blob.
+
+    Returns (archive bytes, number of records skipped because they don't
+    form a legal path, e.g. games saved with undone moves still in them).
+    """
+    parts = [ARCHIVE_MAGIC]
+    skipped = 0
+    for record in records:
+        moves = [tuple(position) for position, _ in sorted(record["moves"], key=lambda move: move[1])]
+        try:
+            parts.append(encode_game(record["size"], moves, record.get("time", 0)))
+        except ValueError:
+            skipped += 1
+    return b"".join(parts), skipped
+
+
+def iter_archive(data):
+    """Yield the game records of an archive one at a time"""
+    if data[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+        raise ValueError("not a replay archive")
+    offset = len(ARCHIVE_MAGIC)
+    while offset < len(data):
+        record, offset = decode_game(data, offset)
+        yield record
+
+
+def decode_archive(data):
+    return list(iter_archive(data))
+
+
+class ReplayArchive:
+    """Random access to an archive's games without decoding them up front.
+
+    Opening only walks the fixed-size headers to find where each game
+    starts; a game's moves are decoded (and its checksum checked) when it
+    is read.
+    """
+
+    def __init__(self, data):
+        if data[:len(ARCHIVE_MAGIC)] != ARCHIVE_MAGIC:
+            raise ValueError("not a replay archive")
+        self.data = data
+        self.offsets = []
+        self.headers = []  # (size, score, time) of every game
+        offset = len(ARCHIVE_MAGIC)
+        unpack = _HEADER.unpack_from
+        while offset < len(data):
+            size, _, count, elapsed = unpack(data, offset)
+            self.offsets.append(offset)
+            self.headers.append((size, count + 1, elapsed))
+            offset += _HEADER.size + (3 * count + 7) // 8 + _CHECKSUM.size
+        if offset != len(data):
+            raise ValueError("truncated replay")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        return decode_game(self.data, self.offsets[index])[0]
+
+
+def write_archive(path, records):
+    """Atomically write records to an archive file; returns the number skipped"""
+    data, skipped = encode_archive(records)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return skipped
+
+
+def read_archive(path=ARCHIVE_FILE):
+    """Open an archive file as a ReplayArchive"""
+    with open(path, "rb") as f:
+        return ReplayArchive(f.read())
+
+
+def load_history_records(source):
+    """Game records from a game store file or an old game_history.json array"""
+    if source.endswith(".json"):
+        return read_legacy_games(source)
+    store = GameStore(source, legacy_path=None)
+    try:
+        return list(store.games())
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        source = argv[0]
+    else:
+        source = GAMES_FILE if os.path.exists(GAMES_FILE) else LEGACY_HISTORY_FILE
+    path = argv[1] if len(argv) > 1 else ARCHIVE_FILE
+    records = load_history_records(source)
+    skipped = write_archive(path, records)
+    before = os.path.getsize(source)
+    after = os.path.getsize(path)
+    print(f"Wrote {len(records) - skipped} games to {path} ({after} bytes, "
+          f"{before / max(after, 1):.0f}x smaller than {source}); "
+          f"skipped {skipped} that are not legal paths")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""Vectorized Monte-Carlo rollouts for scoring Auto Play moves.
+
+Thousands of playouts advance together as NumPy arrays. Every playout
+has its own copy of the board in one flat byte buffer, laid out with
+gap columns and rows wide enough that any move off the board lands on a
+padding cell that is never free. A move is then a fixed offset from the
+current index, so there is no neighbour-table gather and no bounds check.
+Every step reads the eight target flags of each playout's current cell,
+packs them into one byte and picks a free target from a precomputed
+table. Playouts run in cache-sized chunks through buffers that are
+allocated once and reused, and a playout's length is written once, when
+it gets stuck. A candidate's value is the mean final score of the
+playouts that start with it.
+
+This is the only Auto Play strength that depends on NumPy.
+"""
+
+import numpy as np
+
+from puzzle_engine import MOVE_OFFSETS
+
+POLICIES = ("random", "warnsdorff")
+
+# Every popcount 1..8 divides 840, so (uniform 0..839) % popcount is uniform
+_PICK_RANGE = 840
+# Multiplying 8 bytes of 0/1 packs them into the top byte (bit d = byte d)
+_PACK_MAGIC = np.uint64(0x0102040810204080)
+_TOP_BYTE = np.uint64(56)
+
+
+def _pick_table():
+    """pick[free_bits, r] -> index of the (r % popcount)-th free direction"""
+    table = np.zeros((256, _PICK_RANGE), dtype=np.uint8)
+    for bits in range(1, 256):
+        set_bits = [d for d in range(8) if bits >> d & 1]
+        table[bits] = [set_bits[r % len(set_bits)] for r in range(_PICK_RANGE)]
+    return table
+
+
+class RolloutEvaluator:
+    CHUNK = 16384  # playouts advanced together; keeps their boards in cache
+
+    # 3,000 rollouts per candidate keep a full 8-candidate 10x10 evaluation
+    # with the random policy under 100 ms
+    def __init__(self, size, rollouts=3000, policy="random", seed=None):
+        if policy not in POLICIES:
+            raise ValueError(f"unknown rollout policy: {policy}")
+        self.size = size
+        self.rollouts = rollouts
+        self.policy = policy
+        self.rng = np.random.default_rng(seed)
+        reach = max(max(abs(dr), abs(dc)) for dr, dc in MOVE_OFFSETS)
+        # Rows are stride bytes apart: size cells then reach gap columns, which
+        # also serve as the left gap of the next row. Boards are block bytes
+        # apart: size rows then reach padding rows, plus a margin before the
+        # first and after the last board.
+        self.stride = size + reach
+        self.block = (size + reach) * self.stride
+        self.margin = (reach + 1) * self.stride
+        self.offsets = np.array([dr * self.stride + dc for dr, dc in MOVE_OFFSETS], dtype=np.intp)
+        self.template = np.zeros(self.block, dtype=np.uint8)
+        for row in range(size):
+            self.template[row * self.stride:row * self.stride + size] = 1
+        # Flat pick table holding the index offset of the chosen direction
+        self.pick_offsets = self.offsets.astype(np.int16)[_pick_table()].ravel()
+        self.chunk = 0
+
+    def cell_index(self, row, col):
+        return row * self.stride + col
+
+    def _allocate(self, chunk):
+        """Buffers for chunk playouts, reused by every later call"""
+        if chunk <= self.chunk:
+            return
+        self.chunk = chunk
+        self.boards = np.zeros(2 * self.margin + chunk * self.block, dtype=np.uint8)
+        self.targets = np.empty(8 * chunk, dtype=np.intp)
+        self.flags = np.empty(8 * chunk, dtype=np.uint8)
+        self.index = np.empty(chunk, dtype=np.intp)
+        if self.policy == "warnsdorff":
+            # onward[cell] = free targets of cell, kept up to date as cells fill
+            self.onward = np.zeros_like(self.boards)
+
+    def evaluate(self, engine, rollouts=None, stop_event=None):
+        """Return {move: mean final score of its playouts} for every legal move.
+
+        Each playout starts by making the candidate move and continues
+        with the evaluator's policy until it gets stuck. If stop_event is
+        set the playouts still running are cut short where they are.
+        """
+        moves = engine.get_possible_moves()
+        if not moves:
+            return {}
+        rollouts = rollouts or self.rollouts
+        batch = rollouts * len(moves)
+        chunk = min(batch, self.CHUNK)
+        self._allocate(chunk)
+
+        board = self.template.copy()
+        for row, col in engine.moves:
+            board[self.cell_index(row, col)] = 0
+        starts = np.repeat(
+            np.array([self.cell_index(row, col) for row, col in moves], dtype=np.intp), rollouts
+        )
+        onward = None
+        if self.policy == "warnsdorff":
+            free = np.flatnonzero(board)
+            onward = np.zeros(self.block, dtype=np.uint8)
+            for offset in self.offsets:
+                targets = free + offset
+                inside = (targets >= 0) & (targets < self.block)
+                onward[free[inside]] += board[targets[inside]]
+        lengths = np.empty(batch, dtype=np.int32)
+        for first in range(0, batch, chunk):
+            count = min(chunk, batch - first)
+            lengths[first:first + count] = self._play(board, onward, starts[first:first + count], stop_event)
+
+        means = lengths.reshape(len(moves), rollouts).mean(axis=1) + len(engine.moves)
+        return {move: float(value) for move, value in zip(moves, means)}
+
+    def _play(self, board, onward, starts, stop_event):
+        """Run one chunk of playouts from board; returns their lengths"""
+        count = starts.size
+        margin, block = self.margin, self.block
+        empty = self.boards[:2 * margin + count * block]
+        empty[margin:margin + count * block].reshape(count, block)[:] = board
+        warnsdorff = onward is not None
+        if warnsdorff:
+            degrees = self.onward[:2 * margin + count * block]
+            degrees[margin:margin + count * block].reshape(count, block)[:] = onward
+
+        current = margin + np.arange(count, dtype=np.intp) * block + starts
+        empty[current] = 0
+        if warnsdorff:
+            self._fill(degrees, current)
+        ids = np.arange(count, dtype=np.intp)  # playouts still running
+        lengths = np.empty(count, dtype=np.int32)
+        offsets = self.offsets[:, np.newaxis]
+        step = 1
+        while current.size:
+            if stop_event is not None and stop_event.is_set():
+                break
+            n = current.size
+            # Target indices are built as (8, n) so each add runs over n elements,
+            # then gathered through the transposed view into 8 bytes per playout
+            targets = np.add(offsets, current, out=self.targets[:8 * n].reshape(8, n))
+            free = np.take(empty, targets.T, out=self.flags[:8 * n].reshape(n, 8), mode='clip')
+            bits = (free.view(np.uint64)[:, 0] * _PACK_MAGIC) >> _TOP_BYTE
+            alive = bits != 0
+            if warnsdorff:
+                # Fewest onward moves first, random tie-break; blocked targets last
+                keys = degrees.take(targets.T).astype(np.uint16) << 8
+                keys |= self.rng.integers(0, 256, (n, 8), dtype=np.uint16)
+                keys[free == 0] = np.iinfo(np.uint16).max
+                chosen = current + self.offsets[keys.argmin(axis=1)]
+            else:
+                index = self.index[:n]
+                np.multiply(bits, _PICK_RANGE, out=index, casting='unsafe')
+                index += self.rng.integers(0, _PICK_RANGE, n, dtype=np.uint16)
+                chosen = current + self.pick_offsets.take(index)
+            if np.count_nonzero(alive) < n:
+                lengths[ids[~alive]] = step
+                ids = ids[alive]
+                chosen = chosen[alive]
+            current = chosen
+            empty[current] = 0
+            if warnsdorff:
+                self._fill(degrees, current)
+            step += 1
+        lengths[ids] = step  # cut short by stop_event
+        return lengths
+
+    def _fill(self, degrees, cells):
+        """One free target fewer for every cell that can move to the newly filled cells"""
+        for offset in self.offsets:
+            degrees[cells - offset] -= 1
+
+    def best_move(self, engine, stop_event=None):
+        values = self.evaluate(engine, stop_event=stop_event)
+        if not values:
+            return None, values
+        return max(values, key=values.get), values
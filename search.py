@@ -0,0 +1,284 @@
+"""Lookahead search with a shared transposition table.
+
+Positions are identified by a Zobrist hash of (occupied cells, current
+cell) that is updated incrementally as moves are made and unmade. One hash
+is kept per board symmetry, so the smallest of them is a canonical key:
+positions that are rotations or reflections of each other share a single
+table entry. The table is bounded and replaces entries by depth and age.
+"""
+
+import random
+import time
+
+from puzzle_engine import cell_coords, iter_bits, neighbour_masks, symmetry_maps
+
+# Entry flags: EXACT values are the true longest continuation, LOWER values
+# only say that at least that many moves are possible
+EXACT = 0
+LOWER = 1
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class ZobristHasher:
+    def __init__(self, size, seed=0x10C0FFEE, use_symmetry=True):
+        self.size = size
+        cells = size * size
+        rng = random.Random(seed)
+        cell_keys = [rng.getrandbits(64) for _ in range(cells)]
+        current_keys = [rng.getrandbits(64) for _ in range(cells)]
+        # The move set is invariant under all 8 symmetries of a square board
+        self.maps = symmetry_maps(size) if use_symmetry else symmetry_maps(size)[:1]
+        self.inverse_maps = []
+        for mapping in self.maps:
+            inverse = [0] * cells
+            for index, target in enumerate(mapping):
+                inverse[target] = index
+            self.inverse_maps.append(tuple(inverse))
+        # Per-symmetry key tables so updates need no extra index mapping
+        self.cell_keys = [tuple(cell_keys[m[i]] for i in range(cells)) for m in self.maps]
+        self.current_keys = [tuple(current_keys[m[i]] for i in range(cells)) for m in self.maps]
+
+    def hashes(self, order):
+        """Hash a position from scratch given its placed cell indices"""
+        result = []
+        for cell_keys, current_keys in zip(self.cell_keys, self.current_keys):
+            value = 0
+            for index in order:
+                value ^= cell_keys[index]
+            if order:
+                value ^= current_keys[order[-1]]
+            result.append(value)
+        return result
+
+    def move(self, hashes, current, target):
+        """Hashes after moving from current to target (also undoes it)"""
+        return [
+            value ^ current_keys[current] ^ current_keys[target] ^ cell_keys[target]
+            for value, cell_keys, current_keys in zip(hashes, self.cell_keys, self.current_keys)
+        ]
+
+    def canonical(self, hashes):
+        """Return (key, symmetry index) of the smallest symmetric hash"""
+        key = min(hashes)
+        return key, hashes.index(key)
+
+    def to_canonical(self, cell, symmetry):
+        return self.maps[symmetry][cell]
+
+    def from_canonical(self, cell, symmetry):
+        return self.inverse_maps[symmetry][cell]
+
+
+class TranspositionTable:
+    def __init__(self, capacity=1 << 18):
+        # Round up to a power of two so the slot is a cheap bit mask
+        self.capacity = 1 << max(0, (capacity - 1).bit_length())
+        self.slot_mask = self.capacity - 1
+        self.slots = [None] * self.capacity
+        self.age = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def new_search(self):
+        """Age existing entries so they are the first to be replaced"""
+        self.age += 1
+
+    def clear(self):
+        self.slots = [None] * self.capacity
+        self.age = 0
+
+    def probe(self, key):
+        """Return (depth, value, flag, best_cell) or None"""
+        entry = self.slots[key & self.slot_mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value, flag, best_cell):
+        index = key & self.slot_mask
+        entry = self.slots[index]
+        if entry is not None and entry[0] != key:
+            # Keep deeper results from the current search over new shallow ones
+            if entry[5] == self.age and entry[1] > depth:
+                return
+            self.evictions += 1
+        self.slots[index] = (key, depth, value, flag, best_cell, self.age)
+        self.stores += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "capacity": self.capacity
+        }
+
+
+class LookaheadSearch:
+    """Depth-limited longest-path search shared by Auto Play and hints"""
+
+    def __init__(self, size, table=None):
+        self.size = size
+        self.masks = neighbour_masks(size)
+        self.coords = cell_coords(size)
+        self.hasher = ZobristHasher(size)
+        self.table = table if table is not None else TranspositionTable()
+        self.nodes = 0
+        self.deadline = None
+        self.stop_event = None
+
+    def _root(self, engine):
+        size = self.size
+        order = [row * size + col for row, col in engine.moves]
+        occupied = 0
+        for index in order:
+            occupied |= 1 << index
+        return order, occupied
+
+    def rate_moves(self, engine, depth, stop_event=None):
+        """Rate each legal move by how many moves follow it, up to depth.
+
+        A rating below depth is exact: the game cannot last longer after
+        that move. A rating equal to depth means at least depth moves.
+        Raises SearchTimeout if stop_event is set before it finishes.
+        """
+        order, occupied = self._root(engine)
+        if not order:
+            return {}
+        self.table.new_search()
+        self.stop_event = stop_event
+        hashes = self.hasher.hashes(order)
+        current = order[-1]
+        ratings = {}
+        try:
+            for target in iter_bits(self.masks[current] & ~occupied):
+                child = self.hasher.move(hashes, current, target)
+                ratings[self.coords[target]] = self._search(
+                    target, occupied | (1 << target), child, depth
+                )
+        finally:
+            self.stop_event = None
+        return ratings
+
+    def best_move(self, engine, time_budget=0.05, stop_event=None):
+        """Anytime iterative-deepening search for the move with the longest game.
+
+        Searches depth 1, 2, ... until the time budget runs out, a line that
+        fills the board is found, or every move's final length is proven.
+        Always returns the best move found so far as (move, info), where
+        info holds the completed "depth", the move "ratings" and "nodes".
+        Setting stop_event ends the search early the same way a timeout does.
+        """
+        order, occupied = self._root(engine)
+        info = {"depth": 0, "ratings": {}, "nodes": 0, "complete": False}
+        if not order:
+            return None, info
+        current = order[-1]
+        targets = list(iter_bits(self.masks[current] & ~occupied))
+        if not targets:
+            return None, info
+
+        self.table.new_search()
+        start_nodes = self.nodes
+        self.deadline = time.perf_counter() + time_budget
+        self.stop_event = stop_event
+        hashes = self.hasher.hashes(order)
+        children = {target: self.hasher.move(hashes, current, target) for target in targets}
+        free = ~occupied
+        # Warnsdorff order until the search has something better to go on
+        targets.sort(key=lambda target: (self.masks[target] & free).bit_count())
+        best = targets[0]
+        ratings = {}
+        remaining = len(self.coords) - len(order)
+        try:
+            for depth in range(1, remaining + 1):
+                depth_ratings = {}
+                depth_best = None
+                for target in targets:
+                    value = 1 + self._search(
+                        target, occupied | (1 << target), children[target], depth - 1
+                    )
+                    depth_ratings[target] = value
+                    if depth_best is None or value > depth_ratings[depth_best]:
+                        depth_best = target
+                        if value >= depth:
+                            # A move already lasts the full depth; none can do better
+                            break
+                best = depth_best
+                ratings = depth_ratings
+                info["depth"] = depth
+                # Try the current best first at the next depth
+                targets.remove(best)
+                targets.insert(0, best)
+                if ratings[best] < depth:
+                    # Every move's final length is now exact
+                    info["complete"] = True
+                    break
+            else:
+                info["complete"] = True
+        except SearchTimeout:
+            pass
+        finally:
+            self.deadline = None
+            self.stop_event = None
+
+        info["ratings"] = {self.coords[target]: value for target, value in ratings.items()}
+        info["nodes"] = self.nodes - start_nodes
+        return self.coords[best], info
+
+    def _search(self, current, occupied, hashes, depth):
+        """Longest continuation from this position, capped at depth"""
+        self.nodes += 1
+        if depth <= 0:
+            return 0
+        if not self.nodes & 255:
+            if self.deadline is not None and time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+            if self.stop_event is not None and self.stop_event.is_set():
+                raise SearchTimeout()
+        key, symmetry = self.hasher.canonical(hashes)
+        entry = self.table.probe(key)
+        hint = None
+        if entry is not None:
+            entry_depth, value, flag, best_cell = entry
+            if flag == EXACT:
+                return min(value, depth)
+            if value >= depth:
+                return depth
+            if best_cell is not None:
+                hint = self.hasher.from_canonical(best_cell, symmetry)
+
+        masks = self.masks
+        free = ~occupied
+        # Previous best move first, then Warnsdorff order
+        candidates = sorted(
+            (target != hint, (masks[target] & free).bit_count(), target)
+            for target in iter_bits(masks[current] & free)
+        )
+        best = 0
+        best_cell = None
+        for _, _, target in candidates:
+            value = 1 + self._search(
+                target, occupied | (1 << target),
+                self.hasher.move(hashes, current, target), depth - 1
+            )
+            if value > best:
+                best = value
+                best_cell = target
+                if best >= depth:
+                    break
+
+        flag = EXACT if best < depth else LOWER
+        canonical_cell = None if best_cell is None else self.hasher.to_canonical(best_cell, symmetry)
+        self.table.store(key, depth, best, flag, canonical_cell)
+        return best
@@ -0,0 +1,104 @@
+"""Background computation service for the Tk GUI.
+
+Searches run on a daemon worker thread so the Tk main loop never blocks.
+Results come back through a queue that the Tk loop polls with after(),
+and callbacks always run on the Tk thread. Cancelling sets each pending
+job's stop event: queued jobs are skipped, a running search stops at its
+next check, and any result it still produces is dropped.
+"""
+
+import queue
+import threading
+
+from search import SearchTimeout
+
+
+class _Job:
+    def __init__(self, task, callback):
+        self.task = task
+        self.callback = callback
+        self.cancelled = threading.Event()
+
+
+class BackgroundWorker:
+    def __init__(self, window, poll_interval=20):
+        self.window = window
+        self.poll_interval = poll_interval
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.pending = []
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="search-worker", daemon=True)
+        self.thread.start()
+        self.window.after(self.poll_interval, self._poll)
+
+    def submit(self, task, callback):
+        """Run task(stop_event) on the worker and callback(result) on the Tk thread"""
+        job = _Job(task, callback)
+        self.pending.append(job)
+        self.requests.put(job)
+        return job
+
+    def cancel(self):
+        """Drop every queued or running job, e.g. after a move or undo"""
+        for job in self.pending:
+            job.cancelled.set()
+        self.pending = []
+
+    def shutdown(self):
+        self.cancel()
+        self.running = False
+        self.requests.put(None)
+
+    def _run(self):
+        while True:
+            job = self.requests.get()
+            if job is None:
+                return
+            if job.cancelled.is_set():
+                continue
+            try:
+                result = job.task(job.cancelled)
+            except SearchTimeout:
+                continue
+            except Exception as e:
+                print(f"Error in background search: {e}")
+                continue
+            self.results.put((job, result))
+
+    def _poll(self):
+        while True:
+            try:
+                job, result = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if job.cancelled.is_set():
+                continue
+            if job in self.pending:
+                self.pending.remove(job)
+            job.callback(result)
+        if self.running:
+            self.window.after(self.poll_interval, self._poll)
+
+
+def analyze_snapshot(search, engine, depth, time_budget, stop_event, rollouts=None):
+    """Worker task: lookahead ratings plus the best move of the chosen strategy.
+
+    The move comes from the Monte-Carlo evaluator when rollouts is given,
+    otherwise from the anytime search when time_budget is set.
+    """
+    ratings = search.rate_moves(engine, depth, stop_event)
+    best_move = None
+    if rollouts is not None:
+        best_move, _ = rollouts.best_move(engine, stop_event)
+        if stop_event.is_set():
+            raise SearchTimeout()
+    elif time_budget:
+        best_move, _ = search.best_move(engine, time_budget, stop_event)
+        if stop_event.is_set():
+            raise SearchTimeout()
+    return {
+        "ratings": ratings,
+        "best_move": best_move,
+        "cache": search.table.stats()
+    }
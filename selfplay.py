@@ -0,0 +1,177 @@
+"""Parallel headless self-play for tuning Auto Play.
+
+Plays N complete games per (board size, strategy) across all CPU cores
+with a process pool. Each chunk of games gets its own seed, so runs are
+reproducible. The score distributions are aggregated into one JSON file.
+
+Usage:  python selfplay.py --games 10000 --sizes 5 10 --strategies heuristic warnsdorff
+   or:  python mygame_10ten.py selfplay --games 10000 ...
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from collections import Counter
+
+from puzzle_engine import HEURISTIC_WEIGHTS, PuzzleEngine, heuristic_score
+from search import LookaheadSearch
+
+RESULTS_FILE = "selfplay_results.json"
+
+
+def choose_random(engine, moves, rng, options):
+    return rng.choice(moves)
+
+
+def choose_warnsdorff(engine, moves, rng, options):
+    """Fewest onward moves first, random tie-break"""
+    fewest = min(engine.count_future_moves(move) for move in moves)
+    return rng.choice([move for move in moves if engine.count_future_moves(move) == fewest])
+
+
+def choose_heuristic(engine, moves, rng, options):
+    weights = options["weights"]
+    return max(moves, key=lambda move: (heuristic_score(engine, move, weights), rng.random()))
+
+
+def choose_search(engine, moves, rng, options):
+    search = options.get("search")
+    if search is None or search.size != engine.size:
+        search = options["search"] = LookaheadSearch(engine.size)
+    move, _ = search.best_move(engine, options["time_budget"])
+    return move or rng.choice(moves)
+
+
+STRATEGIES = {
+    "random": choose_random,
+    "warnsdorff": choose_warnsdorff,
+    "heuristic": choose_heuristic,
+    "search": choose_search
+}
+
+
+def play_game(size, strategy, rng, options):
+    """Play one game from (0, 0) and return its score"""
+    choose = STRATEGIES[strategy]
+    engine = PuzzleEngine(size)
+    engine.place(0, 0)
+    while True:
+        moves = engine.get_possible_moves()
+        if not moves:
+            break
+        engine.place(*choose(engine, moves, rng, options))
+    return engine.score()
+
+
+def run_chunk(task):
+    """Pool worker: play a chunk of games and return their score histogram"""
+    size, strategy, games, seed, weights, time_budget = task
+    rng = random.Random(seed)
+    options = {"weights": weights, "time_budget": time_budget}
+    scores = Counter()
+    for _ in range(games):
+        scores[play_game(size, strategy, rng, options)] += 1
+    return size, strategy, scores
+
+
+def summarize(size, histogram):
+    games = sum(histogram.values())
+    scores = list(histogram.elements())
+    return {
+        "games": games,
+        "mean": statistics.mean(scores),
+        "stdev": statistics.pstdev(scores),
+        "median": statistics.median(scores),
+        "min": min(scores),
+        "max": max(scores),
+        "full_board_rate": histogram.get(size * size, 0) / games,
+        "histogram": {str(score): count for score, count in sorted(histogram.items())}
+    }
+
+
+def run_selfplay(games, sizes, strategies, workers=None, seed=0, chunk_size=200,
+                 weights=None, time_budget=0.02):
+    """Play games for every (size, strategy) pair in parallel and aggregate them"""
+    weights = dict(HEURISTIC_WEIGHTS, **(weights or {}))
+    tasks = []
+    for size in sizes:
+        for strategy in strategies:
+            for start in range(0, games, chunk_size):
+                # Seeds differ per chunk so every worker plays distinct games
+                chunk_seed = random.Random(f"{seed}:{size}:{strategy}:{start}").getrandbits(32)
+                tasks.append((size, strategy, min(chunk_size, games - start), chunk_seed,
+                              weights, time_budget))
+
+    histograms = {}
+    started = time.time()
+    with multiprocessing.Pool(processes=workers or os.cpu_count()) as pool:
+        for size, strategy, scores in pool.imap_unordered(run_chunk, tasks):
+            histograms.setdefault((size, strategy), Counter()).update(scores)
+    elapsed = time.time() - started
+
+    results = {}
+    for (size, strategy), histogram in sorted(histograms.items()):
+        results[f"{size}x{size}/{strategy}"] = summarize(size, histogram)
+    total_games = games * len(sizes) * len(strategies)
+    return {
+        "config": {
+            "games": games,
+            "sizes": sizes,
+            "strategies": strategies,
+            "seed": seed,
+            "workers": workers or os.cpu_count(),
+            "weights": weights,
+            "time_budget": time_budget
+        },
+        "elapsed": elapsed,
+        "games_per_second": total_games / elapsed if elapsed > 0 else 0,
+        "results": results
+    }
+
+
+def parse_weights(text):
+    weights = {}
+    for item in text.split(","):
+        name, value = item.split("=")
+        if name not in HEURISTIC_WEIGHTS:
+            raise argparse.ArgumentTypeError(f"unknown weight: {name}")
+        weights[name] = float(value)
+    return weights
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run headless Number Puzzle self-play games")
+    parser.add_argument("--games", type=int, default=1000, help="games per size and strategy")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10])
+    parser.add_argument("--strategies", nargs="+", default=["heuristic"], choices=sorted(STRATEGIES))
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=200)
+    parser.add_argument("--weights", type=parse_weights, default=None,
+                        help="heuristic weights, e.g. future_moves=10,corner=2,coverage=5")
+    parser.add_argument("--time-budget", type=float, default=0.02, help="seconds per move for 'search'")
+    parser.add_argument("--output", default=RESULTS_FILE)
+    args = parser.parse_args(argv)
+
+    report = run_selfplay(args.games, args.sizes, args.strategies, workers=args.workers,
+                          seed=args.seed, chunk_size=args.chunk_size, weights=args.weights,
+                          time_budget=args.time_budget)
+    tmp_path = args.output + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp_path, args.output)
+
+    for key, summary in report["results"].items():
+        print(f"{key}: mean {summary['mean']:.2f}, max {summary['max']}, "
+              f"full board {summary['full_board_rate']:.1%} over {summary['games']} games")
+    print(f"{report['games_per_second']:.0f} games/s with {report['config']['workers']} workers; "
+          f"results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
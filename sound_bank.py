@@ -0,0 +1,84 @@
+"""Cached sound effects.
+
+Beeps are synthesized with NumPy once per (frequency, duration) and kept
+as pygame Sound objects in an LRU cache, so playing one is a dictionary
+lookup and a Channel.play. prepare() renders the whole move pitch ladder
+of a board size up front, so no synthesis happens during a game. Each
+kind of sound has its own reserved mixer channel: a new move beep cuts
+off the previous one instead of piling up on free channels.
+
+Synthesis needs NumPy and an initialised pygame mixer; without either
+the game simply plays without sound.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pygame
+
+VOLUME = 0.3
+MOVE_DURATION = 0.1
+# Fixed effects: kind -> (frequency, duration)
+EFFECTS = {
+    "invalid": (200, 0.2),
+    "win": (880, 0.3)
+}
+CHANNELS = ("move", "invalid", "win")
+
+
+def move_frequency(number, size):
+    """Move beep pitch: 440 Hz rising to 880 Hz as the board fills up"""
+    max_number = size * size
+    progress = (number - 1) / max_number if max_number > 0 else 0
+    return int(440 * (1.0 + progress))
+
+
+def render_beep(frequency, duration, sample_rate=44100, channels=2):
+    """16-bit PCM bytes of a sine beep, one interleaved sample per channel"""
+    n_samples = int(sample_rate * duration)
+    t = np.arange(n_samples) / sample_rate
+    wave = (np.sin(2 * np.pi * frequency * t) * VOLUME * 32767).astype(np.int16)
+    if channels > 1:
+        wave = np.repeat(wave[:, np.newaxis], channels, axis=1)
+    return wave.tobytes()
+
+
+class SoundBank:
+    def __init__(self, capacity=512):
+        # Needs an initialised mixer; the buffers follow its rate and channel count
+        init = pygame.mixer.get_init()
+        if init is None:
+            raise RuntimeError("pygame mixer is not initialised")
+        self.sample_rate, _, self.mixer_channels = init
+        self.capacity = capacity  # covers a full 440-880 Hz ladder plus the effects
+        self.sounds = OrderedDict()
+        pygame.mixer.set_reserved(len(CHANNELS))
+        self.channels = {kind: pygame.mixer.Channel(index) for index, kind in enumerate(CHANNELS)}
+
+    def sound(self, frequency, duration):
+        """Sound for (frequency, duration), synthesized on first use"""
+        key = (frequency, duration)
+        sound = self.sounds.get(key)
+        if sound is None:
+            sound = pygame.mixer.Sound(
+                buffer=render_beep(frequency, duration, self.sample_rate, self.mixer_channels)
+            )
+            self.sounds[key] = sound
+            if len(self.sounds) > self.capacity:
+                self.sounds.popitem(last=False)
+        else:
+            self.sounds.move_to_end(key)
+        return sound
+
+    def prepare(self, size):
+        """Render every move pitch of a board size and the fixed effects ahead of play"""
+        for frequency, duration in EFFECTS.values():
+            self.sound(frequency, duration)
+        for frequency in sorted({move_frequency(number, size) for number in range(1, size * size + 2)}):
+            self.sound(frequency, MOVE_DURATION)
+
+    def play_move(self, number, size):
+        self.channels["move"].play(self.sound(move_frequency(number, size), MOVE_DURATION))
+
+    def play(self, kind):
+        self.channels[kind].play(self.sound(*EFFECTS[kind]))
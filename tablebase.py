@@ -0,0 +1,195 @@
+"""Exhaustive endgame table for small boards (built for 5x5).
+
+Every reachable (visited-set bitmask, current cell) state is explored once
+and the longest achievable continuation is memoised. States are folded
+onto one representative per board symmetry and written to an
+open-addressing hash table on disk, which is memory-mapped on load so a
+lookup is a couple of slot reads rather than a JSON parse.
+
+Build with:  python tablebase.py [size] [path]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import time
+
+from puzzle_engine import iter_bits, neighbour_masks, symmetry_maps
+
+TABLEBASE_FILE = "tablebase_5x5.bin"
+
+MAGIC = b"NPTB"
+VERSION = 1
+# magic, version, board size, log2(slot count), entry count
+HEADER = struct.Struct("<4sBBBxI")
+SLOT = struct.Struct("<Q")
+VALUE_BITS = 8
+VALUE_MASK = (1 << VALUE_BITS) - 1
+
+
+class _Canonicalizer:
+    """Map a (mask, cell) state to its smallest symmetric equivalent"""
+
+    def __init__(self, size):
+        self.size = size
+        self.cell_bits = max(1, (size * size - 1).bit_length())
+        self.maps = symmetry_maps(size)
+        row_mask = (1 << size) - 1
+        self.row_mask = row_mask
+        # row_tables[t][row][bits] -> mask those row bits map to under t
+        self.row_tables = []
+        for mapping in self.maps:
+            rows = []
+            for row in range(size):
+                table = []
+                for bits in range(row_mask + 1):
+                    mapped = 0
+                    for col in iter_bits(bits):
+                        mapped |= 1 << mapping[row * size + col]
+                    table.append(mapped)
+                rows.append(table)
+            self.row_tables.append(rows)
+
+    def key(self, mask, cell):
+        """Canonical integer key for a state"""
+        size = self.size
+        row_mask = self.row_mask
+        shift = self.cell_bits
+        chunks = [(mask >> (row * size)) & row_mask for row in range(size)]
+        best = None
+        for mapping, rows in zip(self.maps, self.row_tables):
+            mapped = 0
+            for row, bits in enumerate(chunks):
+                mapped |= rows[row][bits]
+            key = (mapped << shift) | mapping[cell]
+            if best is None or key < best:
+                best = key
+        return best
+
+
+def _slot_index(key, bits):
+    return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - bits)
+
+
+def solve_all_states(size):
+    """Return {(mask, cell): longest continuation} for every reachable state"""
+    masks = neighbour_masks(size)
+    memo = {}
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), size * size * 4 + 100))
+
+    def longest(mask, cell):
+        key = (mask, cell)
+        value = memo.get(key)
+        if value is not None:
+            return value
+        value = 0
+        for target in iter_bits(masks[cell] & ~mask):
+            length = 1 + longest(mask | (1 << target), target)
+            if length > value:
+                value = length
+        memo[key] = value
+        return value
+
+    for start in range(size * size):
+        longest(1 << start, start)
+    return memo
+
+
+def build_tablebase(size=5, path=TABLEBASE_FILE):
+    """Enumerate every state of a size x size board and write the table"""
+    canon = _Canonicalizer(size)
+    values = {}
+    for (mask, cell), value in solve_all_states(size).items():
+        values[canon.key(mask, cell)] = value
+
+    bits = max(4, (len(values) * 2 - 1).bit_length())
+    slots = [0] * (1 << bits)
+    slot_mask = (1 << bits) - 1
+    for key, value in values.items():
+        index = _slot_index(key, bits)
+        while slots[index]:
+            index = (index + 1) & slot_mask
+        slots[index] = (key << VALUE_BITS) | value
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, bits, len(values)))
+        f.write(struct.pack(f"<{len(slots)}Q", *slots))
+    os.replace(tmp_path, path)
+    return len(values)
+
+
+class Tablebase:
+    def __init__(self, path=TABLEBASE_FILE):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, bits, entries = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a tablebase file")
+        self.size = size
+        self.bits = bits
+        self.entries = entries
+        self.slot_mask = (1 << bits) - 1
+        self.masks = neighbour_masks(size)
+        self.canon = _Canonicalizer(size)
+
+    def close(self):
+        self.data.close()
+
+    def value(self, mask, cell):
+        """Longest continuation from a state, or None if it isn't stored"""
+        key = self.canon.key(mask, cell)
+        index = _slot_index(key, self.bits)
+        while True:
+            (slot,) = SLOT.unpack_from(self.data, HEADER.size + index * SLOT.size)
+            if not slot:
+                return None
+            if slot >> VALUE_BITS == key:
+                return slot & VALUE_MASK
+            index = (index + 1) & self.slot_mask
+
+    def covers(self, engine):
+        return engine.size == self.size and bool(engine.moves)
+
+    def analyze(self, engine):
+        """Rate every legal move as the final score perfect play reaches from it"""
+        size = self.size
+        mask = 0
+        for row, col in engine.moves:
+            mask |= 1 << (row * size + col)
+        placed = len(engine.moves)
+        ratings = {}
+        for row, col in engine.get_possible_moves():
+            cell = row * size + col
+            value = self.value(mask | (1 << cell), cell)
+            if value is not None:
+                ratings[(row, col)] = placed + 1 + value
+        return ratings
+
+    def best_move(self, engine):
+        """Move that keeps the longest possible game alive, or None"""
+        ratings = self.analyze(engine)
+        if not ratings:
+            return None
+        return max(ratings, key=ratings.get)
+
+
+def load_tablebase(path=TABLEBASE_FILE):
+    """Open the tablebase if it has been built, otherwise return None"""
+    try:
+        return Tablebase(path)
+    except (OSError, ValueError, struct.error) as e:
+        if os.path.exists(path):
+            print(f"Error loading tablebase: {e}")
+        return None
+
+
+if __name__ == "__main__":
+    board_size = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    out_path = sys.argv[2] if len(sys.argv) > 2 else f"tablebase_{board_size}x{board_size}.bin"
+    started = time.time()
+    count = build_tablebase(board_size, out_path)
+    print(f"Wrote {count} canonical states to {out_path} in {time.time() - started:.1f}s")
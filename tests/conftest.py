@@ -0,0 +1,92 @@
+"""Shared test setup.
+
+The game's modules live at the top of the repository. The `gui` fixture
+builds a NumberPuzzleGUI without a Tk window: __init__ is skipped, the
+game logic (engine, journal, move tree, analyzer, game store) is real,
+and every widget and every method that only redraws the screen is a
+MagicMock.
+"""
+
+import os
+import sys
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+GUI_WIDGETS = ("window", "worker", "clock", "animator", "painter", "board_frame",
+               "game_over_label", "label_info", "label_time", "move_counter",
+               "btn_auto", "btn_undo", "btn_replay_play", "replay_scale", "replay_frame",
+               "score_title", "score_listbox")
+GUI_DISPLAY_METHODS = ("update_progress_bar", "update_move_history", "draw_path_indicator",
+                       "highlight_valid_moves", "highlight_cell", "request_analysis",
+                       "analyze_and_update_strategy", "play_sound", "save_statistics",
+                       "check_high_score")
+
+
+@pytest.fixture
+def make_gui(tmp_path, monkeypatch):
+    """Factory for headless GUIs of a given board size, run in tmp_path"""
+    pytest.importorskip("tkinter")
+    pytest.importorskip("pygame")
+    from game_store import GameStore
+    from move_journal import MoveJournal
+    from move_tree import MoveTree
+    from mygame_10ten import MoveAnalyzer, NumberPuzzleGUI
+    from puzzle_engine import PuzzleEngine
+    from search import LookaheadSearch
+
+    monkeypatch.chdir(tmp_path)
+    stores = []
+
+    def make(size=5):
+        gui = NumberPuzzleGUI.__new__(NumberPuzzleGUI)
+        gui.size = size
+        gui.board_sizes = {"Small (5x5)": 5, "Standard (10x10)": 10,
+                           "Large (20x20)": 20, "Huge (50x50)": 50}
+        gui.engine = PuzzleEngine(size)
+        gui.journal = MoveJournal(size)
+        gui.move_tree = MoveTree()
+        gui.move_analyzer = MoveAnalyzer()
+        gui.game_store = GameStore(str(tmp_path / f"games_{len(stores)}.jsonl"), legacy_path=None)
+        stores.append(gui.game_store)
+        gui.database = None
+        gui.scores_file = str(tmp_path / "scores.json")
+        gui.lookahead = LookaheadSearch(size)
+        gui.tablebase = None
+        gui.sound_bank = None
+        gui.replay = None
+        gui.replay_playing = False
+        gui.replay_render_pending = False
+        gui.game_over = False
+        gui.game_recorded = False
+        gui.auto_playing = False
+        gui.auto_move_pending = False
+        gui.turbo_active = False
+        gui.turbo_search = None
+        gui.analysis = None
+        gui.position_version = 0
+        gui.solver_version = None
+        gui.elapsed_time = 0
+        gui.highlighted = {}
+        gui.board_grid_size = 0
+        gui.themes = {"white": {"bg": "#FFFFFF", "button_bg": "#F0F0F0"}}
+        gui.current_theme = "white"
+        for name in GUI_WIDGETS:
+            setattr(gui, name, mock.MagicMock())
+        gui.clock.pause.return_value = 12.0
+        gui.clock.elapsed.return_value = 12.0
+        for name in GUI_DISPLAY_METHODS:
+            setattr(gui, name, mock.MagicMock())
+        return gui
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+@pytest.fixture
+def gui(make_gui):
+    """A headless 5x5 GUI"""
+    return make_gui()
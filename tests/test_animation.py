@@ -0,0 +1,109 @@
+from animation import Animator, color_ramp
+from cell_render import CellPainter
+
+
+class FakeWindow:
+    """after()/after_cancel() that run only when the test calls run_next()"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        del self.callbacks[after_id]
+
+    def run_next(self):
+        after_id = min(self.callbacks)
+        self.callbacks.pop(after_id)()
+
+
+class FakeCell:
+    """Records every config call and the options it currently shows"""
+
+    def __init__(self):
+        self.state = {}
+        self.calls = 0
+
+    def config(self, **options):
+        self.state.update(options)
+        self.calls += 1
+
+
+def test_ramp_runs_from_start_to_target():
+    ramp = color_ramp("#000000", "#ff8000", 4)
+    assert ramp[0] == "#000000" and ramp[-1] == "#ff8000"
+    assert len(ramp) == 5
+    assert color_ramp("#000000", "#ff8000", 4) is ramp
+
+
+def test_fade_steps_through_the_ramp_then_applies_final_options():
+    window = FakeWindow()
+    animator = Animator(window)
+    cell = FakeCell()
+    animator.fade("a", cell, "#000000", "#ffffff", 4, relief="sunken")
+    seen = [cell.state["bg"]]
+    while window.callbacks:
+        window.run_next()
+        seen.append(cell.state["bg"])
+    assert seen[:-1] == list(color_ramp("#000000", "#ffffff", 4))
+    assert cell.state == {"bg": "#ffffff", "relief": "sunken"}
+    assert animator.tweens == {}
+
+
+def test_too_many_fades_finish_the_oldest():
+    animator = Animator(FakeWindow(), max_active=2)
+    cells = [FakeCell() for _ in range(3)]
+    for key, cell in enumerate(cells):
+        animator.fade(key, cell, "#000000", "#ffffff", 10)
+    assert list(animator.tweens) == [1, 2]
+    assert cells[0].state["bg"] == "#ffffff"
+
+
+def test_clear_settles_running_fades_and_stops_the_tick():
+    window = FakeWindow()
+    animator = Animator(window)
+    cell = FakeCell()
+    animator.fade("a", cell, "#000000", "#ffffff", 10, relief="sunken")
+    window.run_next()
+    animator.clear()
+    assert cell.state == {"bg": "#ffffff", "relief": "sunken"}
+    assert window.callbacks == {}
+
+
+def test_cancel_leaves_the_cell_alone():
+    animator = Animator(FakeWindow())
+    cell = FakeCell()
+    animator.fade("a", cell, "#000000", "#ffffff", 10)
+    calls = cell.calls
+    animator.cancel("a")
+    assert cell.calls == calls
+    assert animator.tweens == {}
+
+
+def test_board_redraw_mid_fade_leaves_no_cell_half_faded(gui):
+    """render_position right after a move (turbo, branch switch, replay)"""
+    window = FakeWindow()
+    gui.buttons = [[FakeCell() for _ in range(5)] for _ in range(5)]
+    gui.painter = CellPainter(gui.buttons, "#F0F0F0")
+    gui.animator = Animator(window)
+    gui.themes["white"]["button_fg"] = "#000000"
+    gui.animation_steps = 10
+    gui.animation_speed = 20
+    gui.auto_play_delay = 500
+
+    for row, col in [(0, 0), (0, 3)]:
+        gui.engine.place(row, col)
+        gui.animate_number_placement(row, col, str(gui.engine.score()), gui.base_color(row, col))
+        window.run_next()
+    gui.render_position()
+
+    for row, col in [(0, 0), (0, 3)]:
+        state = gui.buttons[row][col].state
+        assert state["bg"] == gui.base_color(row, col)
+        assert state["relief"] == "sunken"
+    assert window.callbacks == {}
@@ -0,0 +1,68 @@
+"""Canvas board hit-testing and board grid weights.
+
+CanvasBoard is built with __new__ so only its geometry is exercised; no
+Tk canvas is created.
+"""
+
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from board_canvas import CanvasBoard
+
+
+def make_board(size, cell_px):
+    board = CanvasBoard.__new__(CanvasBoard)
+    board.size = size
+    board.cell_px = cell_px
+    board.cells = [[mock.sentinel.cell] * size for _ in range(size)]
+    board.hovered = None
+    board.on_click = mock.MagicMock()
+    board.on_hover = mock.MagicMock()
+    board.on_leave = mock.MagicMock()
+    return board
+
+
+@pytest.mark.parametrize("size, cell_px", [(5, 48), (10, 48), (50, 12), (20, 7)])
+def test_pixels_map_to_the_cell_under_them(size, cell_px):
+    board = make_board(size, cell_px)
+    for row in range(size):
+        for col in range(size):
+            left, top = col * cell_px, row * cell_px
+            assert board.cell_at(left, top) == (row, col)
+            assert board.cell_at(left + cell_px - 1, top + cell_px - 1) == (row, col)
+            assert board.cell_at(*board.center(row, col)) == (row, col)
+
+
+def test_pixels_off_the_board_hit_nothing():
+    board = make_board(10, 20)
+    for x, y in [(-1, 0), (0, -1), (200, 0), (0, 200), (200, 200), (-5, 250)]:
+        assert board.cell_at(x, y) is None
+
+
+def test_clicks_and_hover_follow_the_hit_cell():
+    board = make_board(10, 20)
+    board.handle_click(SimpleNamespace(x=65, y=25))
+    board.on_click.assert_called_once_with(1, 3)
+    board.handle_click(SimpleNamespace(x=500, y=25))
+    board.on_click.assert_called_once()
+
+    board.handle_motion(SimpleNamespace(x=65, y=25))
+    board.handle_motion(SimpleNamespace(x=70, y=30))  # same cell: no new hover
+    board.on_hover.assert_called_once_with(mock.sentinel.cell, 1, 3)
+    board.handle_motion(SimpleNamespace(x=500, y=500))
+    board.on_leave.assert_called_once_with(mock.sentinel.cell, 1, 3)
+    assert board.hovered is None
+
+
+def test_board_weights_follow_the_board_size(gui):
+    weights = {}
+    gui.board_frame.grid_rowconfigure.side_effect = lambda i, weight: weights.__setitem__(i, weight)
+
+    for size in (10, 50, 5):
+        gui.size = size
+        gui.set_board_weights()
+        assert {i for i, weight in weights.items() if weight} == set(range(size))
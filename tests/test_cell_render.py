@@ -0,0 +1,63 @@
+from cell_render import CellPainter
+
+
+class FakeCell:
+    def __init__(self):
+        self.calls = []
+
+    def config(self, **options):
+        self.calls.append(options)
+
+
+def make_painter(size=3, bg="#FFFFFF"):
+    cells = [[FakeCell() for _ in range(size)] for _ in range(size)]
+    return cells, CellPainter(cells, bg)
+
+
+def test_paint_skips_unchanged_backgrounds():
+    cells, painter = make_painter()
+    painter.paint(0, 0, "#FFFFFF")
+    assert cells[0][0].calls == []
+    painter.paint(0, 0, "#FF0000")
+    painter.paint(0, 0, "#FF0000")
+    assert cells[0][0].calls == [{"bg": "#FF0000"}]
+    assert painter.current_bg(0, 0) == "#FF0000"
+
+
+def test_set_text_skips_unchanged_text_and_passes_options():
+    cells, painter = make_painter()
+    painter.set_text(1, 1, " ")
+    painter.set_text(1, 1, "7", fg="#000000")
+    painter.set_text(1, 1, "7", fg="#FF0000")
+    assert cells[1][1].calls == [{"text": "7", "fg": "#000000"}]
+
+
+def test_reset_forces_the_next_paint_to_match_the_bulk_update():
+    cells, painter = make_painter()
+    painter.paint(0, 1, "#FF0000")
+    painter.set_text(0, 1, "3")
+    # A bulk update set every cell to grey without going through the painter
+    painter.reset("#CCCCCC", " ")
+    painter.paint(0, 1, "#CCCCCC")
+    painter.set_text(0, 1, " ")
+    painter.paint(0, 1, "#FF0000")
+    painter.set_text(0, 1, "3")
+    assert cells[0][1].calls == [{"bg": "#FF0000"}, {"text": "3"},
+                                 {"bg": "#FF0000"}, {"text": "3"}]
+
+
+def test_reset_without_text_keeps_known_text():
+    cells, painter = make_painter()
+    painter.set_text(2, 2, "9")
+    painter.reset("#000000")
+    painter.set_text(2, 2, "9")
+    assert cells[2][2].calls == [{"text": "9"}]
+
+
+def test_note_bg_records_what_an_animation_will_leave_behind():
+    cells, painter = make_painter()
+    painter.note_bg(2, 0, "#00FF00")
+    painter.paint(2, 0, "#00FF00")
+    assert cells[2][0].calls == []
+    painter.paint(2, 0, "#FFFFFF")
+    assert cells[2][0].calls == [{"bg": "#FFFFFF"}]
@@ -0,0 +1,83 @@
+import pytest
+
+import game_clock
+from game_clock import GameClock
+
+
+class FakeWindow:
+    """after()/after_cancel() bookkeeping; the test fires callbacks itself"""
+
+    def __init__(self):
+        self.callbacks = {}
+        self.next_id = 0
+
+    def after(self, ms, callback):
+        self.next_id += 1
+        self.callbacks[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        del self.callbacks[after_id]
+
+    def tick(self):
+        after_id = min(self.callbacks)
+        self.callbacks.pop(after_id)()
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """A settable monotonic clock: now[0] is the current time in seconds"""
+    current = [100.0]
+    monkeypatch.setattr(game_clock.time, "monotonic", lambda: current[0])
+    return current
+
+
+def test_paused_time_is_not_counted(now):
+    window = FakeWindow()
+    clock = GameClock(window, lambda elapsed: None)
+    clock.start()
+    now[0] += 2.5
+    assert clock.elapsed() == 2.5
+    assert clock.pause() == 2.5
+    now[0] += 60
+    assert clock.elapsed() == 2.5 and not clock.running
+    clock.resume()
+    now[0] += 1.25
+    assert clock.elapsed() == 3.75
+
+
+def test_one_refresh_loop_while_running(now):
+    window = FakeWindow()
+    ticks = []
+    clock = GameClock(window, ticks.append)
+    clock.start()
+    clock.start()
+    clock.resume()
+    assert len(window.callbacks) == 1
+
+    now[0] += 0.1
+    window.tick()
+    now[0] += 0.1
+    window.tick()
+    assert ticks == pytest.approx([0.1, 0.2])
+    assert len(window.callbacks) == 1
+
+    clock.pause()
+    assert window.callbacks == {}
+    clock.resume()
+    assert len(window.callbacks) == 1
+
+
+def test_resume_before_start_and_reset(now):
+    window = FakeWindow()
+    clock = GameClock(window, lambda elapsed: None)
+    clock.resume()
+    assert not clock.running and window.callbacks == {}
+
+    clock.start()
+    now[0] += 5
+    clock.reset()
+    assert clock.elapsed() == 0.0
+    assert window.callbacks == {}
+    clock.resume()
+    assert not clock.running
@@ -0,0 +1,92 @@
+import json
+
+from game_db import GameDatabase, open_database
+from game_store import GameStore
+
+
+def open_db(tmp_path, scores=None, games=()):
+    scores_file = tmp_path / "scores.json"
+    if scores is not None:
+        scores_file.write_text(json.dumps(scores))
+    store = GameStore(str(tmp_path / "games.jsonl"), legacy_path=None)
+    for record in games:
+        store.append(record)
+    db = GameDatabase(str(tmp_path / "test.db"), scores_file=str(scores_file), game_store=store)
+    store.close()
+    return db
+
+
+def test_recorded_games_feed_counts_recent_and_stats(tmp_path):
+    db = open_db(tmp_path)
+    assert db.stats() == {"games_played": 0, "best_score": 0, "total_score": 0}
+    assert db.recent(5) is None
+
+    db.record_game(5, 12, 30, [((0, 0), 1, 2), ((0, 3), 2, None)])
+    db.record_game(5, 20, 45, [((0, 0), 1, 2), ((3, 3), 2, 4)])
+    db.record_game(10, 60, 90, [((0, 0), 1, 2)])
+
+    assert db.count() == 3 and db.count(5) == 2 and db.count(20) == 0
+    assert db.stats() == {"games_played": 3, "best_score": 60, "total_score": 92}
+    assert db.recent(5) == {"size": 5, "score": 20, "time": 45,
+                            "moves": [((0, 0), 1), ((3, 3), 2)]}
+    assert db.recent(5, 2)["score"] == 12
+    assert db.recent(5, 3) is None
+
+    assert db.position_stats(5, (0, 0), 1, 1, success_score=15) == {
+        "count": 2, "score_total": 32, "future_total": 4, "future_samples": 2, "successes": 1
+    }
+    # Moves without a future_moves sample are counted but not averaged
+    assert db.position_stats(5, (0, 3), 1, 5, success_score=15) == {
+        "count": 1, "score_total": 12, "future_total": 0, "future_samples": 0, "successes": 0
+    }
+    db.close()
+
+
+def test_leaderboard_is_per_size_best_first(tmp_path):
+    db = open_db(tmp_path)
+    db.add_score(10, "AAA", 50, 100)
+    db.add_score(10, "BBB", 70, 120)
+    db.add_score(10, "CCC", 50, 90)
+    db.add_score(5, "DDD", 25, 60)
+    assert db.top_scores(10) == [("BBB", 70, 120), ("AAA", 50, 100), ("CCC", 50, 90)]
+    assert db.top_scores(10, limit=1) == [("BBB", 70, 120)]
+    assert db.top_scores(5) == [("DDD", 25, 60)]
+    assert db.top_scores(20) == []
+    db.close()
+
+
+def test_new_database_imports_json_scores_and_stored_games(tmp_path):
+    scores = {"10x10": [["AAA", 55, 100]], "5x5": [["BBB", 25, 40]]}
+    games = [{"size": 5, "score": 9, "time": 20, "moves": [[[0, 0], 1], [[0, 3], 2]]},
+             {"size": 10, "score": 55, "moves": []}]
+    db = open_db(tmp_path, scores, games)
+    assert db.top_scores(10) == [("AAA", 55, 100)]
+    assert db.top_scores(5) == [("BBB", 25, 40)]
+    assert db.stats() == {"games_played": 2, "best_score": 55, "total_score": 64}
+    assert db.recent(5)["moves"] == [((0, 0), 1), ((0, 3), 2)]
+    assert db.recent(10)["time"] == 0
+    db.close()
+
+    # Reopening an existing database must not import a second time
+    db = open_db(tmp_path, scores, games)
+    assert db.count() == 2
+    db.close()
+
+
+def test_open_database_follows_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = GameStore(str(tmp_path / "games.jsonl"), legacy_path=None)
+    config = tmp_path / "config.json"
+
+    assert open_database(store, str(config)) is None
+    config.write_text("{not json")
+    assert open_database(store, str(config)) is None
+    config.write_text(json.dumps({"storage": "json"}))
+    assert open_database(store, str(config)) is None
+
+    config.write_text(json.dumps({"storage": "sqlite", "database": "custom.db"}))
+    db = open_database(store, str(config))
+    assert isinstance(db, GameDatabase)
+    assert (tmp_path / "custom.db").exists()
+    db.close()
+    store.close()
@@ -0,0 +1,65 @@
+"""Game-over bookkeeping: recording a finished game once across undo and branch switches."""
+
+
+def play_until_stuck(gui):
+    """Play the first legal move until none is left, like make_move does"""
+    gui.engine.place(0, 0)
+    gui.journal.append(0, 0, 0.0)
+    gui.move_tree.play((0, 0))
+    while gui.engine.get_possible_moves():
+        move = gui.engine.get_possible_moves()[0]
+        gui.engine.place(*move)
+        gui.journal.append(*move, 0.0)
+        gui.move_tree.play(move)
+
+
+def test_game_reopened_with_undo_is_recorded_once(gui):
+    play_until_stuck(gui)
+    last_move = gui.moves[-1]
+    gui.end_game()
+    assert gui.game_over
+    assert gui.game_store.count(5) == 1
+
+    gui.undo_move()
+    assert not gui.game_over
+    gui.clock.resume.assert_called_once()
+
+    gui.engine.place(*last_move)
+    gui.journal.append(*last_move, 0.0)
+    gui.move_tree.play(last_move)
+    gui.end_game()
+
+    assert gui.game_over
+    assert gui.game_store.count(5) == 1
+    gui.save_statistics.assert_called_once()
+    gui.check_high_score.assert_called_once()
+
+
+def test_switching_to_a_finished_line_ends_the_game(gui):
+    play_until_stuck(gui)
+    finished = gui.move_tree.current
+    gui.end_game()
+    gui.undo_move()
+    gui.undo_move()
+    assert not gui.game_over
+
+    gui.goto_node(finished)
+
+    assert gui.game_over
+    assert gui.moves == [node.position for node in gui.move_tree.path(finished)]
+    assert gui.game_store.count(5) == 1
+    gui.check_high_score.assert_called_once()
+
+
+def test_switching_to_an_open_line_keeps_playing(gui):
+    play_until_stuck(gui)
+    gui.end_game()
+    gui.undo_move()
+    open_node = gui.move_tree.current
+    gui.undo_move()
+    gui.clock.resume.reset_mock()
+
+    gui.goto_node(open_node)
+
+    assert not gui.game_over
+    gui.clock.resume.assert_called_once()
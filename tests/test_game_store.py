@@ -0,0 +1,50 @@
+import json
+import os
+
+from game_store import GameStore
+
+
+def record(size, score):
+    return {"size": size, "score": score, "moves": []}
+
+
+def test_migration_copies_legacy_history_and_leaves_it_in_place(tmp_path):
+    legacy = tmp_path / "game_history.json"
+    legacy_text = json.dumps([record(10, 40), record(5, 25), {"junk": True}])
+    legacy.write_text(legacy_text)
+    path = str(tmp_path / "game_records.jsonl")
+
+    store = GameStore(path, legacy_path=str(legacy))
+    assert store.count() == 2
+    assert store.best_score(10) == 40
+    store.append(record(10, 55))
+    store.close()
+    assert legacy.read_text() == legacy_text
+
+    # The data file marks the migration as done; reopening must not copy again
+    store = GameStore(path, legacy_path=str(legacy))
+    assert store.count() == 3
+    assert store.score_histogram(10) == {40: 1, 55: 1}
+    store.close()
+
+
+def test_torn_tail_is_cut_and_index_rebuilt(tmp_path):
+    path = str(tmp_path / "game_records.jsonl")
+    store = GameStore(path, legacy_path=None)
+    store.append(record(10, 30))
+    store.append(record(10, 60))
+    store.close()
+    good_size = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(b'{"size":10,"sco')
+
+    store = GameStore(path, legacy_path=None)
+    assert os.path.getsize(path) == good_size
+    assert store.count(10) == 2
+    assert store.recent(10)["score"] == 60
+    store.close()
+
+    os.remove(store.index_path)
+    store = GameStore(path, legacy_path=None)
+    assert [game["score"] for game in store.top(10)] == [60, 30]
+    store.close()
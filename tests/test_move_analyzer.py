@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+pytest.importorskip("tkinter")
+pytest.importorskip("pygame")
+
+from mygame_10ten import MoveAnalyzer
+
+
+def logged_game(size, moves, snapshot):
+    """Autoplay log records of one game, in the old (board snapshot) or new (size) form"""
+    records = []
+    for turn, position in enumerate(moves, 2):
+        record = {
+            "turn": turn,
+            "chosen_move": list(position),
+            "analyzed_moves": [{"position": list(position), "future_moves": 3}],
+            "timestamp": 0.0
+        }
+        if snapshot:
+            record["board_state"] = [[0] * size for _ in range(size)]
+        else:
+            record["size"] = size
+        records.append(record)
+    return records
+
+
+@pytest.mark.parametrize("snapshot", [True, False])
+def test_index_is_built_from_either_record_form(tmp_path, monkeypatch, snapshot):
+    monkeypatch.chdir(tmp_path)
+    records = logged_game(10, [(0, 3), (3, 3), (3, 6)], snapshot)
+    with open("autoplay_logs.jsonl", "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+    analyzer = MoveAnalyzer()
+    analyzer.board_size = 10
+    stats = analyzer.analyze_position((3, 3), 3)
+
+    assert stats["sample_size"] == 1
+    assert stats["avg_score"] == 4  # the last logged turn
+    assert stats["avg_future_moves"] == 3
+    assert analyzer.analyze_position((3, 3), 40) is None
+
+
+class StatsDatabase:
+    """position_stats with its keys in a different order than the fields are used"""
+
+    def position_stats(self, size, position, first_turn, last_turn, success_score):
+        return {"successes": 1, "future_samples": 2, "future_total": 10,
+                "score_total": 120, "count": 4}
+
+
+def test_database_stats_are_read_by_key(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analyzer = MoveAnalyzer(database=StatsDatabase())
+    analyzer.board_size = 10
+    stats = analyzer.analyze_position((3, 3), 3)
+
+    assert stats["sample_size"] == 4
+    assert stats["avg_score"] == 30
+    assert stats["avg_future_moves"] == 5
+    assert stats["success_rate"] == 0.25
@@ -0,0 +1,46 @@
+from move_journal import MoveJournal
+
+GAME = [(0, 0), (0, 3), (3, 3), (3, 0), (1, 2), (4, 2)]
+
+
+def play(journal, moves):
+    for step, (row, col) in enumerate(moves):
+        journal.append(row, col, float(step), future_moves=step)
+
+
+def test_board_reconstruction_matches_with_and_without_checkpoints():
+    plain = MoveJournal(5)
+    checkpointed = MoveJournal(5, checkpoint_interval=2)
+    play(plain, GAME)
+    play(checkpointed, GAME)
+    assert set(checkpointed.checkpoints) == {2, 4, 6}
+    for moves_made in range(len(GAME) + 1):
+        assert plain.board_at(moves_made) == checkpointed.board_at(moves_made)
+    rows = plain.board_rows(3)
+    assert rows[0][0] == 1 and rows[0][3] == 2 and rows[3][3] == 3
+    assert sum(value != 0 for row in rows for value in row) == 3
+
+
+def test_undo_pops_the_last_entry_and_its_checkpoint():
+    journal = MoveJournal(5, checkpoint_interval=2)
+    play(journal, GAME)
+    assert journal.pop() == ((4, 2), 6)
+    assert journal.pop() == ((1, 2), 5)
+    assert len(journal) == 4
+    assert 6 not in journal.checkpoints
+    assert journal.entry(4) == (3 * 5 + 0, 4, 3.0)
+
+    # Playing on after an undo overwrites the undone numbers
+    journal.append(4, 2, 9.0)
+    assert journal.board_rows()[4][2] == 5
+    assert journal.board_rows()[1][2] == 0
+    assert journal.moves()[-1] == ((4, 2), 5, None)
+
+
+def test_undo_on_an_empty_journal():
+    journal = MoveJournal(5)
+    assert journal.pop() is None
+    play(journal, GAME[:1])
+    journal.reset(10)
+    assert len(journal) == 0
+    assert journal.size == 10
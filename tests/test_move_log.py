@@ -0,0 +1,69 @@
+import gzip
+import json
+import os
+
+from move_log import MoveLogWriter, iter_move_logs
+
+
+def records(start, count):
+    return [{"turn": turn, "chosen_move": [turn % 10, 0]} for turn in range(start, start + count)]
+
+
+def write(path, items, **options):
+    # A long flush interval and big batches: only rotation and close() write
+    writer = MoveLogWriter(path, flush_interval=60, batch_size=10000, **options)
+    for record in items:
+        writer.append(record)
+    writer.flush()
+    return writer
+
+
+def test_close_flushes_pending_records(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = MoveLogWriter(path, flush_interval=60, batch_size=10000)
+    for record in records(1, 5):
+        writer.append(record)
+    assert os.path.getsize(path) == 0
+    writer.close()
+    assert list(iter_move_logs(path, legacy_path=None)) == records(1, 5)
+    writer.append({"turn": 99})  # ignored once closed
+    assert len(list(iter_move_logs(path, legacy_path=None))) == 5
+
+
+def test_rotation_gzips_full_segments_and_keeps_record_order(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = MoveLogWriter(path, max_bytes=150, flush_interval=60, batch_size=10000)
+    for chunk in range(6):
+        for record in records(chunk * 5 + 1, 5):
+            writer.append(record)
+        writer.flush()
+    for record in records(31, 2):
+        writer.append(record)
+    writer.close()
+
+    segments = sorted(name for name in os.listdir(tmp_path) if name != "log.jsonl")
+    assert segments == [f"log.{n:05d}.jsonl.gz" for n in range(1, 7)]
+    with gzip.open(tmp_path / segments[0], "rt") as f:
+        assert [json.loads(line) for line in f] == records(1, 5)
+    assert list(iter_move_logs(path, legacy_path=None)) == records(1, 32)
+
+
+def test_uncompressed_rotation(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    writer = write(path, records(1, 5), max_bytes=100, compress_rotated=False)
+    writer.close()
+    assert os.path.exists(tmp_path / "log.00001.jsonl")
+    assert os.path.getsize(path) == 0
+    assert list(iter_move_logs(path, legacy_path=None)) == records(1, 5)
+
+
+def test_legacy_array_is_read_first_and_torn_lines_are_skipped(tmp_path):
+    path = str(tmp_path / "log.jsonl")
+    legacy = tmp_path / "log.json"
+    legacy.write_text(json.dumps(records(1, 3)))
+    write(path, records(4, 5), max_bytes=150).close()
+    write(path, records(9, 2)).close()
+    with open(path, "a") as f:
+        f.write('{"turn": 11, "chos')
+
+    assert list(iter_move_logs(path, legacy_path=str(legacy))) == records(1, 10)
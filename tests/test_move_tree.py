@@ -0,0 +1,83 @@
+from move_tree import MoveTree
+
+
+def play_line(tree, moves):
+    return [tree.play(move) for move in moves]
+
+
+def test_undo_and_redo_walk_the_current_line():
+    tree = MoveTree()
+    first, second, third = play_line(tree, [(0, 0), (0, 3), (3, 3)])
+    assert tree.current is third and third.number == 3
+    assert tree.undo() is third
+    assert tree.undo() is second
+    assert tree.current is first
+    assert tree.redo_node() is second
+    assert tree.redo() is second
+    assert tree.redo() is third
+    assert tree.redo() is None
+    assert tree.path() == [first, second, third]
+
+    tree.undo()
+    tree.undo()
+    tree.undo()
+    assert tree.current is tree.root
+    assert tree.undo() is None
+
+
+def test_a_new_move_after_undo_starts_a_branch():
+    tree = MoveTree()
+    play_line(tree, [(0, 0), (0, 3), (3, 3)])
+    old_tip = tree.current
+    tree.undo()
+    branch = tree.play((2, 5))
+    assert tree.nodes == 4
+    assert set(branch.parent.children) == {(3, 3), (2, 5)}
+    # Replaying a move that was tried before reuses its node
+    tree.undo()
+    assert tree.play((3, 3)) is old_tip
+    assert tree.nodes == 4
+
+
+def test_route_between_branches():
+    tree = MoveTree()
+    play_line(tree, [(0, 0), (0, 3), (3, 3), (3, 0)])
+    left = tree.current
+    tree.undo()
+    tree.undo()
+    right = play_line(tree, [(2, 5), (4, 3)])[-1]
+
+    undo, forward = tree.route(left)
+    assert undo == 2
+    assert [node.position for node in forward] == [(3, 3), (3, 0)]
+    assert tree.route(right) == (0, [])
+
+    tree.goto(left)
+    assert tree.current is left
+    # goto remembers the way down, so redo from the root follows it again
+    while tree.undo():
+        pass
+    while tree.redo():
+        pass
+    assert tree.current is left
+
+
+def test_next_branch_cycles_through_alternatives():
+    tree = MoveTree()
+    play_line(tree, [(0, 0), (0, 3), (3, 3), (3, 0)])
+    first_tip = tree.current
+    tree.undo()
+    tree.undo()
+    second_tip = play_line(tree, [(2, 5), (4, 3)])[-1]
+
+    tip, (index, count) = tree.next_branch()
+    assert tip is first_tip and (index, count) == (1, 2)
+    tree.goto(tip)
+    tip, (index, count) = tree.next_branch()
+    assert tip is second_tip and (index, count) == (2, 2)
+
+
+def test_a_single_line_has_no_branches():
+    tree = MoveTree()
+    play_line(tree, [(0, 0), (0, 3)])
+    assert tree.next_branch() == (None, (0, 0))
@@ -0,0 +1,104 @@
+import pytest
+
+pytest.importorskip("tkinter")
+
+from path_overlay import PATH_TAG, PathOverlay
+
+
+class RecordingCanvas:
+    """Keeps the live line items and counts every create and delete"""
+
+    def __init__(self):
+        self.items = {}
+        self.next_id = 0
+        self.created = 0
+        self.deleted = 0
+        self.lowered = []
+
+    def create_line(self, x0, y0, x1, y1, **options):
+        self.next_id += 1
+        self.items[self.next_id] = {"coords": (x0, y0, x1, y1), **options}
+        self.created += 1
+        return self.next_id
+
+    def delete(self, item):
+        if item == PATH_TAG:
+            self.deleted += len(self.items)
+            self.items = {}
+        else:
+            del self.items[item]
+            self.deleted += 1
+
+    def coords(self, item, *coords):
+        self.items[item]["coords"] = coords
+
+    def itemconfig(self, tag, **options):
+        for item in self.items.values():
+            if tag in item["tags"]:
+                item.update(options)
+
+    def tag_lower(self, item, below):
+        self.lowered.append((item, below))
+
+    def lines(self):
+        return sorted(item["coords"] for item in self.items.values())
+
+
+def center(row, col):
+    return (col * 10, row * 10)
+
+
+def lines_for(moves):
+    return sorted(center(*a) + center(*b) for a, b in zip(moves, moves[1:]))
+
+
+def test_moves_and_undos_touch_one_segment_each():
+    canvas = RecordingCanvas()
+    overlay = PathOverlay(canvas, center, "red", below="numbers")
+    moves = [(0, 0), (0, 3), (3, 3), (3, 0)]
+    for count in range(1, len(moves) + 1):
+        overlay.sync(moves[:count])
+    assert canvas.lines() == lines_for(moves)
+    assert canvas.created == 3
+    assert [below for _, below in canvas.lowered] == ["numbers"] * 3
+
+    overlay.sync(moves[:2])
+    assert canvas.lines() == lines_for(moves[:2])
+    assert canvas.deleted == 2
+    overlay.sync(moves[:1])
+    overlay.sync([])
+    assert canvas.items == {} and overlay.segments == []
+
+
+def test_branch_switch_redraws_only_from_the_fork():
+    canvas = RecordingCanvas()
+    overlay = PathOverlay(canvas, center, "red")
+    overlay.sync([(0, 0), (0, 3), (3, 3), (3, 0)])
+    created = canvas.created
+
+    branch = [(0, 0), (0, 3), (2, 5), (5, 5)]
+    overlay.sync(branch)
+    assert canvas.lines() == lines_for(branch)
+    assert canvas.deleted == 2
+    assert canvas.created - created == 2
+    assert overlay.moves == branch
+
+
+def test_relayout_colour_and_clear():
+    canvas = RecordingCanvas()
+    overlay = PathOverlay(canvas, center, "red")
+    moves = [(0, 0), (0, 3), (3, 3)]
+    overlay.sync(moves)
+
+    overlay.center = lambda row, col: (col * 20, row * 20)
+    overlay.relayout()
+    assert canvas.lines() == sorted((a[1] * 20, a[0] * 20, b[1] * 20, b[0] * 20)
+                                    for a, b in zip(moves, moves[1:]))
+    overlay.set_color("blue")
+    assert {item["fill"] for item in canvas.items.values()} == {"blue"}
+
+    overlay.clear()
+    assert canvas.items == {}
+    overlay.sync(moves[:2])
+    assert len(canvas.items) == 1
+    assert [item["fill"] for item in canvas.items.values()] == ["blue"]
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from puzzle_engine import HEURISTIC_WEIGHTS, BitboardEngine, PuzzleEngine, heuristic_score
+
+
+def assert_same_state(engine, bitboard):
+    assert bitboard.moves == engine.moves
+    assert bitboard.board == engine.board
+    assert bitboard.current_number == engine.current_number
+    assert bitboard.current_position == engine.current_position
+    assert sorted(bitboard.get_possible_moves()) == sorted(engine.get_possible_moves())
+    assert bitboard.is_game_over() == engine.is_game_over()
+    assert bitboard.is_board_full() == engine.is_board_full()
+    assert bitboard.score() == engine.score()
+
+
+@pytest.mark.parametrize("size", [5, 10, 20])
+def test_engines_agree_on_random_games(size):
+    rng = random.Random(size)
+    for _ in range(10):
+        engine = PuzzleEngine(size)
+        bitboard = BitboardEngine(size)
+        start = (rng.randrange(size), rng.randrange(size))
+        assert engine.place(*start) and bitboard.place(*start)
+        while True:
+            assert_same_state(engine, bitboard)
+            row, col = rng.randrange(size), rng.randrange(size)
+            assert engine.can_place(row, col) == bitboard.can_place(row, col)
+            for move in engine.get_possible_moves():
+                assert engine.count_future_moves(move) == bitboard.count_future_moves(move)
+                assert engine.board_coverage(move) == bitboard.board_coverage(move)
+                assert engine.is_corner_move(*move) == bitboard.is_corner_move(*move)
+            moves = engine.get_possible_moves()
+            if not moves:
+                break
+            move = rng.choice(moves)
+            assert engine.place(*move) and bitboard.place(*move)
+            if rng.random() < 0.1:
+                assert engine.undo() == bitboard.undo() == move
+
+
+def test_illegal_placements_are_rejected_by_both():
+    for engine in (PuzzleEngine(5), BitboardEngine(5)):
+        assert not engine.is_game_over()
+        assert engine.place(0, 0)
+        assert not engine.place(0, 0)  # occupied
+        assert not engine.place(1, 1)  # not a move from (0, 0)
+        assert not engine.place(0, 9)  # off the board
+        assert engine.place(0, 3)
+        assert engine.undo() == (0, 3)
+        copy = engine.copy()
+        copy.place(2, 2)
+        assert engine.moves == [(0, 0)]
+
+
+
+def test_board_coverage_counts_the_empty_5x5_block_around_a_move():
+    engine = PuzzleEngine(10)
+    # Rows 0-2, columns 5-9: the block is clipped by the edge, not by the row index
+    assert engine.board_coverage((0, 7)) == 15 / 100
+    assert engine.board_coverage((7, 0)) == 15 / 100
+    assert engine.board_coverage((5, 5)) == 25 / 100
+    engine.place(0, 6)
+    engine.place(0, 9)
+    assert engine.board_coverage((0, 7)) == 13 / 100
+
+
+def test_heuristic_scores_agree_on_both_engines():
+    engine = PuzzleEngine(10)
+    bitboard = BitboardEngine(10)
+    for move in [(0, 0), (0, 3), (2, 5), (5, 5), (7, 7)]:
+        assert engine.place(*move) and bitboard.place(*move)
+        for candidate in engine.get_possible_moves():
+            assert (heuristic_score(engine, candidate, HEURISTIC_WEIGHTS)
+                    == heuristic_score(bitboard, candidate, HEURISTIC_WEIGHTS))
@@ -0,0 +1,81 @@
+"""Replay engine and the GUI's Replay entry point."""
+
+from unittest import mock
+
+from replay import ReplayEngine
+
+GAME = [(0, 0), (0, 3), (3, 3), (3, 0), (1, 2)]
+
+
+def record(moves):
+    return {"size": 5, "score": len(moves), "time": 7,
+            "moves": [(position, turn) for turn, position in enumerate(moves, 1)]}
+
+
+def test_legal_record_is_not_truncated():
+    replay = ReplayEngine(record(GAME))
+    assert replay.length == len(GAME)
+    assert not replay.truncated
+    replay.seek(3)
+    assert replay.engine.moves == GAME[:3]
+    replay.seek(1)
+    assert replay.engine.moves == GAME[:1]
+
+
+def test_illegal_tail_is_cut_and_reported():
+    replay = ReplayEngine(record(GAME + [(4, 4), (0, 0)]))
+    assert replay.length == len(GAME)
+    assert replay.truncated
+
+
+def test_replay_during_a_game_asks_first(gui):
+    import mygame_10ten
+    gui.game_store.append(record(GAME))
+    gui.engine.place(0, 0)
+    with mock.patch.object(mygame_10ten, "messagebox") as box, \
+            mock.patch.object(mygame_10ten, "simpledialog") as dialog:
+        box.askyesno.return_value = False
+        gui.start_replay()
+        assert gui.replay is None
+        assert gui.engine.moves == [(0, 0)]
+        dialog.askinteger.assert_not_called()
+
+        box.askyesno.return_value = True
+        dialog.askinteger.return_value = 1
+        gui.start_replay()
+        assert gui.replay is not None
+        box.showwarning.assert_not_called()
+
+
+def test_replay_of_a_truncated_record_warns(gui):
+    import mygame_10ten
+    gui.game_store.append(record(GAME + [(4, 4)]))
+    with mock.patch.object(mygame_10ten, "messagebox") as box, \
+            mock.patch.object(mygame_10ten, "simpledialog") as dialog:
+        dialog.askinteger.return_value = 1
+        gui.start_replay()
+        box.askyesno.assert_not_called()
+        box.showwarning.assert_called_once()
+    assert gui.replay.length == len(GAME)
+
+
+def test_solve_is_ignored_during_a_replay(gui):
+    import mygame_10ten
+    gui.game_store.append(record(GAME))
+    gui.engine.place(0, 0)
+    gui.move_tree.play((0, 0))
+    game_node = gui.move_tree.current
+    version = gui.position_version
+    with mock.patch.object(mygame_10ten, "messagebox") as box, \
+            mock.patch.object(mygame_10ten, "simpledialog") as dialog:
+        box.askyesno.return_value = True
+        dialog.askinteger.return_value = 1
+        gui.start_replay()
+    assert gui.position_version > version
+
+    for k in (3, 5):
+        gui.replay_seek(k)
+        gui.solve_from_position()
+    gui.worker.submit.assert_not_called()
+    gui.highlight_cell.assert_not_called()
+    assert "solver" not in game_node.cache
@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+from game_store import read_legacy_games
+from puzzle_engine import PuzzleEngine
+from replay_codec import (ReplayArchive, decode_game, encode_archive, encode_game,
+                          iter_archive)
+
+
+def random_game(size, seed):
+    rng = random.Random(seed)
+    engine = PuzzleEngine(size)
+    engine.place(rng.randrange(size), rng.randrange(size))
+    while True:
+        moves = engine.get_possible_moves()
+        if not moves:
+            return list(engine.moves)
+        engine.place(*rng.choice(moves))
+
+
+@pytest.mark.parametrize("size", [5, 10, 20])
+def test_game_round_trip(size):
+    for seed in range(5):
+        path = random_game(size, seed)
+        data = encode_game(size, path, elapsed=42)
+        record, end = decode_game(data)
+        assert end == len(data)
+        assert record["size"] == size
+        assert record["score"] == len(path)
+        assert record["time"] == 42
+        assert [position for position, _ in record["moves"]] == path
+        assert [turn for _, turn in record["moves"]] == list(range(1, len(path) + 1))
+
+
+def test_archive_round_trip_and_random_access():
+    records = [{"size": 10, "time": seed, "moves": [(cell, turn) for turn, cell in enumerate(random_game(10, seed), 1)]}
+               for seed in range(4)]
+    data, skipped = encode_archive(records)
+    assert skipped == 0
+    decoded = list(iter_archive(data))
+    archive = ReplayArchive(data)
+    assert len(archive) == len(records)
+    for index, record in enumerate(records):
+        assert decoded[index]["moves"] == record["moves"]
+        assert archive[index] == decoded[index]
+        assert archive.headers[index] == (10, len(record["moves"]), record["time"])
+
+
+def test_illegal_path_is_skipped():
+    data, skipped = encode_archive([{"size": 5, "moves": [((0, 0), 1), ((1, 1), 2)]}])
+    assert skipped == 1
+    assert list(iter_archive(data)) == []
+
+
+def test_crc_detects_corruption():
+    data = bytearray(encode_game(10, random_game(10, 7)))
+    for index in range(len(data)):
+        corrupt = bytearray(data)
+        corrupt[index] ^= 0x10
+        with pytest.raises(ValueError):
+            decode_game(bytes(corrupt))
+    with pytest.raises(ValueError):
+        decode_game(bytes(data[:-1]))
+
+
+def test_legacy_records_with_accumulated_moves_are_recovered(tmp_path):
+    first = random_game(5, 1)
+    second = random_game(5, 2)
+    moves = [(cell, turn) for turn, cell in enumerate(first, 1)]
+    moves += [(cell, turn) for turn, cell in enumerate(second, 1)]
+    legacy = tmp_path / "game_history.json"
+    legacy.write_text(json.dumps([{"size": 5, "score": len(second), "time": 3, "moves": moves}]))
+
+    records = read_legacy_games(str(legacy))
+    assert [tuple(position) for position, _ in records[0]["moves"]] == second
+    _, skipped = encode_archive(records)
+    assert skipped == 0
@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from puzzle_engine import PuzzleEngine
+from rollout import RolloutEvaluator
+
+
+def engine_after(size, moves):
+    engine = PuzzleEngine(size)
+    for move in moves:
+        assert engine.place(*move)
+    return engine
+
+
+@pytest.mark.parametrize("policy", ["random", "warnsdorff"])
+def test_values_are_scores_reachable_from_the_position(policy):
+    engine = engine_after(10, [(4, 4)])
+    values = RolloutEvaluator(10, rollouts=500, policy=policy, seed=1).evaluate(engine)
+    assert set(values) == set(engine.get_possible_moves())
+    for value in values.values():
+        assert len(engine.moves) + 1 <= value <= 100
+
+
+def test_dead_end_candidate_scores_exactly_one_more_move():
+    # Play the first legal move until some candidate leads nowhere
+    engine = engine_after(5, [(0, 0)])
+    while True:
+        moves = engine.get_possible_moves()
+        dead_ends = [move for move in moves if engine.count_future_moves(move) == 0]
+        if dead_ends:
+            break
+        engine.place(*moves[0])
+    values = RolloutEvaluator(5, rollouts=200, seed=2).evaluate(engine)
+    for move in dead_ends:
+        assert values[move] == len(engine.moves) + 1
+
+
+def test_results_do_not_depend_on_chunking():
+    engine = engine_after(10, [(0, 0), (0, 3)])
+    whole = RolloutEvaluator(10, rollouts=3000, seed=3)
+    chunked = RolloutEvaluator(10, rollouts=3000, seed=3)
+    chunked.CHUNK = 1000
+    a, b = whole.evaluate(engine), chunked.evaluate(engine)
+    for move in a:
+        assert abs(a[move] - b[move]) < 2.0
+
+
+def test_warnsdorff_playouts_last_longer_than_random_ones():
+    engine = engine_after(10, [(0, 0)])
+    random_values = RolloutEvaluator(10, rollouts=500, seed=4).evaluate(engine)
+    guided_values = RolloutEvaluator(10, rollouts=500, policy="warnsdorff", seed=4).evaluate(engine)
+    assert min(guided_values.values()) > max(random_values.values())
+
+
+def test_stop_event_cuts_the_playouts_short():
+    engine = engine_after(10, [(4, 4)])
+    stop_event = threading.Event()
+    stop_event.set()
+    evaluator = RolloutEvaluator(10, rollouts=10000, policy="warnsdorff", seed=5)
+    start = time.perf_counter()
+    values = evaluator.evaluate(engine, stop_event=stop_event)
+    assert time.perf_counter() - start < 0.5
+    assert all(value == len(engine.moves) + 1 for value in values.values())
+
+
+def test_buffers_are_reused_between_calls():
+    engine = engine_after(10, [(4, 4)])
+    evaluator = RolloutEvaluator(10, rollouts=1000, seed=6)
+    evaluator.evaluate(engine)
+    boards = evaluator.boards
+    evaluator.evaluate(engine_after(10, [(4, 4), (2, 2)]))
+    assert evaluator.boards is boards
@@ -0,0 +1,30 @@
+"""Leaderboard loading for every board size."""
+
+import json
+from unittest import mock
+
+
+def test_database_scores_cover_every_board_size(gui):
+    gui.database = mock.MagicMock()
+    gui.database.top_scores.side_effect = lambda size: [("AAA", size, 1)]
+    scores = gui.load_scores()
+    assert scores == {f"{size}x{size}": [("AAA", size, 1)] for size in gui.board_sizes.values()}
+
+
+def test_json_scores_get_a_list_for_every_board_size(gui):
+    with open(gui.scores_file, "w") as f:
+        json.dump({"10x10": [["BBB", 80, 12]]}, f)
+    scores = gui.load_scores()
+    assert scores["10x10"] == [["BBB", 80, 12]]
+    assert scores["5x5"] == scores["20x20"] == scores["50x50"] == []
+
+
+def test_score_list_shows_the_current_board_size(gui):
+    gui.top_scores = {"5x5": [("AAA", 20, 3)], "50x50": [("CCC", 900, 60), ("DDD", 850, 70)]}
+    for size, expected in ((50, ["1: CCC - Score: 900 (Time: 60s)", "2: DDD - Score: 850 (Time: 70s)"]),
+                           (20, [])):
+        gui.size = size
+        gui.score_listbox.reset_mock()
+        gui.update_score_list()
+        gui.score_title.config.assert_called_with(text=f"Top 10 {size}x{size} Scores")
+        assert [c.args[1] for c in gui.score_listbox.insert.call_args_list] == expected
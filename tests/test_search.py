@@ -0,0 +1,107 @@
+import random
+import threading
+import time
+
+from puzzle_engine import PuzzleEngine, play_random_game, symmetry_maps
+from search import LookaheadSearch, ZobristHasher
+
+
+def transformed(engine, mapping):
+    """The same game played through one board symmetry"""
+    size = engine.size
+    other = PuzzleEngine(size)
+    for row, col in engine.moves:
+        assert other.place(*divmod(mapping[row * size + col], size))
+    return other
+
+
+def order_of(engine):
+    return [row * engine.size + col for row, col in engine.moves]
+
+
+def game_prefix(size, seed, length):
+    engine = play_random_game(size, random.Random(seed))
+    while len(engine.moves) > length:
+        engine.undo()
+    return engine
+
+
+def test_symmetric_positions_hash_to_the_same_key():
+    hasher = ZobristHasher(10)
+    for seed in range(10):
+        engine = game_prefix(10, seed, 12)
+        key, _ = hasher.canonical(hasher.hashes(order_of(engine)))
+        for mapping in symmetry_maps(10):
+            mirrored = transformed(engine, mapping)
+            assert hasher.canonical(hasher.hashes(order_of(mirrored)))[0] == key
+
+
+def test_different_positions_hash_apart():
+    hasher = ZobristHasher(10)
+    keys = {}
+    for seed in range(50):
+        engine = game_prefix(10, seed, 8)
+        position = frozenset(
+            (frozenset(mapping[i] for i in order_of(engine)), mapping[order_of(engine)[-1]])
+            for mapping in symmetry_maps(10)
+        )
+        key, _ = hasher.canonical(hasher.hashes(order_of(engine)))
+        assert keys.setdefault(key, position) == position
+
+
+def test_incremental_hashes_match_hashing_from_scratch():
+    hasher = ZobristHasher(10)
+    order = order_of(game_prefix(10, 4, 20))
+    hashes = hasher.hashes(order[:1])
+    for step in range(1, len(order)):
+        hashes = hasher.move(hashes, order[step - 1], order[step])
+        assert hashes == hasher.hashes(order[:step + 1])
+
+
+def test_mirrored_positions_get_mirrored_ratings():
+    search = LookaheadSearch(10)
+    engine = game_prefix(10, 2, 10)
+    ratings = search.rate_moves(engine, 6)
+    for mapping in symmetry_maps(10):
+        mirrored = transformed(engine, mapping)
+        expected = {divmod(mapping[row * 10 + col], 10): value for (row, col), value in ratings.items()}
+        assert search.rate_moves(mirrored, 6) == expected
+
+
+def test_best_move_respects_the_time_budget():
+    search = LookaheadSearch(20)
+    engine = PuzzleEngine(20)
+    engine.place(0, 0)
+    for budget in (0.01, 0.05, 0.2):
+        start = time.perf_counter()
+        move, info = search.best_move(engine, budget)
+        elapsed = time.perf_counter() - start
+        assert move in engine.get_possible_moves()
+        assert not info["complete"]
+        assert elapsed < budget + 0.05
+
+
+def test_deeper_budgets_search_deeper():
+    engine = game_prefix(10, 1, 5)
+    _, short = LookaheadSearch(10).best_move(engine, 0.01)
+    _, long = LookaheadSearch(10).best_move(engine, 0.3)
+    assert long["depth"] >= short["depth"] >= 1
+
+
+def test_stop_event_ends_the_search_early():
+    search = LookaheadSearch(20)
+    engine = PuzzleEngine(20)
+    engine.place(0, 0)
+    stop_event = threading.Event()
+    stop_event.set()
+    start = time.perf_counter()
+    move, _ = search.best_move(engine, 5.0, stop_event)
+    assert time.perf_counter() - start < 0.5
+    assert move in engine.get_possible_moves()
+
+
+def test_a_finished_search_is_exact_on_small_boards():
+    engine = game_prefix(5, 0, 10)
+    move, info = LookaheadSearch(5).best_move(engine, 5.0)
+    assert info["complete"]
+    assert info["ratings"][move] == max(info["ratings"].values())
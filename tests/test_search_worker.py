@@ -0,0 +1,102 @@
+import threading
+
+from search import SearchTimeout
+from search_worker import BackgroundWorker
+
+
+class FakeWindow:
+    """Collects after() callbacks; the test runs the poll loop by hand"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def poll(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+class _Marker:
+    """A job that only signals the test once the jobs before it have run"""
+
+    def __init__(self, done):
+        self.cancelled = threading.Event()
+        self.done = done
+        self.callback = None
+
+    def task(self, stop_event):
+        self.done.set()
+        raise SearchTimeout()
+
+
+def finish(worker, window):
+    """Wait until the worker has handled every queued job, then poll once"""
+    done = threading.Event()
+    worker.requests.put(_Marker(done))
+    assert done.wait(5)
+    window.poll()
+
+
+def test_results_are_delivered_on_poll():
+    window = FakeWindow()
+    worker = BackgroundWorker(window)
+    delivered = []
+    worker.submit(lambda stop_event: 42, delivered.append)
+    finish(worker, window)
+    assert delivered == [42]
+    assert worker.pending == []
+    worker.shutdown()
+
+
+def test_cancelled_job_is_never_delivered():
+    window = FakeWindow()
+    worker = BackgroundWorker(window)
+    release = threading.Event()
+    delivered = []
+    # The first job finishes after the cancel, the second is still queued
+    worker.submit(lambda stop_event: release.wait(5) and "late", delivered.append)
+    worker.submit(lambda stop_event: "queued", delivered.append)
+    worker.cancel()
+    release.set()
+    finish(worker, window)
+    assert delivered == []
+    worker.shutdown()
+
+
+def test_result_finished_before_cancel_is_dropped():
+    window = FakeWindow()
+    worker = BackgroundWorker(window)
+    delivered = []
+    worker.submit(lambda stop_event: "stale", delivered.append)
+    done = threading.Event()
+    worker.requests.put(_Marker(done))
+    assert done.wait(5)
+    # The result sits in the queue when the position changes
+    worker.cancel()
+    window.poll()
+    assert delivered == []
+    worker.shutdown()
+
+
+def test_shutdown_stops_the_thread_and_the_poll_loop():
+    window = FakeWindow()
+    worker = BackgroundWorker(window)
+    worker.shutdown()
+    worker.thread.join(5)
+    assert not worker.thread.is_alive()
+    window.poll()
+    assert window.callbacks == []
+
+
+def test_analysis_for_an_old_position_is_cached_but_not_used(gui):
+    node = gui.move_tree.current
+    gui.position_version = 2
+    gui.on_analysis_ready(1, {"ratings": {}}, node, "key")
+    assert gui.analysis is None
+    assert node.cache["key"] == {"ratings": {}}
+    gui.show_search_tips = False
+    gui.on_analysis_ready(2, {"ratings": {}})
+    assert gui.analysis == {"ratings": {}}
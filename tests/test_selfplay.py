@@ -0,0 +1,43 @@
+import argparse
+import json
+import random
+
+import pytest
+
+from selfplay import STRATEGIES, main, parse_weights, play_game, run_chunk
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_every_strategy_plays_a_legal_game(strategy):
+    options = {"weights": parse_weights("future_moves=10,corner=2,coverage=5"), "time_budget": 0.001}
+    score = play_game(5, strategy, random.Random(1), options)
+    assert 1 <= score <= 25
+
+
+def test_chunks_are_reproducible():
+    task = (5, "random", 20, 7, {}, 0.0)
+    assert run_chunk(task) == run_chunk(task)
+    assert sum(run_chunk(task)[2].values()) == 20
+
+
+def test_tiny_farm_writes_the_result_schema(tmp_path):
+    output = tmp_path / "selfplay_results.json"
+    assert main(["--games", "2", "--sizes", "5", "--strategies", "heuristic", "random",
+                 "--workers", "1", "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+
+    assert report["config"]["games"] == 2
+    assert report["config"]["workers"] == 1
+    assert set(report["config"]["weights"]) == {"future_moves", "corner", "coverage"}
+    assert set(report["results"]) == {"5x5/heuristic", "5x5/random"}
+    for summary in report["results"].values():
+        assert summary["games"] == 2
+        assert summary["min"] <= summary["median"] <= summary["max"] <= 25
+        assert 0 <= summary["full_board_rate"] <= 1
+        assert sum(summary["histogram"].values()) == 2
+    assert report["games_per_second"] > 0
+
+
+def test_unknown_weights_are_rejected():
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_weights("speed=1")
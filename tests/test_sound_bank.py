@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pygame")
+
+import sound_bank
+from sound_bank import EFFECTS, MOVE_DURATION, SoundBank, move_frequency
+
+
+class StubSound:
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+
+class StubChannel:
+    def __init__(self, index):
+        self.index = index
+        self.played = []
+
+    def play(self, sound):
+        self.played.append(sound)
+
+
+@pytest.fixture
+def mixer(monkeypatch):
+    """pygame.mixer replaced by a recording stub at 8 kHz mono"""
+    stub = SimpleNamespace(reserved=None)
+    stub.get_init = lambda: (8000, -16, 1)
+    stub.set_reserved = lambda count: setattr(stub, "reserved", count)
+    stub.Channel = StubChannel
+    stub.Sound = StubSound
+    monkeypatch.setattr(sound_bank.pygame, "mixer", stub)
+    return stub
+
+
+def test_least_recently_used_sound_is_evicted_first(mixer):
+    bank = SoundBank(capacity=3)
+    first = bank.sound(440, 0.1)
+    bank.sound(450, 0.1)
+    bank.sound(460, 0.1)
+    assert bank.sound(440, 0.1) is first  # now the most recently used
+    bank.sound(470, 0.1)
+    assert list(bank.sounds) == [(460, 0.1), (440, 0.1), (470, 0.1)]
+    assert bank.sound(450, 0.1) is not None
+    assert list(bank.sounds) == [(440, 0.1), (470, 0.1), (450, 0.1)]
+
+
+def test_buffers_follow_the_mixer_format(mixer):
+    bank = SoundBank()
+    # 16-bit mono at 8 kHz: 2 bytes per sample
+    assert len(bank.sound(440, 0.1).buffer) == 2 * 800
+    assert mixer.reserved == 3
+
+
+def test_prepare_renders_every_move_pitch_and_each_kind_has_its_channel(mixer):
+    bank = SoundBank()
+    bank.prepare(5)
+    pitches = {move_frequency(number, 5) for number in range(1, 27)}
+    assert len(bank.sounds) == len(pitches) + len(EFFECTS)
+    cached = len(bank.sounds)
+
+    bank.play_move(3, 5)
+    bank.play("win")
+    assert len(bank.sounds) == cached
+    assert bank.channels["move"].played == [bank.sounds[(move_frequency(3, 5), MOVE_DURATION)]]
+    assert bank.channels["win"].played == [bank.sounds[EFFECTS["win"]]]
+    assert bank.channels["invalid"].played == []
+
+
+def test_uninitialised_mixer_is_an_error(mixer):
+    mixer.get_init = lambda: None
+    with pytest.raises(RuntimeError):
+        SoundBank()
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from puzzle_engine import PuzzleEngine
+from tablebase import Tablebase, build_tablebase, solve_all_states
+
+
+@pytest.fixture(scope="module")
+def tablebase_5x5(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("tablebase") / "tablebase_5x5.bin")
+    build_tablebase(5, path)
+    tablebase = Tablebase(path)
+    yield tablebase
+    tablebase.close()
+
+
+def test_small_board_table_matches_every_state(tmp_path):
+    path = str(tmp_path / "tablebase_4x4.bin")
+    build_tablebase(4, path)
+    tablebase = Tablebase(path)
+    try:
+        for (mask, cell), value in solve_all_states(4).items():
+            assert tablebase.value(mask, cell) == value
+    finally:
+        tablebase.close()
+
+
+def test_5x5_table_matches_the_exhaustive_solve(tablebase_5x5):
+    states = solve_all_states(5)
+    assert tablebase_5x5.entries < len(states)  # symmetric states share an entry
+    rng = random.Random(5)
+    for (mask, cell), value in rng.sample(sorted(states.items()), 20000):
+        assert tablebase_5x5.value(mask, cell) == value
+
+
+def test_5x5_perfect_play_reaches_the_rated_score(tablebase_5x5):
+    rng = random.Random(1)
+    for _ in range(20):
+        engine = PuzzleEngine(5)
+        engine.place(rng.randrange(5), rng.randrange(5))
+        ratings = tablebase_5x5.analyze(engine)
+        target = max(ratings.values()) if ratings else 1
+        while not engine.is_game_over():
+            engine.place(*tablebase_5x5.best_move(engine))
+        assert engine.score() == target
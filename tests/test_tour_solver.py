@@ -0,0 +1,62 @@
+import pytest
+
+from puzzle_engine import MOVE_OFFSETS
+from tour_solver import BUDGET_EXHAUSTED, FOUND, IMPOSSIBLE, TourSolver, find_tour
+
+
+def assert_valid_tour(size, path, prefix):
+    assert path[:len(prefix)] == prefix
+    assert len(path) == size * size
+    assert len(set(path)) == size * size
+    for (row, col) in path:
+        assert 0 <= row < size and 0 <= col < size
+    for (row, col), (next_row, next_col) in zip(path, path[1:]):
+        assert (next_row - row, next_col - col) in MOVE_OFFSETS
+
+
+@pytest.mark.parametrize("size, start", [(5, (0, 0)), (5, (2, 2)), (6, (0, 0)), (10, (0, 0))])
+def test_found_paths_are_complete_legal_tours(size, start):
+    result = find_tour(size, [start], time_limit=5.0)
+    assert result["status"] == FOUND
+    assert_valid_tour(size, result["path"], [start])
+
+
+def test_found_path_continues_the_given_moves():
+    prefix = [(0, 0), (0, 3), (3, 3)]
+    result = TourSolver(5, time_limit=5.0).solve(prefix)
+    assert result["status"] == FOUND
+    assert_valid_tour(5, result["path"], prefix)
+
+
+def test_dead_end_is_impossible():
+    # From (0, 0) on a 2x2 board there is no move at all
+    result = TourSolver(2).solve([(0, 0)])
+    assert result["status"] == IMPOSSIBLE
+    assert result["path"] is None
+
+
+def test_node_budget_is_reported():
+    result = TourSolver(10, max_nodes=5, time_limit=None).solve([(0, 0), (0, 3)])
+    assert result["status"] in (FOUND, BUDGET_EXHAUSTED)
+    if result["status"] == FOUND:
+        assert_valid_tour(10, result["path"], [(0, 0), (0, 3)])
+
+
+def test_gui_solves_on_the_worker(gui):
+    gui.engine.place(0, 0)
+    gui.move_tree.play((0, 0))
+
+    gui.solve_from_position()
+    gui.solve_from_position()  # a second click while solving queues nothing
+    gui.worker.submit.assert_called_once()
+    gui.highlight_cell.assert_not_called()
+
+    task, callback = gui.worker.submit.call_args[0]
+    callback(task(None))
+    gui.highlight_cell.assert_called_once()
+    assert gui.move_tree.current.cache["solver"]["status"] == FOUND
+
+    # The cached answer is shown without another solve
+    gui.solve_from_position()
+    gui.worker.submit.assert_called_once()
+    assert gui.highlight_cell.call_count == 2
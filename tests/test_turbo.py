@@ -0,0 +1,61 @@
+"""Turbo Auto Play move choice."""
+
+from unittest import mock
+
+
+def test_turbo_search_is_separate_from_the_worker_search(make_gui):
+    gui = make_gui(10)
+    # The background worker's search: turbo must leave it alone
+    gui.lookahead = mock.MagicMock()
+    gui.engine.place(0, 0)
+
+    move = gui.choose_turbo_move(0.01)
+
+    assert move in gui.engine.get_possible_moves()
+    assert gui.turbo_search is not gui.lookahead
+    assert gui.lookahead.mock_calls == []
+
+
+def test_turbo_search_follows_the_board_size(make_gui):
+    gui = make_gui(10)
+    search = gui.get_turbo_search()
+    assert gui.get_turbo_search() is search
+    gui.size = 5
+    assert gui.get_turbo_search().size == 5
+
+
+def set_controls(gui, strength, speed):
+    gui.strength_levels = {"Easy (heuristic)": None, "Strong (50 ms)": 0.05,
+                           "Monte-Carlo (rollouts)": "rollouts"}
+    gui.strength_var = mock.MagicMock(get=mock.MagicMock(return_value=strength))
+    gui.auto_play_speeds = [100, None]
+    gui.speed_var = mock.MagicMock(get=mock.MagicMock(return_value=gui.auto_play_speeds.index(speed)))
+
+
+def test_turbo_budget_follows_strength_and_speed(gui):
+    set_controls(gui, "Strong (50 ms)", 100)
+    assert gui.turbo_time_budget() == 0.01
+    set_controls(gui, "Strong (50 ms)", None)
+    assert gui.turbo_time_budget() == gui.TURBO_INSTANT_BUDGET
+    set_controls(gui, "Monte-Carlo (rollouts)", None)
+    assert gui.turbo_time_budget() == gui.TURBO_INSTANT_BUDGET
+    set_controls(gui, "Easy (heuristic)", None)
+    assert gui.turbo_time_budget() is None
+
+
+def test_instant_turbo_search_fills_a_10x10_board(make_gui):
+    gui = make_gui(10)
+    set_controls(gui, "Strong (50 ms)", None)
+    gui.engine.place(0, 0)
+    while gui.engine.get_possible_moves():
+        gui.engine.place(*gui.choose_turbo_move(gui.turbo_time_budget()))
+    assert gui.engine.score() >= 95  # the one-ply heuristic averages about 63
+
+
+def test_heuristic_turbo_plays_without_searching(make_gui):
+    gui = make_gui(10)
+    set_controls(gui, "Easy (heuristic)", None)
+    gui.engine.place(0, 0)
+
+    assert gui.choose_turbo_move(gui.turbo_time_budget()) in gui.engine.get_possible_moves()
+    assert gui.turbo_search is None
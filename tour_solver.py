@@ -0,0 +1,182 @@
+"""Complete-tour solver for the Number Puzzle.
+
+Searches for a path that places every number 1..size*size (a Hamiltonian
+path under the 3-straight / 2-diagonal move rule) from a given position.
+The search uses Warnsdorff ordering with backtracking and prunes states
+that leave an unreachable cell, more than one forced end cell, or a
+disconnected region of empty cells.
+"""
+
+import time
+
+from puzzle_engine import MOVE_OFFSETS, cell_coords, iter_bits, neighbour_masks
+
+FOUND = "found"
+IMPOSSIBLE = "impossible"
+BUDGET_EXHAUSTED = "budget_exhausted"
+
+
+class _BudgetExhausted(Exception):
+    pass
+
+
+def _shift_table(size):
+    """Per-offset (source mask, shift) pairs used to flood-fill bitmasks"""
+    table = []
+    for dr, dc in MOVE_OFFSETS:
+        source = 0
+        for row in range(size):
+            for col in range(size):
+                if 0 <= row + dr < size and 0 <= col + dc < size:
+                    source |= 1 << (row * size + col)
+        table.append((source, dr * size + dc))
+    return table
+
+
+class TourSolver:
+    def __init__(self, size, max_nodes=2_000_000, time_limit=1.0):
+        self.size = size
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.masks = neighbour_masks(size)
+        self.coords = cell_coords(size)
+        self.shifts = _shift_table(size)
+        self.full_mask = (1 << (size * size)) - 1
+        # Tie-break equal Warnsdorff degrees towards the edge of the board
+        centre = (size - 1) / 2
+        self.edge_rank = tuple(
+            -int(max(abs(row - centre), abs(col - centre)) * 2) for row, col in self.coords
+        )
+
+    def solve(self, moves):
+        """Search for a full tour continuing the given sequence of moves.
+
+        Returns a dict with "status" (found / impossible / budget_exhausted),
+        the complete "path" as (row, col) pairs when found, and the number
+        of "nodes" searched and seconds "elapsed".
+        """
+        self.nodes = 0
+        self.failed = set()
+        self.start_time = time.perf_counter()
+        self.deadline = self.start_time + self.time_limit if self.time_limit else None
+
+        order = [row * self.size + col for row, col in moves]
+        if not order:
+            raise ValueError("solve() needs at least the starting cell")
+        if len(set(order)) != len(order):
+            raise ValueError("moves revisit a cell")
+        occupied = 0
+        for index in order:
+            occupied |= 1 << index
+        unvisited = self.full_mask & ~occupied
+
+        status = IMPOSSIBLE
+        path = None
+        try:
+            if not unvisited:
+                status = FOUND
+            else:
+                feasible, endpoint = self._feasible_start(order[-1], unvisited)
+                if feasible and self._search(order[-1], unvisited, endpoint, order):
+                    status = FOUND
+            if status == FOUND:
+                path = [self.coords[index] for index in order]
+        except _BudgetExhausted:
+            status = BUDGET_EXHAUSTED
+
+        return {
+            "status": status,
+            "path": path,
+            "nodes": self.nodes,
+            "elapsed": time.perf_counter() - self.start_time
+        }
+
+    def _feasible_start(self, current, unvisited):
+        """Run the pruning checks on the starting position.
+
+        Returns (feasible, endpoint) where endpoint is the single empty cell
+        that can only be the last one placed, or None.
+        """
+        masks = self.masks
+        endpoint = None
+        for cell in iter_bits(unvisited):
+            degree = (masks[cell] & unvisited).bit_count() + (masks[current] >> cell & 1)
+            if degree == 0:
+                return False, None
+            if degree == 1:
+                if endpoint is not None:
+                    return False, None
+                endpoint = cell
+        return self._connected(current, unvisited), endpoint
+
+    def _connected(self, current, unvisited):
+        """Check every empty cell is reachable from the current cell"""
+        reach = self.masks[current] & unvisited
+        while True:
+            grown = reach
+            for source, shift in self.shifts:
+                if shift > 0:
+                    grown |= (reach & source) << shift
+                else:
+                    grown |= (reach & source) >> -shift
+            grown &= unvisited
+            if grown == reach:
+                return reach == unvisited
+            reach = grown
+
+    def _search(self, current, unvisited, endpoint, order):
+        self.nodes += 1
+        if self.max_nodes and self.nodes > self.max_nodes:
+            raise _BudgetExhausted()
+        if self.deadline and not self.nodes & 1023 and time.perf_counter() > self.deadline:
+            raise _BudgetExhausted()
+
+        key = (unvisited, current)
+        if key in self.failed:
+            return False
+
+        masks = self.masks
+        candidates = masks[current] & unvisited
+        if endpoint is not None and unvisited != 1 << endpoint:
+            # The forced end cell may only be entered as the very last move
+            candidates &= ~(1 << endpoint)
+
+        # Warnsdorff ordering: try the most constrained target first
+        edge_rank = self.edge_rank
+        ordered = sorted(
+            ((masks[nxt] & unvisited).bit_count(), edge_rank[nxt], nxt) for nxt in iter_bits(candidates)
+        )
+        for _, _, nxt in ordered:
+            remaining = unvisited ^ (1 << nxt)
+            if not remaining:
+                order.append(nxt)
+                return True
+
+            # Only neighbours of the cell we leave lose a link
+            next_endpoint = endpoint
+            dead = False
+            for cell in iter_bits(masks[current] & remaining):
+                degree = (masks[cell] & remaining).bit_count() + (masks[nxt] >> cell & 1)
+                if degree == 0:
+                    dead = True
+                    break
+                if degree == 1 and cell != next_endpoint:
+                    if next_endpoint is not None:
+                        dead = True
+                        break
+                    next_endpoint = cell
+            if dead or not self._connected(nxt, remaining):
+                continue
+
+            order.append(nxt)
+            if self._search(nxt, remaining, next_endpoint, order):
+                return True
+            order.pop()
+
+        self.failed.add(key)
+        return False
+
+
+def find_tour(size, moves=((0, 0),), max_nodes=2_000_000, time_limit=1.0):
+    """Convenience wrapper: search for a full tour from the given moves"""
+    return TourSolver(size, max_nodes=max_nodes, time_limit=time_limit).solve(list(moves))